@@ -1,12 +1,12 @@
 import streamlit as st
 import os
+import uuid
 from dotenv import load_dotenv
 from career_agent.models import UserProfile
-from career_agent.orchestrator import CareerGrowthOrchestrator
-from career_agent.demo_mode import generate_demo_analysis
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
+from career_agent.view_model import build_view_model
+
+# Heavy modules (orchestrator/opik/provider SDKs, plotly, pandas) are imported
+# where they are first needed so cold starts and demo mode stay fast.
 
 # Load environment
 load_dotenv()
@@ -28,6 +28,39 @@ LLM_PROVIDER = get_llm_provider()
 # Check if we should use demo mode
 USE_DEMO_MODE = not LLM_PROVIDER or os.getenv("DEMO_MODE") == "true"
 
+
+@st.cache_resource(show_spinner=False)
+def get_orchestrator():
+    """Build the orchestrator (Opik config + agent clients) once per server process"""
+    from career_agent.orchestrator import CareerGrowthOrchestrator
+    return CareerGrowthOrchestrator()
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def get_view_model(result_id, _result):
+    """Per-result lookups (skill sets, counts, priorities, weekly hours) for all tabs"""
+    return build_view_model(_result)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_schedule_frames(result_id, _schedule):
+    """Calendar table and skills timeline for a schedule"""
+    import pandas as pd
+    
+    schedule_df = pd.DataFrame([{
+        "Date": s.scheduled_time.strftime("%Y-%m-%d"),
+        "Day": s.scheduled_time.strftime("%A"),
+        "Time": s.scheduled_time.strftime("%I:%M %p"),
+        "Resource": s.resource.title[:50] + "..." if len(s.resource.title) > 50 else s.resource.title,
+        "Duration": f"{s.duration_minutes} min",
+        "Skill": s.skill_target,
+        "Type": s.resource.type.title()
+    } for s in _schedule[:14]])
+    
+    skills_timeline = schedule_df.groupby(['Date', 'Skill']).size().reset_index(name='Sessions')
+    return schedule_df, skills_timeline
+
+
 # Page config
 st.set_page_config(
     page_title="CareerPilot - AI Career Coach",
@@ -36,6 +69,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Analyses survive widget reruns; keyed by mode + profile fingerprint
+if "analyses" not in st.session_state:
+    st.session_state.analyses = {}
+if "active_analysis" not in st.session_state:
+    st.session_state.active_analysis = None
+
 # Custom CSS for professional look
 st.markdown("""
 <style>
@@ -148,45 +187,80 @@ if analyze_button:
         experience_years=experience,
         industry=industry
     )
+    analysis_key = f"{'demo' if USE_DEMO_MODE else 'live'}:{profile.fingerprint()}"
     
-    # Run analysis with progress
-    with st.spinner("🤖 Multi-agent system analyzing your career path..."):
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        if USE_DEMO_MODE:
-            status_text.text("🎬 Generating demo analysis...")
-            progress_bar.progress(50)
-            result = generate_demo_analysis(profile)
-            # Mock evaluation scores for demo
-            gap_eval = {
-                "grounding_score": 0.95,
-                "hallucination_rate": 0.05,
-                "avg_confidence": 0.87,
-                "overall_quality": 0.89
-            }
-            resource_eval = {
-                "coverage": 0.92,
-                "avg_relevance": 0.85,
-                "resource_quality": 0.88
-            }
-            progress_bar.progress(100)
-            status_text.text("✅ Demo analysis complete!")
-        else:
-            # Verify API keys
-            if not LLM_PROVIDER:
-                st.error("❌ No LLM provider configured. Please set GOOGLE_API_KEY, OPENAI_API_KEY, or ANTHROPIC_API_KEY in .env file")
-                st.stop()
-            
-            orchestrator = CareerGrowthOrchestrator()
-            
-            status_text.text("🔍 Analyzing job market...")
-            progress_bar.progress(20)
-            
-            result, gap_eval, resource_eval = orchestrator.run_analysis(profile)
+    if analysis_key not in st.session_state.analyses:
+        # Run analysis with progress
+        with st.spinner("🤖 Multi-agent system analyzing your career path..."):
+            progress_bar = st.progress(0)
+            status_text = st.empty()
             
-            progress_bar.progress(100)
-            status_text.text("✅ Analysis complete!")
+            if USE_DEMO_MODE:
+                from career_agent.demo_mode import generate_demo_analysis
+                
+                status_text.text("🎬 Generating demo analysis...")
+                progress_bar.progress(50)
+                result = generate_demo_analysis(profile)
+                # Mock evaluation scores for demo
+                gap_eval = {
+                    "grounding_score": 0.95,
+                    "hallucination_rate": 0.05,
+                    "avg_confidence": 0.87,
+                    "overall_quality": 0.89
+                }
+                resource_eval = {
+                    "coverage": 0.92,
+                    "avg_relevance": 0.85,
+                    "resource_quality": 0.88
+                }
+                progress_bar.progress(100)
+                status_text.text("✅ Demo analysis complete!")
+            else:
+                # Verify API keys
+                if not LLM_PROVIDER:
+                    st.error("❌ No LLM provider configured. Please set GOOGLE_API_KEY, OPENAI_API_KEY, or ANTHROPIC_API_KEY in .env file")
+                    st.stop()
+                
+                orchestrator = get_orchestrator()
+                
+                stage_labels = {
+                    "jobs": "🔍 Analyzing job market...",
+                    "skills": "📊 Extracting skill requirements...",
+                    "skill_gaps": "🎯 Analyzing skill gaps...",
+                    "resources": "📚 Curating learning resources...",
+                    "schedule": "📅 Creating personalized schedule...",
+                    "evaluation": "🔬 Running Opik evaluations...",
+                }
+                
+                def show_progress(stage, percent):
+                    progress_bar.progress(percent)
+                    if stage in stage_labels:
+                        status_text.text(stage_labels[stage])
+                
+                result, gap_eval, resource_eval = orchestrator.run_analysis(profile, progress=show_progress)
+                
+                progress_bar.progress(100)
+                status_text.text("✅ Analysis complete!")
+        
+        st.session_state.analyses[analysis_key] = {
+            "result_id": uuid.uuid4().hex,
+            "result": result,
+            "gap_eval": gap_eval,
+            "resource_eval": resource_eval
+        }
+    
+    st.session_state.active_analysis = analysis_key
+
+if st.session_state.active_analysis in st.session_state.analyses:
+    analysis = st.session_state.analyses[st.session_state.active_analysis]
+    result_id = analysis["result_id"]
+    result = analysis["result"]
+    gap_eval = analysis["gap_eval"]
+    resource_eval = analysis["resource_eval"]
+    view = get_view_model(result_id, result)
+    
+    import plotly.graph_objects as go
+    import plotly.express as px
     
     # Display results in tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["Skill Gaps", "Learning Resources", "Schedule", "Job Market", "Opik Evaluation"])
@@ -201,23 +275,18 @@ if analyze_button:
             with col1:
                 st.metric("Total Gaps", len(result.skill_gaps), help="Skills you need to learn")
             with col2:
-                high_priority = len([g for g in result.skill_gaps if g.confidence > 0.7])
-                st.metric("High Priority", high_priority, help="Gaps with >70% confidence")
+                st.metric("High Priority", view.high_priority_gaps, help="Gaps with >70% confidence")
             with col3:
-                avg_conf = sum(g.confidence for g in result.skill_gaps) / len(result.skill_gaps)
-                st.metric("Avg Confidence", f"{avg_conf:.0%}", help="Average confidence score")
+                st.metric("Avg Confidence", f"{view.avg_confidence:.0%}", help="Average confidence score")
             with col4:
-                total_hours = sum(r.estimated_hours for r in result.learning_resources[:5])
-                st.metric("Learning Hours", f"{total_hours}h", help="Estimated time for top 5 resources")
+                st.metric("Learning Hours", f"{view.top_resource_hours}h", help="Estimated time for top 5 resources")
             
             st.markdown("---")
             
             # Priority chart
             gap_data = {
-                "Skill": [g.skill.title() for g in result.skill_gaps[:8]],
-                "Priority Score": [g.importance * g.confidence for g in result.skill_gaps[:8]],
-                "Importance": [g.importance for g in result.skill_gaps[:8]],
-                "Confidence": [g.confidence for g in result.skill_gaps[:8]]
+                "Skill": view.gap_labels[:8],
+                "Priority Score": view.gap_priorities[:8]
             }
             
             fig = go.Figure()
@@ -250,15 +319,18 @@ if analyze_button:
             # Detailed breakdown
             st.markdown("### 📊 Detailed Skill Analysis")
             for i, gap in enumerate(result.skill_gaps[:8], 1):
-                with st.expander(f"**{i}. {gap.skill.title()}** - Priority: {gap.importance * gap.confidence:.2f}", expanded=(i<=3)):
+                priority = view.gap_priorities[i - 1]
+                with st.expander(f"**{i}. {view.gap_labels[i - 1]}** - Priority: {priority:.2f}", expanded=(i<=3)):
                     col1, col2, col3, col4 = st.columns(4)
                     col1.metric("Importance", f"{gap.importance:.0%}")
                     col2.metric("Confidence", f"{gap.confidence:.0%}")
                     col3.metric("Job Frequency", f"{gap.frequency_in_jobs}/{len(result.job_postings)}")
-                    col4.metric("Priority", f"{gap.importance * gap.confidence:.2f}")
+                    col4.metric("Priority", f"{priority:.2f}")
                     
                     st.markdown("**Why this matters:**")
-                    st.info(gap.reasoning)
+                    # Expander bodies render eagerly, so deferred reasoning is only generated on request
+                    if gap.reasoning is not None or st.button("Explain", key=f"explain_gap_{i}"):
+                        st.info(gap.explain())
     
     with tab2:
         st.markdown("### 📚 Curated Learning Resources")
@@ -327,24 +399,14 @@ if analyze_button:
             with col1:
                 st.metric("Total Sessions", len(result.schedule))
             with col2:
-                total_hours = sum(s.duration_minutes for s in result.schedule) / 60
-                st.metric("Total Hours", f"{total_hours:.1f}h")
+                st.metric("Total Hours", f"{view.total_schedule_hours:.1f}h")
             with col3:
-                days = (result.schedule[-1].scheduled_time - result.schedule[0].scheduled_time).days + 1
-                st.metric("Duration", f"{days} days")
+                st.metric("Duration", f"{view.schedule_days} days")
             
             st.markdown("---")
             
             # Calendar view
-            schedule_df = pd.DataFrame([{
-                "Date": s.scheduled_time.strftime("%Y-%m-%d"),
-                "Day": s.scheduled_time.strftime("%A"),
-                "Time": s.scheduled_time.strftime("%I:%M %p"),
-                "Resource": s.resource.title[:50] + "..." if len(s.resource.title) > 50 else s.resource.title,
-                "Duration": f"{s.duration_minutes} min",
-                "Skill": s.skill_target,
-                "Type": s.resource.type.title()
-            } for s in result.schedule[:14]])
+            schedule_df, skills_timeline = build_schedule_frames(result_id, result.schedule)
             
             st.dataframe(
                 schedule_df,
@@ -362,19 +424,12 @@ if analyze_button:
             # Timeline visualization
             st.markdown("### 📊 Weekly Overview")
             
-            # Group by week
-            schedule_df['Week'] = pd.to_datetime(schedule_df['Date']).dt.isocalendar().week
-            weekly_hours = schedule_df.groupby('Week')['Duration'].apply(
-                lambda x: sum(int(d.split()[0]) for d in x) / 60
-            ).reset_index()
-            weekly_hours.columns = ['Week', 'Hours']
-            
             fig = go.Figure()
             fig.add_trace(go.Bar(
-                x=[f"Week {w}" for w in weekly_hours['Week']],
-                y=weekly_hours['Hours'],
+                x=[f"Week {w}" for w, _ in view.weekly_hours],
+                y=[h for _, h in view.weekly_hours],
                 marker_color='rgb(102, 126, 234)',
-                text=[f"{h:.1f}h" for h in weekly_hours['Hours']],
+                text=[f"{h:.1f}h" for _, h in view.weekly_hours],
                 textposition='outside'
             ))
             fig.update_layout(
@@ -389,7 +444,6 @@ if analyze_button:
             
             # Skills timeline
             st.markdown("### 🎯 Skills Timeline")
-            skills_timeline = schedule_df.groupby(['Date', 'Skill']).size().reset_index(name='Sessions')
             
             fig = px.scatter(
                 skills_timeline,
@@ -412,14 +466,7 @@ if analyze_button:
         
         with col1:
             st.markdown("#### 📈 Most In-Demand Skills")
-            all_skills = {}
-            for job in result.job_postings:
-                for skill in job.required_skills:
-                    all_skills[skill] = all_skills.get(skill, 0) + 2
-                for skill in job.preferred_skills:
-                    all_skills[skill] = all_skills.get(skill, 0) + 1
-            
-            top_skills = sorted(all_skills.items(), key=lambda x: x[1], reverse=True)[:10]
+            top_skills = view.top_market_skills
             
             fig = go.Figure()
             fig.add_trace(go.Bar(
@@ -442,7 +489,7 @@ if analyze_button:
         with col2:
             st.markdown("#### 🎯 Your Skill Coverage")
             
-            user_has = len([s for s in top_skills if s[0].lower() in [sk.lower() for sk in profile.skills]])
+            user_has = view.top_skills_owned
             coverage = (user_has / len(top_skills)) * 100 if top_skills else 0
             
             fig = go.Figure(go.Indicator(
@@ -474,22 +521,20 @@ if analyze_button:
         
         # Job postings
         st.markdown("### 📋 Analyzed Job Postings")
-        for i, job in enumerate(result.job_postings, 1):
+        for i, (job, (required_flags, preferred_flags)) in enumerate(zip(result.job_postings, view.job_skill_flags), 1):
             with st.expander(f"**{i}. {job.title}** at {job.company}"):
                 st.markdown(f"**Description:** {job.description}")
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.markdown("**Required Skills:**")
-                    for skill in job.required_skills:
-                        has_skill = skill.lower() in [s.lower() for s in profile.skills]
+                    for skill, has_skill in required_flags:
                         icon = "✅" if has_skill else "❌"
                         st.markdown(f"{icon} {skill}")
                 
                 with col2:
                     st.markdown("**Preferred Skills:**")
-                    for skill in job.preferred_skills:
-                        has_skill = skill.lower() in [s.lower() for s in profile.skills]
+                    for skill, has_skill in preferred_flags:
                         icon = "✅" if has_skill else "⭕"
                         st.markdown(f"{icon} {skill}")
                 
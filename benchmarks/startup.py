@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - cold import time per module, checked against a time budget
+
+Each module is imported in a fresh interpreter so timings reflect a cold
+container start. Results are written as JSON for tracking over time.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-import budgets in milliseconds
+BUDGETS_MS = {
+    "career_agent.models": 400,
+    "career_agent.tracing": 50,
+    "career_agent.llm_client": 100,
+    "career_agent.view_model": 400,
+    "career_agent.demo_mode": 400,
+    "career_agent.evaluator": 400,
+    "career_agent.job_analyzer": 450,
+    "career_agent.skill_gap_agent": 450,
+    "career_agent.resource_curator": 450,
+    "career_agent.scheduler_agent": 450,
+    "career_agent.orchestrator": 500,
+}
+
+# Modules that must never be loaded on the demo-mode path
+HEAVY_MODULES = ["opik", "openai", "anthropic", "groq", "google.generativeai", "plotly", "pandas"]
+
+DEMO_PATH = """
+from career_agent.models import UserProfile
+from career_agent.view_model import build_view_model
+from career_agent.demo_mode import generate_demo_analysis
+profile = UserProfile(name="Bench", current_role="Software Engineer",
+                      target_role="Machine Learning Engineer", skills=["Python"],
+                      experience_years=3, industry="Technology")
+build_view_model(generate_demo_analysis(profile))
+"""
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile({code!r}, "<bench>", "exec"))
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code: str, repeat: int) -> dict:
+    """Run code in fresh interpreters and return the median time and loaded heavy modules"""
+    samples = []
+    loaded = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(data["ms"])
+        loaded = data["loaded"]
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "heavy_loaded": loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module")
+    parser.add_argument("--output", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+
+    print(f"{'module':36} {'median':>9} {'budget':>8}")
+    for module, budget in BUDGETS_MS.items():
+        stats = measure(f"import {module}", args.repeat)
+        stats["budget_ms"] = budget
+        results[module] = stats
+        status = "✓" if stats["median_ms"] <= budget else "✗"
+        if status == "✗":
+            failures.append(f"{module} took {stats['median_ms']:.0f}ms (budget {budget}ms)")
+        print(f"{status} {module:34} {stats['median_ms']:7.1f}ms {budget:6d}ms")
+
+    demo = measure(DEMO_PATH, args.repeat)
+    results["demo_path"] = demo
+    print(f"\ndemo path: {demo['median_ms']:.1f}ms, heavy modules loaded: {demo['heavy_loaded'] or 'none'}")
+    if demo["heavy_loaded"]:
+        failures.append(f"demo path loaded {', '.join(demo['heavy_loaded'])}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failures:
+        print("\n❌ Startup budget exceeded:")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1
+
+    print("\n✅ All modules within startup budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
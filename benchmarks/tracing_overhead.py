@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tracing overhead benchmark - per-call cost of @tracing.track in each trace mode
+
+Each mode runs in a fresh interpreter (the mode is read when functions are
+decorated) and calls a traced function that takes a profile and a large job
+list, like scrape_jobs/extract_skills do, with one nested traced call.
+
+    python benchmarks/tracing_overhead.py
+    python benchmarks/tracing_overhead.py --calls 5000 --output tracing.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "undecorated": {},
+    "off": {"CAREER_TRACE_MODE": "off"},
+    "sampled_1pct": {"CAREER_TRACE_MODE": "sampled", "CAREER_TRACE_SAMPLE_RATE": "0.01"},
+    "full": {"CAREER_TRACE_MODE": "full"},
+}
+
+# Allowed overhead over the undecorated call, in microseconds per call
+BUDGETS_US = {"off": 1.0, "sampled_1pct": 100.0}
+
+WORKLOAD = """
+import json, time
+from career_agent import tracing
+from career_agent.models import UserProfile, JobPosting
+
+def inner(jobs):
+    return len(jobs)
+
+def outer(profile, jobs):
+    return inner(jobs) + len(profile.skills)
+
+if {decorate!r}:
+    tracing.get_opik()  # one-time import, not part of the per-call cost
+    inner = tracing.track(name="inner")(inner)
+    outer = tracing.track(name="outer")(outer)
+
+profile = UserProfile(name="Bench", current_role="Software Engineer", target_role="ML Engineer",
+                      skills=["Python"] * 30, experience_years=3, industry="Technology",
+                      resume_text="x" * 20000)
+jobs = [JobPosting(title=f"Job {{i}}", company="Co", required_skills=["Python"] * 10,
+                   preferred_skills=["SQL"] * 5, description="d" * 2000, url="https://x") for i in range(50)]
+
+for _ in range(20):
+    outer(profile, jobs)
+start = time.perf_counter()
+for _ in range({calls}):
+    outer(profile, jobs)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"us_per_call": elapsed / {calls} * 1e6}}))
+"""
+
+
+def run_mode(mode: str, calls: int) -> float:
+    env = {**os.environ, **MODES[mode], "OPIK_TRACK_DISABLE": os.getenv("OPIK_TRACK_DISABLE", "true")}
+    code = WORKLOAD.format(decorate=mode != "undecorated", calls=calls)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])["us_per_call"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure @tracing.track overhead per trace mode")
+    parser.add_argument("--calls", type=int, default=2000, help="Traced calls per mode")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = {mode: run_mode(mode, args.calls) for mode in MODES}
+    baseline = results["undecorated"]
+
+    print(f"{'mode':<16}{'us/call':>12}{'overhead':>12}")
+    failed = False
+    for mode, us in results.items():
+        overhead = us - baseline
+        budget = BUDGETS_US.get(mode)
+        flag = ""
+        if budget is not None:
+            ok = overhead <= budget
+            failed |= not ok
+            flag = "  ✅" if ok else f"  ❌ budget {budget:.0f}us"
+        print(f"{mode:<16}{us:>12.2f}{overhead:>12.2f}{flag}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"us_per_call": results, "budgets_us": BUDGETS_US}, f, indent=2)
+
+    if failed:
+        print("\n❌ Tracing overhead over budget")
+        sys.exit(1)
+    print("\n✅ Tracing overhead within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Headless HTTP API for the career analysis pipeline (ASGI)
+
+Run with:
+    uvicorn career_agent.api:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+    POST /analyze         UserProfile -> AnalysisResult (?profile_run=true writes a profile, see profiling)
+    POST /analyze/stream  UserProfile -> Server-Sent Events (progress..., result)
+
+    Both take ?priority=interactive|batch|background: the lane the analysis' LLM calls queue in (see concurrency)
+    and an X-User-Id header (set by the authenticating proxy): the user charged for the LLM spend (see usage)
+    GET  /health          pool and queue status
+    POST /jobs            UserProfile -> {"job_id"} (run by job_queue workers; also takes X-User-Id)
+    GET  /jobs/{job_id}   job status
+    GET  /jobs/{job_id}/result  AnalysisResult once the job is done
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from career_agent import concurrency, profiling, telemetry
+from career_agent.job_queue import JobQueue, PRIORITIES
+from career_agent.llm_client import LLMClient
+from career_agent.models import UserProfile, AnalysisResult
+from career_agent.runner import default_runner
+
+
+class ServiceBusy(Exception):
+    """Raised when the worker pool and its queue are both full"""
+
+
+def _run_explained(runner: Callable, profile: UserProfile, progress=None, user_id: Optional[str] = None):
+    """runner(profile, progress) with deferred gap reasoning filled in, since the response serializes it"""
+    outcome = runner(profile, progress, user_id=user_id)
+    for gap in outcome[0].skill_gaps:
+        gap.explain()
+    return outcome
+
+
+class AnalysisService:
+    """Runs blocking analyses on a bounded thread pool with queueing, backpressure and timeouts"""
+
+    def __init__(
+        self,
+        runner: Optional[Callable] = None,
+        max_workers: int = 8,
+        max_queue: int = 32,
+        timeout_s: float = 120.0
+    ):
+        self._runner = runner
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_s = timeout_s
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisService":
+        return cls(
+            max_workers=int(os.getenv("CAREER_API_WORKERS", "8")),
+            max_queue=int(os.getenv("CAREER_API_MAX_QUEUE", "32")),
+            timeout_s=float(os.getenv("CAREER_API_TIMEOUT_S", "120"))
+        )
+
+    @property
+    def runner(self) -> Callable:
+        if self._runner is None:
+            self._runner = default_runner()
+        return self._runner
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "running": min(self.in_flight, self.max_workers),
+            "queued": max(0, self.in_flight - self.max_workers),
+            "capacity": self.capacity,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    async def submit(
+        self,
+        profile: UserProfile,
+        progress: Optional[Callable[[str, int], None]] = None,
+        profile_run: bool = False,
+        priority: str = "interactive",
+        user_id: Optional[str] = None
+    ):
+        """Queue an analysis and wait for it, enforcing the queue bound and the request timeout"""
+        runner = self.runner
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise ServiceBusy()
+            self.in_flight += 1
+        if profile_run:
+            label = f"api-{profile.fingerprint()}-{int(time.time() * 1000)}"
+            future = self.executor.submit(
+                concurrency.run_in_lane, priority, profiling.run_profiled, _run_explained, label, runner, profile, progress, user_id
+            )
+        else:
+            future = self.executor.submit(concurrency.run_in_lane, priority, _run_explained, runner, profile, progress, user_id)
+        # Slots are released when the worker actually finishes, not when the request gives up
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_s)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            future.cancel()
+            raise
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def is_full(self) -> bool:
+        return self.in_flight >= self.capacity
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def create_app(service: Optional[AnalysisService] = None, job_queue: Optional[JobQueue] = None) -> FastAPI:
+    """Build the ASGI app around an AnalysisService (and a JobQueue for offloaded analyses)"""
+    service = service or AnalysisService.from_env()
+    queue_holder = {"queue": job_queue}
+
+    def get_queue() -> JobQueue:
+        # Opened on first use so importing the app doesn't create the database
+        if queue_holder["queue"] is None:
+            queue_holder["queue"] = JobQueue()
+        return queue_holder["queue"]
+
+    @asynccontextmanager
+    async def lifespan(_):
+        yield
+        service.shutdown()
+
+    api = FastAPI(title="CareerPilot API", version="0.1.0", lifespan=lifespan)
+    api.state.service = service
+
+    @api.get("/health")
+    async def health():
+        return {
+            "status": "ok",
+            **service.status(),
+            "llm_coalescing": LLMClient.coalescing_stats(),
+            "llm_providers": LLMClient.provider_stats(),
+            "llm_truncation": LLMClient.truncation_stats(),
+            "telemetry": telemetry.stats(),
+        }
+
+    def check_priority(priority: str):
+        if priority not in concurrency.LANES:
+            raise HTTPException(status_code=422, detail=f"priority must be one of {list(concurrency.LANES)}")
+
+    @api.post("/analyze", response_model=AnalysisResult)
+    async def analyze(
+        profile: UserProfile,
+        profile_run: bool = False,
+        priority: str = "interactive",
+        user_id: Optional[str] = Header(None, alias="X-User-Id")
+    ):
+        check_priority(priority)
+        try:
+            result, _, _ = await service.submit(profile, profile_run=profile_run, priority=priority, user_id=user_id)
+        except ServiceBusy:
+            raise HTTPException(status_code=503, detail="Analysis queue is full", headers={"Retry-After": "5"})
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"Analysis exceeded {service.timeout_s:.0f}s")
+        return result
+
+    @api.post("/analyze/stream")
+    async def analyze_stream(
+        profile: UserProfile,
+        priority: str = "interactive",
+        user_id: Optional[str] = Header(None, alias="X-User-Id")
+    ):
+        check_priority(priority)
+        # Fail fast with a real 503 before the stream starts; submit() re-checks under the lock
+        if service.is_full():
+            raise HTTPException(status_code=503, detail="Analysis queue is full", headers={"Retry-After": "5"})
+
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_progress(stage: str, percent: int):
+            payload = json.dumps({"stage": stage, "percent": percent})
+            loop.call_soon_threadsafe(events.put_nowait, ("progress", payload))
+
+        async def run():
+            try:
+                result, _, _ = await service.submit(profile, progress=on_progress, priority=priority, user_id=user_id)
+                await events.put(("result", result.model_dump_json()))
+            except ServiceBusy:
+                await events.put(("error", json.dumps({"error": "Analysis queue is full"})))
+            except asyncio.TimeoutError:
+                await events.put(("error", json.dumps({"error": f"Analysis exceeded {service.timeout_s:.0f}s"})))
+            except Exception as e:
+                await events.put(("error", json.dumps({"error": str(e)})))
+
+        async def stream():
+            task = asyncio.create_task(run())
+            try:
+                while True:
+                    event, data = await events.get()
+                    yield _sse(event, data)
+                    if event in ("result", "error"):
+                        break
+            finally:
+                task.cancel()
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @api.post("/jobs", status_code=202)
+    async def submit_job(
+        profile: UserProfile,
+        priority: str = "interactive",
+        user_id: Optional[str] = Header(None, alias="X-User-Id")
+    ):
+        if priority not in PRIORITIES:
+            raise HTTPException(status_code=422, detail=f"priority must be one of {list(PRIORITIES)}")
+        job_id = await asyncio.to_thread(get_queue().submit, profile, priority, user_id)
+        return {"job_id": job_id}
+
+    @api.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        info = await asyncio.to_thread(get_queue().status, job_id)
+        if info is None:
+            raise HTTPException(status_code=404, detail="Unknown job")
+        return info
+
+    @api.get("/jobs/{job_id}/result", response_model=AnalysisResult)
+    async def job_result(job_id: str):
+        queue = get_queue()
+        finished = await asyncio.to_thread(queue.result, job_id)
+        if finished is None:
+            info = await asyncio.to_thread(queue.status, job_id)
+            if info is None:
+                raise HTTPException(status_code=404, detail="Unknown job")
+            if info["status"] == "failed":
+                raise HTTPException(status_code=500, detail=info["error"])
+            return JSONResponse(status_code=202, content={"status": info["status"]})
+        return finished[0]
+
+    return api
+
+
+app = create_app()
@@ -0,0 +1,181 @@
+"""Record/replay cassettes for LLM traffic
+
+    CAREER_LLM_RECORD=traffic.jsonl.gz    record every successful provider call
+    CAREER_LLM_REPLAY=traffic.jsonl.gz    serve calls from a cassette (the "replay" provider)
+    CAREER_LLM_REPLAY_LATENCY=1.0         scale of the recorded latency (0 = answer immediately)
+    CAREER_LLM_REPLAY_FALLBACK=false      true = keep live providers in the pool behind replay
+
+A cassette is gzip-compressed JSON lines. Each distinct system prompt is
+stored once as a "prefix" record. Calls reference it and hold the user
+prompt, temperature, provider, model, response (after any continuations),
+latency, token counts, whether it was still cut off and an offset from the start of the recording. Replay matches calls on
+(system prompt, user prompt, temperature). Repeated prompts are served in
+recorded order, wrapping around. A prompt that isn't in the cassette
+raises CassetteMiss, and the client handles that like any other provider
+failure. Replay is the only provider in the pool, so a miss never turns into
+a paid live call, unless CAREER_LLM_REPLAY_FALLBACK=true (or
+install_replay(exclusive=False)) lets it fail over to them.
+
+    from career_agent import cassette
+    cassette.install_replay("traffic.jsonl.gz", latency_scale=0)
+    CareerGrowthOrchestrator().run_analysis(profile)
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from career_agent.llm_client import Completion, register_provider, unregister_provider
+
+NAME = "replay"
+
+
+class CassetteMiss(KeyError):
+    """Raised by the replay provider for a prompt that isn't in the cassette"""
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _call_key(system_prompt: str, user_prompt: str, temperature: float) -> Tuple[str, str, float]:
+    return _hash(system_prompt), _hash(user_prompt), round(float(temperature), 3)
+
+
+class CassetteRecorder:
+    """Appends provider calls to a cassette file (thread-safe)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._prefixes = set()
+        self._start = time.time()
+        self.calls = 0
+
+    def record(self, provider: str, model: Optional[str], system_prompt: str, user_prompt: str,
+               temperature: float, response: str, latency_s: float, prompt_tokens: int, completion_tokens: int,
+               truncated: bool = False):
+        prefix = _hash(system_prompt)
+        call = {
+            "type": "call",
+            "prefix": prefix,
+            "user": user_prompt,
+            "temperature": temperature,
+            "provider": provider,
+            "model": model,
+            "response": response,
+            "latency_s": round(latency_s, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "truncated": truncated,
+            "offset_s": round(time.time() - self._start, 4),
+        }
+        with self._lock:
+            if prefix not in self._prefixes:
+                self._prefixes.add(prefix)
+                self._file.write(json.dumps({"type": "prefix", "id": prefix, "text": system_prompt}) + "\n")
+            self._file.write(json.dumps(call) + "\n")
+            self.calls += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class CassettePlayer:
+    """Replay provider: (system_prompt, user_prompt, temperature, model) -> recorded response and token usage"""
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str, float], Deque[dict]] = {}
+        self.hits = 0
+        self.misses = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                # Prefix texts are only needed to inspect a cassette; calls match on their hash
+                if entry["type"] == "prefix":
+                    continue
+                key = (entry["prefix"], _hash(entry["user"]), round(float(entry["temperature"]), 3))
+                self._calls.setdefault(key, deque()).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(calls) for calls in self._calls.values())
+
+    def __call__(self, system_prompt: str, user_prompt: str, temperature: float, model: Optional[str]) -> Completion:
+        key = _call_key(system_prompt, user_prompt, temperature)
+        with self._lock:
+            calls = self._calls.get(key)
+            if not calls:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded call for this prompt in {self.path}")
+            entry = calls[0]
+            calls.rotate(-1)
+            self.hits += 1
+        if self.latency_scale > 0:
+            time.sleep(entry["latency_s"] * self.latency_scale)
+        return Completion(entry["response"], entry["prompt_tokens"], entry["completion_tokens"], entry.get("truncated", False))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"recorded": len(self), "hits": self.hits, "misses": self.misses}
+
+
+_recorder: Optional[CassetteRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def recorder() -> Optional[CassetteRecorder]:
+    """The process-wide recorder if CAREER_LLM_RECORD is set (opened on first use)"""
+    global _recorder
+    path = os.getenv("CAREER_LLM_RECORD")
+    if not path:
+        return None
+    if _recorder is None or _recorder.path != path:
+        with _recorder_lock:
+            if _recorder is None or _recorder.path != path:
+                if _recorder is not None:
+                    _recorder.close()
+                _recorder = CassetteRecorder(path)
+                atexit.register(_recorder.close)
+    return _recorder
+
+
+def install_replay(path: str, latency_scale: float = 1.0, rank: Optional[int] = 0, exclusive: bool = True) -> CassettePlayer:
+    """Register the replay provider for clients created afterwards (alone, or at rank in the live pool)"""
+    player = CassettePlayer(path, latency_scale=latency_scale)
+    register_provider(NAME, player, models={task: f"replay-{task}" for task in ("classify", "score", "generate")},
+                      rank=rank, exclusive=exclusive)
+    return player
+
+
+def uninstall_replay():
+    unregister_provider(NAME)
+
+
+_installed_from_env: Optional[str] = None
+
+
+def install_from_env():
+    """install_replay() for CAREER_LLM_REPLAY, once per cassette path"""
+    global _installed_from_env
+    path = os.getenv("CAREER_LLM_REPLAY")
+    if path and path != _installed_from_env:
+        with _recorder_lock:
+            if path != _installed_from_env:
+                install_replay(
+                    path,
+                    latency_scale=float(os.getenv("CAREER_LLM_REPLAY_LATENCY", "1.0")),
+                    exclusive=os.getenv("CAREER_LLM_REPLAY_FALLBACK", "false") != "true"
+                )
+                _installed_from_env = path
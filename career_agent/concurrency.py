@@ -0,0 +1,300 @@
+"""Adaptive (AIMD) concurrency limits for outbound LLM calls
+
+Each provider has a limit on in-flight requests, shared by every client in the
+process. While calls succeed at normal latency and the limit is in use, it
+grows by one per limit's worth of completed calls (additive increase). A
+rate-limit error (429), a timeout or a latency spike cuts it by a constant
+factor (multiplicative decrease). Only calls started after the last cut can
+cut it again, so a burst of failures from one overloaded moment counts once.
+Retried calls never take the slot that probes above the last level known to
+work, so one call can't keep losing the probe.
+
+Calls waiting for a slot queue in priority lanes: interactive (the default),
+batch and background. Free slots go to the lanes in proportion to their
+weights (stride scheduling), so a busy lane can't starve the others. A call
+that has waited longer than the aging time is served next whatever its lane.
+Callers pick a lane with `with concurrency.lane("batch"): ...`.
+
+    CAREER_LLM_ADAPTIVE_CONCURRENCY=true   false = no limit
+    CAREER_LLM_CONCURRENCY_INITIAL=8       starting limit per provider
+    CAREER_LLM_CONCURRENCY_MIN=1
+    CAREER_LLM_CONCURRENCY_MAX=64
+    CAREER_LLM_CONCURRENCY_BACKOFF=0.5     factor applied on a cut
+    CAREER_LLM_LATENCY_SPIKE=2.0           a call slower than this multiple of its model's baseline is a spike
+    CAREER_LLM_THROTTLE_RETRIES=2          throttled calls retried under the reduced limit (see LLMClient)
+    CAREER_LLM_LANE_WEIGHTS=interactive:8,batch:3,background:1
+    CAREER_LLM_LANE_AGING_S=10             a call queued this long jumps ahead of every lane
+
+The current limit is exported as the telemetry metric
+llm_concurrency_limit.<provider> whenever it changes.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional
+
+from career_agent import telemetry
+
+# Healthy calls per model before its latency baseline is trusted for spike detection
+MIN_BASELINE_SAMPLES = 10
+# Weight of a new healthy latency in the baseline (exponential moving average)
+BASELINE_ALPHA = 0.05
+
+# Priority lanes, most urgent first
+LANES = ("interactive", "batch", "background")
+DEFAULT_LANE_WEIGHTS = "interactive:8,batch:3,background:1"
+
+_lane: ContextVar[str] = ContextVar("career_agent_llm_lane", default="interactive")
+
+
+@contextmanager
+def lane(name: str):
+    """Send the LLM calls made in this block (and in work that copies its context) through lane name"""
+    if name not in LANES:
+        raise ValueError(f"Unknown lane {name!r}, expected one of {LANES}")
+    token = _lane.set(name)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+def run_in_lane(name: str, fn, *args, **kwargs):
+    """Call fn(*args, **kwargs) in lane name (for thread pool submission)"""
+    with lane(name):
+        return fn(*args, **kwargs)
+
+
+def lane_weights() -> Dict[str, float]:
+    """CAREER_LLM_LANE_WEIGHTS as {lane: weight}; lanes left out keep their default weight"""
+    weights = dict(item.split(":") for item in DEFAULT_LANE_WEIGHTS.split(","))
+    configured = os.getenv("CAREER_LLM_LANE_WEIGHTS", "")
+    weights.update(item.strip().split(":") for item in configured.split(",") if item.strip())
+    return {name: max(float(weights[name]), 0.01) for name in LANES}
+
+
+def is_throttle(error: BaseException) -> bool:
+    """Whether a provider error means we are sending too much (429 / quota / overload)"""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status in (429, 529):
+        return True
+    name = type(error).__name__
+    if name in ("RateLimitError", "ResourceExhausted", "TooManyRequests", "OverloadedError"):
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message
+
+
+def is_timeout(error: BaseException) -> bool:
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+class _Waiter:
+    __slots__ = ("lane", "retry", "queued_at", "granted")
+
+    def __init__(self, lane: str, retry: bool):
+        self.lane = lane
+        self.retry = retry
+        self.queued_at = time.perf_counter()
+        self.granted = False
+
+
+class AIMDLimiter:
+    """In-flight request limit for one provider, adjusted from call outcomes, with a laned wait queue"""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        spike_factor: float = 2.0,
+        weights: Optional[Dict[str, float]] = None,
+        aging_s: float = 10.0
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.spike_factor = spike_factor
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._last_cut = float("-inf")
+        # Highest limit that held before the last cut (retries stay under it)
+        self.safe_limit: Optional[int] = None
+        # model -> (healthy samples, EWMA latency)
+        self._baselines: Dict[Optional[str], list] = {}
+        self.increases = 0
+        self.decreases = 0
+        self.throttles = 0
+        self.spikes = 0
+        self.waits = 0
+        self.weights = weights or lane_weights()
+        self.aging_s = aging_s
+        self._queues: Dict[str, Deque[_Waiter]] = {name: deque() for name in LANES}
+        # Stride scheduling: a lane's pass advances by 1/weight per slot it gets
+        self._pass = {name: 0.0 for name in LANES}
+        self._virtual_time = 0.0
+        self._granted = {name: 0 for name in LANES}
+        self._aged = {name: 0 for name in LANES}
+        self._lane_waits = {name: deque(maxlen=200) for name in LANES}
+
+    @classmethod
+    def from_env(cls, name: str) -> "AIMDLimiter":
+        return cls(
+            name,
+            initial=int(os.getenv("CAREER_LLM_CONCURRENCY_INITIAL", "8")),
+            min_limit=int(os.getenv("CAREER_LLM_CONCURRENCY_MIN", "1")),
+            max_limit=int(os.getenv("CAREER_LLM_CONCURRENCY_MAX", "64")),
+            backoff=float(os.getenv("CAREER_LLM_CONCURRENCY_BACKOFF", "0.5")),
+            spike_factor=float(os.getenv("CAREER_LLM_LATENCY_SPIKE", "2.0")),
+            aging_s=float(os.getenv("CAREER_LLM_LANE_AGING_S", "10")),
+        )
+
+    def _ceiling(self, retry: bool) -> int:
+        limit = int(self.limit)
+        return min(limit, self.safe_limit) if retry and self.safe_limit is not None else limit
+
+    def acquire(self, timeout: Optional[float] = None, retry: bool = False) -> float:
+        """Wait for a slot in the current lane and return the call's start time (perf_counter); raises TimeoutError"""
+        name = _lane.get()
+        with self._cond:
+            if self.in_flight < self._ceiling(retry) and not any(self._queues.values()):
+                self.in_flight += 1
+                self._granted[name] += 1
+                self._lane_waits[name].append(0.0)
+                return time.perf_counter()
+            self.waits += 1
+            waiter = _Waiter(name, retry)
+            self._queues[name].append(waiter)
+            self._dispatch()
+            if not self._cond.wait_for(lambda: waiter.granted, timeout):
+                self._queues[name].remove(waiter)
+                raise TimeoutError(f"No {self.name} concurrency slot free within {timeout:.1f}s (limit {int(self.limit)})")
+            started = time.perf_counter()
+            self._lane_waits[name].append(started - waiter.queued_at)
+        return started
+
+    def _dispatch(self):
+        """Hand free slots to queued calls (lock held): overdue calls first, then by weighted share"""
+        granted = False
+        while True:
+            heads = [queue[0] for queue in self._queues.values() if queue and self.in_flight < self._ceiling(queue[0].retry)]
+            if not heads:
+                break
+            now = time.perf_counter()
+            overdue = [waiter for waiter in heads if now - waiter.queued_at >= self.aging_s]
+            if overdue:
+                waiter = min(overdue, key=lambda w: w.queued_at)
+                self._aged[waiter.lane] += 1
+            else:
+                waiter = min(heads, key=lambda w: (max(self._pass[w.lane], self._virtual_time), LANES.index(w.lane)))
+            # A lane returning from idle starts at the current virtual time instead of spending saved-up credit
+            self._virtual_time = max(self._pass[waiter.lane], self._virtual_time)
+            self._pass[waiter.lane] = self._virtual_time + 1 / self.weights[waiter.lane]
+            self._queues[waiter.lane].popleft()
+            waiter.granted = True
+            self.in_flight += 1
+            self._granted[waiter.lane] += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def release(self, started: float, model: Optional[str] = None, error: Optional[BaseException] = None,
+                adjust: bool = True):
+        """Free the slot and adjust the limit from the call's outcome (adjust=False: outcome says nothing about load)"""
+        latency = time.perf_counter() - started
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            before = int(self.limit)
+            if adjust:
+                self._adjust(model, started, latency, error, saturated)
+            after = int(self.limit)
+            self._dispatch()
+        if after != before:
+            telemetry.record_metric(f"llm_concurrency_limit.{self.name}", after)
+
+    def _adjust(self, model: Optional[str], started: float, latency: float, error: Optional[BaseException], saturated: bool):
+        if error is not None:
+            if is_throttle(error):
+                self.throttles += 1
+                self._cut(started)
+            elif is_timeout(error):
+                self._cut(started)
+        elif self._is_spike(model, latency):
+            self.spikes += 1
+            self._cut(started)
+        elif saturated and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.increases += 1
+
+    def _cut(self, started: float):
+        # Calls already in flight at the last cut saw the old load; don't cut twice for it
+        if started < self._last_cut:
+            return
+        self.safe_limit = max(self.min_limit, int(self.limit) - 1)
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._last_cut = time.perf_counter()
+        self.decreases += 1
+
+    def _is_spike(self, model: Optional[str], latency: float) -> bool:
+        """Compare with the model's baseline; healthy latencies update the baseline"""
+        baseline = self._baselines.setdefault(model, [0, latency])
+        samples, average = baseline
+        if samples >= MIN_BASELINE_SAMPLES and latency > self.spike_factor * average:
+            return True
+        baseline[0] = samples + 1
+        baseline[1] = average + BASELINE_ALPHA * (latency - average) if samples else latency
+        return False
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "safe_limit": self.safe_limit,
+                "in_flight": self.in_flight,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "throttles": self.throttles,
+                "latency_spikes": self.spikes,
+                "waits": self.waits,
+                "lanes": {name: self._lane_stats(name) for name in LANES},
+            }
+
+    def _lane_stats(self, name: str) -> dict:
+        waits = sorted(self._lane_waits[name])
+        return {
+            "queued": len(self._queues[name]),
+            "granted": self._granted[name],
+            "aged": self._aged[name],
+            "wait_p95_ms": round(waits[int(0.95 * (len(waits) - 1))] * 1000) if waits else None,
+        }
+
+
+_limiters: Dict[str, AIMDLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter(provider: str) -> AIMDLimiter:
+    """The process-wide limiter for a provider (created from the environment on first use)"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = AIMDLimiter.from_env(provider)
+        return _limiters[provider]
+
+
+def limiter_stats() -> Dict[str, dict]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limit.stats() for provider, limit in limiters.items()}
@@ -1,31 +1,78 @@
-"""Demo mode with pre-generated responses - no API keys needed"""
+"""Demo mode with pre-generated responses - no API keys needed
 
-from datetime import datetime, timedelta
+Skill tables, gap templates and courses live in data/demo_knowledge.json, which
+is loaded once and indexed by focus area and skill. Output is seeded, so the same
+profile always gets the same analysis (on a given day), and results are memoized
+per profile fingerprint, which makes demo mode usable as a load-test backend.
+"""
+
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from career_agent.models import (
     JobPosting, SkillGap, LearningResource, LearningSession, AnalysisResult
 )
-import random
+
+KNOWLEDGE_PATH = os.path.join(os.path.dirname(__file__), "data", "demo_knowledge.json")
+
+_memo: "OrderedDict[Tuple[str, date], AnalysisResult]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+class DemoKnowledge:
+    """Demo knowledge base indexed by focus area, skill and role keyword"""
+    
+    def __init__(self, data: dict):
+        self.companies: List[str] = data["companies"]
+        self.title_variations: List[str] = data["title_variations"]
+        self.descriptions: List[str] = data["descriptions"]
+        self.focuses: Dict[str, dict] = data["focuses"]
+        self.courses: Dict[str, dict] = {skill.lower(): course for skill, course in data["courses"].items()}
+        
+        # Keyword trie over role words; a keyword's focus is stored under the "$" key of its last word
+        self.focus_rank = {focus: i for i, focus in enumerate(data["focus_order"])}
+        self.trie: dict = {}
+        for focus, entry in self.focuses.items():
+            for keyword in entry.get("keywords", []):
+                node = self.trie
+                for word in keyword.split():
+                    node = node.setdefault(word, {})
+                node["$"] = focus
+    
+    def focus(self, name: str) -> dict:
+        return self.focuses.get(name, self.focuses["general"])
+    
+    def gap_templates(self, focus: str) -> List[dict]:
+        return self.focus(focus).get("gaps") or self.focuses["general"]["gaps"]
+
+
+@lru_cache(maxsize=1)
+def load_knowledge(path: str = KNOWLEDGE_PATH) -> DemoKnowledge:
+    """Load and index the knowledge base (once per process)"""
+    with open(path, encoding="utf-8") as f:
+        return DemoKnowledge(json.load(f))
 
 
 def generate_demo_analysis(profile):
-    """Generate a complete demo analysis without API calls"""
+    """Generate a complete demo analysis without API calls
     
-    # Customize based on target role
-    target_lower = profile.target_role.lower()
+    Results are memoized per profile fingerprint and day. Each caller gets its own
+    deep copy, so mutating it (e.g. SchedulerAgent.adapt_schedule) can't corrupt the cache.
+    """
+    
+    key = (profile.fingerprint(), date.today())
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key].model_copy(deep=True)
     
-    # Determine focus area
-    if "machine learning" in target_lower or "ml" in target_lower or "ai" in target_lower:
-        focus = "ml"
-    elif "data" in target_lower:
-        focus = "data"
-    elif "backend" in target_lower or "api" in target_lower:
-        focus = "backend"
-    elif "frontend" in target_lower or "react" in target_lower:
-        focus = "frontend"
-    elif "devops" in target_lower or "cloud" in target_lower:
-        focus = "devops"
-    else:
-        focus = "general"
+    # Customize based on target role
+    focus = detect_focus(profile.target_role)
     
     # Generate relevant jobs
     jobs = generate_jobs(profile.target_role, profile.industry, focus)
@@ -39,75 +86,67 @@ def generate_demo_analysis(profile):
     # Generate schedule
     schedule = generate_schedule(resources)
     
-    return AnalysisResult(
+    result = AnalysisResult(
         profile=profile,
         job_postings=jobs,
         skill_gaps=gaps,
         learning_resources=resources,
         schedule=schedule
     )
+    
+    with _memo_lock:
+        _memo[key] = result
+        while len(_memo) > int(os.getenv("CAREER_DEMO_CACHE_SIZE", "1024")):
+            _memo.popitem(last=False)
+    return result.model_copy(deep=True)
 
 
-def generate_jobs(target_role, industry, focus):
-    """Generate realistic job postings"""
-    
-    companies = ["TechCorp", "DataCo", "StartupXYZ", "ResearchLabs", "BigTech Inc", "InnovateSoft", "CloudSystems", "AI Dynamics"]
-    
-    skill_sets = {
-        "ml": {
-            "required": ["Python", "Machine Learning", "Deep Learning", "PyTorch", "TensorFlow", "Statistics", "SQL", "Git"],
-            "preferred": ["MLOps", "AWS", "Docker", "Kubernetes", "Spark", "NLP", "Computer Vision"]
-        },
-        "data": {
-            "required": ["Python", "SQL", "Data Analysis", "Statistics", "Pandas", "NumPy", "Visualization", "Git"],
-            "preferred": ["Tableau", "Power BI", "Spark", "AWS", "Machine Learning", "ETL"]
-        },
-        "backend": {
-            "required": ["Python", "Java", "SQL", "REST APIs", "Microservices", "Git", "Docker", "Testing"],
-            "preferred": ["Kubernetes", "AWS", "Redis", "GraphQL", "gRPC", "CI/CD"]
-        },
-        "frontend": {
-            "required": ["JavaScript", "React", "HTML", "CSS", "TypeScript", "Git", "REST APIs", "Testing"],
-            "preferred": ["Next.js", "Vue", "Redux", "Webpack", "GraphQL", "UI/UX"]
-        },
-        "devops": {
-            "required": ["Linux", "Docker", "Kubernetes", "CI/CD", "AWS", "Git", "Python", "Terraform"],
-            "preferred": ["Ansible", "Jenkins", "Prometheus", "Grafana", "Helm", "ArgoCD"]
-        },
-        "general": {
-            "required": ["Python", "JavaScript", "SQL", "Git", "REST APIs", "Testing", "Agile", "Problem Solving"],
-            "preferred": ["Docker", "AWS", "React", "CI/CD", "Microservices", "System Design"]
-        }
-    }
+def detect_focus(target_role):
+    """Map a target role to a focus area (ml, data, backend, frontend, devops or general)"""
+    
+    knowledge = load_knowledge()
+    words = "".join(c if c.isalnum() else " " for c in target_role.lower()).split()
+    
+    # Walk the keyword trie from every word; the highest-ranked focus matched wins
+    matched = []
+    for start in range(len(words)):
+        node = knowledge.trie
+        for word in words[start:]:
+            node = node.get(word)
+            if node is None:
+                break
+            if "$" in node:
+                matched.append(node["$"])
+    
+    if not matched:
+        return "general"
+    return min(matched, key=lambda focus: knowledge.focus_rank.get(focus, len(knowledge.focus_rank)))
+
+
+def generate_jobs(target_role, industry, focus, rng: Optional[random.Random] = None):
+    """Generate realistic job postings (seeded by role and industry unless rng is given)"""
     
-    skills = skill_sets.get(focus, skill_sets["general"])
+    knowledge = load_knowledge()
+    skills = knowledge.focus(focus)
+    rng = rng or random.Random(f"{target_role.lower()}|{industry.lower()}")
     
     jobs = []
     for i in range(5):
-        company = companies[i]
+        company = knowledge.companies[i]
         
         # Vary the title slightly
-        title_variations = [target_role, f"Senior {target_role}", f"{target_role} II", f"Lead {target_role}", target_role]
-        title = title_variations[i]
-        
-        # Select random skills
-        required = random.sample(skills["required"], min(7, len(skills["required"])))
-        preferred = random.sample(skills["preferred"], min(4, len(skills["preferred"])))
+        title = knowledge.title_variations[i].format(role=target_role)
         
-        descriptions = [
-            f"Build and deploy cutting-edge solutions at scale. Work with modern technology stack in a fast-paced environment.",
-            f"Join our team to develop innovative products. Strong technical skills and collaborative mindset required.",
-            f"Lead technical initiatives and mentor junior engineers. Experience with production systems essential.",
-            f"Design and implement scalable solutions. Work on challenging problems with significant business impact.",
-            f"Drive technical excellence in a growing team. Opportunity to shape architecture and best practices."
-        ]
+        # Select a seeded subset of skills
+        required = rng.sample(skills["required"], min(7, len(skills["required"])))
+        preferred = rng.sample(skills["preferred"], min(4, len(skills["preferred"])))
         
         jobs.append(JobPosting(
             title=title,
             company=company,
             required_skills=required,
             preferred_skills=preferred,
-            description=descriptions[i],
+            description=knowledge.descriptions[i],
             url=f"https://careers.example.com/{company.lower().replace(' ', '-')}/{i+1}"
         ))
     
@@ -117,58 +156,17 @@ def generate_jobs(target_role, industry, focus):
 def generate_skill_gaps(profile, focus):
     """Generate realistic skill gaps"""
     
-    user_skills_lower = [s.lower() for s in profile.skills]
-    
-    gap_templates = {
-        "ml": [
-            ("Machine Learning", 1.0, 5, 0.95, "Essential for ML roles - core requirement across all positions"),
-            ("Deep Learning", 0.9, 5, 0.92, "Critical for modern ML - neural networks are industry standard"),
-            ("PyTorch", 0.85, 4, 0.88, "Leading deep learning framework - highly valued by employers"),
-            ("TensorFlow", 0.75, 4, 0.85, "Alternative framework - broadens your toolkit"),
-            ("MLOps", 0.70, 3, 0.82, "Production ML skills - bridges development and deployment"),
-            ("Statistics", 0.65, 3, 0.88, "Mathematical foundation - essential for understanding algorithms"),
-            ("Docker", 0.60, 3, 0.75, "Containerization standard - required for ML deployment"),
-            ("AWS", 0.55, 2, 0.78, "Cloud platform skills - many companies deploy on AWS"),
-            ("Kubernetes", 0.50, 2, 0.72, "Container orchestration - advanced but valuable for scaling"),
-            ("NLP", 0.45, 2, 0.70, "Natural language processing - growing demand in AI applications"),
-        ],
-        "data": [
-            ("Data Analysis", 1.0, 5, 0.95, "Core skill for data roles - fundamental requirement"),
-            ("SQL", 0.95, 5, 0.93, "Database querying essential - used daily in data work"),
-            ("Python", 0.90, 5, 0.92, "Primary programming language - versatile and powerful"),
-            ("Statistics", 0.85, 4, 0.90, "Statistical methods crucial - foundation of data science"),
-            ("Pandas", 0.80, 4, 0.87, "Data manipulation library - industry standard for Python"),
-            ("Visualization", 0.75, 4, 0.85, "Communicating insights - critical for stakeholder impact"),
-            ("Machine Learning", 0.70, 3, 0.80, "Predictive modeling - increasingly expected in data roles"),
-            ("Tableau", 0.60, 3, 0.75, "BI tool proficiency - common in enterprise environments"),
-            ("Spark", 0.55, 2, 0.72, "Big data processing - valuable for large-scale analytics"),
-            ("ETL", 0.50, 2, 0.70, "Data pipeline skills - important for data engineering aspects"),
-        ],
-        "general": [
-            ("System Design", 0.85, 4, 0.88, "Architecture skills - essential for senior roles"),
-            ("Microservices", 0.80, 4, 0.85, "Modern architecture pattern - widely adopted"),
-            ("Docker", 0.75, 4, 0.83, "Containerization - standard in modern development"),
-            ("AWS", 0.70, 3, 0.80, "Cloud platform - most common deployment target"),
-            ("CI/CD", 0.65, 3, 0.78, "Automation practices - improves development velocity"),
-            ("Testing", 0.60, 3, 0.82, "Quality assurance - critical for production code"),
-            ("Kubernetes", 0.55, 2, 0.72, "Container orchestration - valuable for scalability"),
-            ("GraphQL", 0.50, 2, 0.68, "API technology - modern alternative to REST"),
-            ("Redis", 0.45, 2, 0.65, "Caching solution - improves application performance"),
-            ("Monitoring", 0.40, 2, 0.70, "Observability - essential for production systems"),
-        ]
-    }
-    
-    templates = gap_templates.get(focus, gap_templates["general"])
+    user_skills_lower = {s.lower() for s in profile.skills}
     
     gaps = []
-    for skill, importance, freq, confidence, reasoning in templates:
-        if skill.lower() not in user_skills_lower:
+    for template in load_knowledge().gap_templates(focus):
+        if template["skill"].lower() not in user_skills_lower:
             gaps.append(SkillGap(
-                skill=skill,
-                importance=importance,
-                frequency_in_jobs=freq,
-                confidence=confidence,
-                reasoning=reasoning
+                skill=template["skill"],
+                importance=template["importance"],
+                frequency_in_jobs=template["frequency"],
+                confidence=template["confidence"],
+                reasoning=template["reasoning"]
             ))
     
     return gaps[:10]
@@ -177,33 +175,21 @@ def generate_skill_gaps(profile, focus):
 def generate_resources(gaps, focus):
     """Generate realistic learning resources"""
     
+    courses = load_knowledge().courses
     resources = []
     
     for gap in gaps[:8]:
         skill = gap.skill.lower()
         
         # Course
-        courses = {
-            "machine learning": ("Machine Learning Specialization by Andrew Ng", "https://www.coursera.org/specializations/machine-learning-introduction", 60, "beginner"),
-            "deep learning": ("Deep Learning Specialization", "https://www.coursera.org/specializations/deep-learning", 80, "intermediate"),
-            "pytorch": ("PyTorch for Deep Learning & AI", "https://www.udemy.com/course/pytorch-for-deep-learning/", 40, "intermediate"),
-            "tensorflow": ("TensorFlow Developer Certificate", "https://www.coursera.org/professional-certificates/tensorflow-in-practice", 50, "intermediate"),
-            "mlops": ("MLOps Fundamentals", "https://www.coursera.org/learn/mlops-fundamentals", 25, "advanced"),
-            "docker": ("Docker Mastery", "https://www.udemy.com/course/docker-mastery/", 20, "beginner"),
-            "aws": ("AWS Certified Solutions Architect", "https://aws.amazon.com/certification/certified-solutions-architect-associate/", 40, "intermediate"),
-            "kubernetes": ("Kubernetes for Developers", "https://www.udemy.com/course/kubernetes-for-developers/", 30, "intermediate"),
-            "sql": ("Complete SQL Bootcamp", "https://www.udemy.com/course/the-complete-sql-bootcamp/", 15, "beginner"),
-            "python": ("Python for Everybody Specialization", "https://www.coursera.org/specializations/python", 35, "beginner"),
-        }
-        
-        if skill in courses:
-            title, url, hours, difficulty = courses[skill]
+        course = courses.get(skill)
+        if course is not None:
             resources.append(LearningResource(
-                title=title,
+                title=course["title"],
                 type="course",
-                url=url,
-                estimated_hours=hours,
-                difficulty=difficulty,
+                url=course["url"],
+                estimated_hours=course["estimated_hours"],
+                difficulty=course["difficulty"],
                 relevance_score=gap.importance * gap.confidence,
                 skills_covered=[gap.skill]
             ))
@@ -223,10 +209,13 @@ def generate_resources(gaps, focus):
 
 
 def generate_schedule(resources):
-    """Generate realistic schedule"""
+    """Generate realistic schedule starting today"""
     
     schedule = []
-    current_date = datetime.now()
+    current_date = datetime.combine(date.today(), time())
+    
+    # Vary times
+    hours = [7, 19, 20, 7, 19, 20, 7, 19, 20, 7, 19, 20]
     
     for i, resource in enumerate(resources[:12]):
         day_offset = i
@@ -237,9 +226,7 @@ def generate_schedule(resources):
             day_offset += 1
             schedule_date = current_date + timedelta(days=day_offset)
         
-        # Vary times
-        hours = [7, 19, 20, 7, 19, 20, 7, 19, 20, 7, 19, 20]
-        session_time = schedule_date.replace(hour=hours[i], minute=0, second=0, microsecond=0)
+        session_time = schedule_date.replace(hour=hours[i])
         
         schedule.append(LearningSession(
             resource=resource,
@@ -249,243 +236,3 @@ def generate_schedule(resources):
         ))
     
     return schedule
-    """Generate a complete demo analysis without API calls"""
-    
-    # Demo job postings
-    jobs = [
-        JobPosting(
-            title="Senior Machine Learning Engineer",
-            company="TechCorp",
-            required_skills=["Python", "TensorFlow", "PyTorch", "Machine Learning", "Deep Learning", "SQL", "Docker", "Kubernetes"],
-            preferred_skills=["MLOps", "AWS", "Spark"],
-            description="Build and deploy ML models at scale. Work with cutting-edge AI technology.",
-            url="https://example.com/jobs/techcorp"
-        ),
-        JobPosting(
-            title="ML Engineer",
-            company="DataCo",
-            required_skills=["Python", "Scikit-learn", "Machine Learning", "Statistics", "Data Analysis", "Git", "Linux"],
-            preferred_skills=["NLP", "Computer Vision", "Azure"],
-            description="Develop ML solutions for business problems. Strong statistical background required.",
-            url="https://example.com/jobs/dataco"
-        ),
-        JobPosting(
-            title="AI/ML Engineer",
-            company="StartupXYZ",
-            required_skills=["Python", "Machine Learning", "Deep Learning", "PyTorch", "MLOps", "CI/CD", "Docker"],
-            preferred_skills=["Kubernetes", "FastAPI", "PostgreSQL"],
-            description="Join our AI team building next-gen products. Fast-paced startup environment.",
-            url="https://example.com/jobs/startupxyz"
-        ),
-        JobPosting(
-            title="Machine Learning Scientist",
-            company="ResearchLabs",
-            required_skills=["Python", "Machine Learning", "Deep Learning", "Research", "Mathematics", "Statistics", "PyTorch"],
-            preferred_skills=["Publications", "PhD", "NLP"],
-            description="Research and develop novel ML algorithms. Academic background preferred.",
-            url="https://example.com/jobs/researchlabs"
-        ),
-        JobPosting(
-            title="Senior ML Engineer",
-            company="BigTech Inc",
-            required_skills=["Python", "TensorFlow", "Machine Learning", "System Design", "Distributed Systems", "Kubernetes", "AWS"],
-            preferred_skills=["Scala", "Spark", "Airflow"],
-            description="Scale ML systems to millions of users. Strong engineering skills required.",
-            url="https://example.com/jobs/bigtech"
-        ),
-    ]
-    
-    # Demo skill gaps
-    gaps = [
-        SkillGap(
-            skill="Machine Learning",
-            importance=1.0,
-            frequency_in_jobs=5,
-            confidence=0.95,
-            reasoning="Essential for ML Engineer role - appears in all job postings as core requirement"
-        ),
-        SkillGap(
-            skill="Deep Learning",
-            importance=0.8,
-            frequency_in_jobs=4,
-            confidence=0.90,
-            reasoning="Critical for modern ML roles - required for neural network development"
-        ),
-        SkillGap(
-            skill="PyTorch",
-            importance=0.8,
-            frequency_in_jobs=4,
-            confidence=0.85,
-            reasoning="Industry-standard deep learning framework - highly valued by employers"
-        ),
-        SkillGap(
-            skill="TensorFlow",
-            importance=0.6,
-            frequency_in_jobs=3,
-            confidence=0.85,
-            reasoning="Alternative to PyTorch - knowing both frameworks increases opportunities"
-        ),
-        SkillGap(
-            skill="MLOps",
-            importance=0.6,
-            frequency_in_jobs=3,
-            confidence=0.80,
-            reasoning="Production ML deployment skills - bridges gap between development and operations"
-        ),
-        SkillGap(
-            skill="Docker",
-            importance=0.6,
-            frequency_in_jobs=3,
-            confidence=0.75,
-            reasoning="Containerization is standard for ML deployment - essential DevOps skill"
-        ),
-        SkillGap(
-            skill="Kubernetes",
-            importance=0.6,
-            frequency_in_jobs=3,
-            confidence=0.70,
-            reasoning="Container orchestration for scaling ML systems - advanced but valuable"
-        ),
-        SkillGap(
-            skill="Statistics",
-            importance=0.4,
-            frequency_in_jobs=2,
-            confidence=0.85,
-            reasoning="Mathematical foundation for ML - important for understanding algorithms"
-        ),
-        SkillGap(
-            skill="AWS",
-            importance=0.4,
-            frequency_in_jobs=2,
-            confidence=0.75,
-            reasoning="Cloud platform skills - many companies deploy ML on AWS"
-        ),
-        SkillGap(
-            skill="System Design",
-            importance=0.2,
-            frequency_in_jobs=1,
-            confidence=0.70,
-            reasoning="Senior-level skill for architecting scalable ML systems"
-        ),
-    ]
-    
-    # Demo learning resources
-    resources = [
-        LearningResource(
-            title="Machine Learning Specialization by Andrew Ng",
-            type="course",
-            url="https://www.coursera.org/specializations/machine-learning-introduction",
-            estimated_hours=60,
-            difficulty="beginner",
-            relevance_score=0.95,
-            skills_covered=["Machine Learning", "Python", "Statistics"]
-        ),
-        LearningResource(
-            title="Deep Learning Specialization",
-            type="course",
-            url="https://www.coursera.org/specializations/deep-learning",
-            estimated_hours=80,
-            difficulty="intermediate",
-            relevance_score=0.90,
-            skills_covered=["Deep Learning", "TensorFlow", "Neural Networks"]
-        ),
-        LearningResource(
-            title="PyTorch for Deep Learning",
-            type="course",
-            url="https://www.udemy.com/course/pytorch-for-deep-learning/",
-            estimated_hours=40,
-            difficulty="intermediate",
-            relevance_score=0.85,
-            skills_covered=["PyTorch", "Deep Learning"]
-        ),
-        LearningResource(
-            title="Full Stack Deep Learning",
-            type="course",
-            url="https://fullstackdeeplearning.com/",
-            estimated_hours=30,
-            difficulty="advanced",
-            relevance_score=0.85,
-            skills_covered=["MLOps", "Deep Learning", "Production ML"]
-        ),
-        LearningResource(
-            title="Docker for Data Science",
-            type="course",
-            url="https://www.datacamp.com/courses/docker-for-data-science",
-            estimated_hours=4,
-            difficulty="beginner",
-            relevance_score=0.75,
-            skills_covered=["Docker", "Containerization"]
-        ),
-        LearningResource(
-            title="Kubernetes for ML Engineers",
-            type="article",
-            url="https://kubernetes.io/docs/tutorials/",
-            estimated_hours=10,
-            difficulty="intermediate",
-            relevance_score=0.70,
-            skills_covered=["Kubernetes", "MLOps"]
-        ),
-        LearningResource(
-            title="Hands-On Machine Learning with Scikit-Learn and TensorFlow",
-            type="course",
-            url="https://www.oreilly.com/library/view/hands-on-machine-learning/9781492032632/",
-            estimated_hours=50,
-            difficulty="intermediate",
-            relevance_score=0.88,
-            skills_covered=["Machine Learning", "TensorFlow", "Python"]
-        ),
-        LearningResource(
-            title="AWS Machine Learning Specialty Certification",
-            type="course",
-            url="https://aws.amazon.com/certification/certified-machine-learning-specialty/",
-            estimated_hours=40,
-            difficulty="advanced",
-            relevance_score=0.75,
-            skills_covered=["AWS", "MLOps", "Cloud Computing"]
-        ),
-        LearningResource(
-            title="Statistical Learning with Python",
-            type="course",
-            url="https://www.edx.org/course/statistical-learning",
-            estimated_hours=30,
-            difficulty="intermediate",
-            relevance_score=0.80,
-            skills_covered=["Statistics", "Machine Learning", "Python"]
-        ),
-        LearningResource(
-            title="MLOps: Machine Learning Operations",
-            type="course",
-            url="https://www.coursera.org/learn/mlops-fundamentals",
-            estimated_hours=20,
-            difficulty="intermediate",
-            relevance_score=0.82,
-            skills_covered=["MLOps", "CI/CD", "Production ML"]
-        ),
-    ]
-    
-    # Demo schedule
-    schedule = []
-    current_date = datetime.now()
-    
-    for i, resource in enumerate(resources[:10]):
-        day_offset = i
-        if (current_date + timedelta(days=day_offset)).weekday() >= 5:
-            day_offset += 2  # Skip weekends
-        
-        session_time = current_date + timedelta(days=day_offset)
-        session_time = session_time.replace(hour=19, minute=0, second=0, microsecond=0)
-        
-        schedule.append(LearningSession(
-            resource=resource,
-            scheduled_time=session_time,
-            duration_minutes=30,
-            skill_target=resource.skills_covered[0]
-        ))
-    
-    return AnalysisResult(
-        profile=profile,
-        job_postings=jobs,
-        skill_gaps=gaps,
-        learning_resources=resources,
-        schedule=schedule
-    )
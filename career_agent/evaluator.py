@@ -1,15 +1,21 @@
 """Opik evaluation metrics for the Career Growth Agent"""
 
-import opik
-from typing import List, Dict
-from career_agent.models import SkillGap, JobPosting, LearningResource
+import argparse
+from typing import Iterable, List, Dict, Optional
+from career_agent.models import SkillGap, JobPosting, LearningResource, AnalysisResult
+
+# Score weights shared by the per-result and bulk evaluations
+GAP_WEIGHTS = {"grounding": 0.4, "confidence": 0.3, "importance": 0.3}
+RESOURCE_WEIGHTS = {"relevance": 0.5, "coverage": 0.3, "diversity": 0.2}
+RESOURCE_TYPE_COUNT = 4  # course, article, video, project
 
 
 class CareerAgentEvaluator:
-    """Evaluates agent decisions using Opik metrics"""
+    """Evaluates agent decisions using Opik metrics
     
-    def __init__(self):
-        self.scores = {}
+    The evaluator holds no state: every method is a pure function of its
+    arguments, so one evaluator can be shared across threads.
+    """
     
     def evaluate_skill_gaps(self, skill_gaps: List[SkillGap], job_postings: List[JobPosting]) -> Dict:
         """Evaluate if skill gaps are grounded in actual job data"""
@@ -40,9 +46,13 @@ class CareerAgentEvaluator:
         avg_importance = sum(g.importance for g in skill_gaps) / total if total > 0 else 0
         
         # Overall quality score
-        quality_score = (grounding_score * 0.4 + avg_confidence * 0.3 + avg_importance * 0.3)
+        quality_score = (
+            grounding_score * GAP_WEIGHTS["grounding"]
+            + avg_confidence * GAP_WEIGHTS["confidence"]
+            + avg_importance * GAP_WEIGHTS["importance"]
+        )
         
-        self.scores = {
+        scores = {
             "grounding_score": grounding_score,
             "hallucination_rate": hallucinated_count / total if total > 0 else 0,
             "avg_confidence": avg_confidence,
@@ -53,7 +63,7 @@ class CareerAgentEvaluator:
             "total_gaps": total
         }
         
-        return self.scores
+        return scores
     
     def evaluate_resources(self, resources: List[LearningResource], skill_gaps: List[SkillGap]) -> Dict:
         """Evaluate quality of curated resources"""
@@ -76,9 +86,13 @@ class CareerAgentEvaluator:
         
         # Check for diverse resource types
         resource_types = set(r.type for r in resources)
-        diversity_score = len(resource_types) / 4  # Max 4 types: course, article, video, project
+        diversity_score = len(resource_types) / RESOURCE_TYPE_COUNT
         
-        resource_quality = (avg_relevance * 0.5 + coverage * 0.3 + diversity_score * 0.2)
+        resource_quality = (
+            avg_relevance * RESOURCE_WEIGHTS["relevance"]
+            + coverage * RESOURCE_WEIGHTS["coverage"]
+            + diversity_score * RESOURCE_WEIGHTS["diversity"]
+        )
         
         return {
             "resource_quality": resource_quality,
@@ -88,15 +102,15 @@ class CareerAgentEvaluator:
             "total_resources": len(resources)
         }
     
-    def get_evaluation_summary(self) -> str:
-        """Get human-readable evaluation summary"""
-        if not self.scores:
+    def get_evaluation_summary(self, scores: Dict) -> str:
+        """Get human-readable evaluation summary of scores (from evaluate_skill_gaps)"""
+        if not scores:
             return "No evaluation performed yet"
         
         summary = []
         
         # Grounding
-        grounding = self.scores.get("grounding_score", 0)
+        grounding = scores.get("grounding_score", 0)
         if grounding > 0.9:
             summary.append("✅ Excellent grounding - all recommendations based on real job data")
         elif grounding > 0.7:
@@ -105,7 +119,7 @@ class CareerAgentEvaluator:
             summary.append("⚠️ Some recommendations may not be grounded in job data")
         
         # Hallucination
-        hallucination = self.scores.get("hallucination_rate", 0)
+        hallucination = scores.get("hallucination_rate", 0)
         if hallucination == 0:
             summary.append("✅ Zero hallucinations detected")
         elif hallucination < 0.2:
@@ -114,7 +128,7 @@ class CareerAgentEvaluator:
             summary.append(f"⚠️ {hallucination:.0%} hallucination rate detected")
         
         # Confidence
-        confidence = self.scores.get("avg_confidence", 0)
+        confidence = scores.get("avg_confidence", 0)
         if confidence > 0.8:
             summary.append("✅ High confidence in recommendations")
         elif confidence > 0.6:
@@ -123,7 +137,7 @@ class CareerAgentEvaluator:
             summary.append("⚠️ Low confidence - may need human review")
         
         # Overall
-        quality = self.scores.get("overall_quality", 0)
+        quality = scores.get("overall_quality", 0)
         if quality > 0.8:
             summary.append("🎯 Overall: Excellent quality")
         elif quality > 0.6:
@@ -132,3 +146,137 @@ class CareerAgentEvaluator:
             summary.append("🎯 Overall: Needs improvement")
         
         return "\n".join(summary)
+
+
+def evaluate_bulk(results: Iterable[AnalysisResult], ids: Optional[Iterable] = None, as_arrow: bool = False):
+    """Score many results in one vectorized pass (same metrics as evaluate_skill_gaps/evaluate_resources)
+    
+    Returns a pandas DataFrame with one row per result, indexed by ids (default:
+    position), or a pyarrow Table if as_arrow is set.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    results = list(results)
+    n = len(results)
+    index = pd.Index(list(ids) if ids is not None else range(n), name="result_id")
+    
+    # One pass to flatten every result into columns; per-result counts map rows back to results
+    gap_skills, gap_confidence, gap_importance, gap_counts = [], [], [], []
+    job_skills, job_counts = [], []
+    resource_types, resource_relevance, resource_counts = [], [], []
+    covered_skills, covered_counts = [], []
+    for result in results:
+        gap_counts.append(len(result.skill_gaps))
+        for gap in result.skill_gaps:
+            gap_skills.append(gap.skill)
+            gap_confidence.append(gap.confidence)
+            gap_importance.append(gap.importance)
+        before = len(job_skills)
+        for job in result.job_postings:
+            job_skills.extend(job.required_skills)
+            job_skills.extend(job.preferred_skills)
+        job_counts.append(len(job_skills) - before)
+        resource_counts.append(len(result.learning_resources))
+        before = len(covered_skills)
+        for resource in result.learning_resources:
+            resource_types.append(resource.type)
+            resource_relevance.append(resource.relevance_score)
+            covered_skills.extend(resource.skills_covered)
+        covered_counts.append(len(covered_skills) - before)
+    
+    positions = np.arange(n)
+    gap_counts = np.array(gap_counts, dtype=np.int64)
+    resource_counts = np.array(resource_counts, dtype=np.int64)
+    gap_owner = np.repeat(positions, gap_counts)
+    resource_owner = np.repeat(positions, resource_counts)
+    
+    # Case-insensitive skill ids (only distinct strings are lowercased), combined with
+    # the owning result into one integer key per (result, skill)
+    raw_skills = np.array(gap_skills + job_skills + covered_skills, dtype=object)
+    codes, uniques = pd.factorize(raw_skills)
+    lowered, _ = pd.factorize(pd.Index(uniques, dtype=object).str.lower())
+    skill_ids = lowered[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+    vocab = int(skill_ids.max()) + 1 if len(skill_ids) else 1
+    owners = np.concatenate([gap_owner, np.repeat(positions, job_counts), np.repeat(positions, covered_counts)])
+    keys = owners.astype(np.int64) * vocab + skill_ids
+    gap_keys, job_keys, covered_keys = np.split(keys, [len(gap_skills), len(gap_skills) + len(job_skills)])
+    
+    def per_result_mean(owner, values, counts):
+        totals = np.bincount(owner, weights=values, minlength=n)
+        return np.divide(totals, counts, out=np.zeros(n), where=counts > 0)
+    
+    # Skill gap grounding
+    grounded = np.bincount(gap_owner, weights=np.isin(gap_keys, job_keys), minlength=n).astype(np.int64)
+    grounding = np.divide(grounded, gap_counts, out=np.zeros(n), where=gap_counts > 0)
+    hallucination = np.divide(gap_counts - grounded, gap_counts, out=np.zeros(n), where=gap_counts > 0)
+    avg_confidence = per_result_mean(gap_owner, np.array(gap_confidence, dtype=float), gap_counts)
+    avg_importance = per_result_mean(gap_owner, np.array(gap_importance, dtype=float), gap_counts)
+    
+    # Resource coverage, relevance and diversity
+    has_resources = resource_counts > 0
+    distinct_gaps = np.unique(gap_keys)
+    distinct_gap_counts = np.bincount(distinct_gaps // vocab, minlength=n)
+    covered_gaps = np.bincount(distinct_gaps[np.isin(distinct_gaps, covered_keys)] // vocab, minlength=n)
+    coverage = np.divide(covered_gaps, distinct_gap_counts, out=np.zeros(n), where=(distinct_gap_counts > 0) & has_resources)
+    avg_relevance = per_result_mean(resource_owner, np.array(resource_relevance, dtype=float), resource_counts)
+    type_ids, type_names = pd.factorize(np.array(resource_types, dtype=object))
+    distinct_types = np.unique(resource_owner.astype(np.int64) * max(len(type_names), 1) + type_ids)
+    diversity = np.bincount(distinct_types // max(len(type_names), 1), minlength=n) / RESOURCE_TYPE_COUNT
+    
+    frame = pd.DataFrame({
+        "grounding_score": grounding,
+        "hallucination_rate": hallucination,
+        "avg_confidence": avg_confidence,
+        "avg_importance": avg_importance,
+        "overall_quality": (
+            grounding * GAP_WEIGHTS["grounding"]
+            + avg_confidence * GAP_WEIGHTS["confidence"]
+            + avg_importance * GAP_WEIGHTS["importance"]
+        ),
+        "grounded_gaps": grounded,
+        "hallucinated_gaps": gap_counts - grounded,
+        "total_gaps": gap_counts,
+        "resource_quality": np.where(has_resources, (
+            avg_relevance * RESOURCE_WEIGHTS["relevance"]
+            + coverage * RESOURCE_WEIGHTS["coverage"]
+            + diversity * RESOURCE_WEIGHTS["diversity"]
+        ), 0.0),
+        "coverage": coverage,
+        "avg_relevance": avg_relevance,
+        "diversity": diversity,
+        "total_resources": resource_counts,
+    }, index=index)
+    
+    if as_arrow:
+        import pyarrow as pa
+        return pa.Table.from_pandas(frame)
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every finished analysis in a job queue database")
+    parser.add_argument("--db", default=None, help="SQLite queue path (default: $CAREER_JOB_DB or career_jobs.db)")
+    parser.add_argument("--output", default="quality_sweep.csv", help="Output file (.csv or .parquet)")
+    args = parser.parse_args()
+    
+    from career_agent.job_queue import JobQueue
+    
+    ids, results = [], []
+    for job_id, result in JobQueue(args.db).iter_results():
+        ids.append(job_id)
+        results.append(result)
+    
+    frame = evaluate_bulk(results, ids=ids)
+    if args.output.endswith(".parquet"):
+        frame.to_parquet(args.output)
+    else:
+        frame.to_csv(args.output)
+    
+    print(f"🔬 Scored {len(frame)} analyses -> {args.output}")
+    if len(frame):
+        print(frame[["grounding_score", "hallucination_rate", "overall_quality", "resource_quality"]].describe().loc[["mean", "min"]])
+
+
+if __name__ == "__main__":
+    main()
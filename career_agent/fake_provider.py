@@ -0,0 +1,149 @@
+"""Deterministic offline LLM provider for regression runs and load tests
+
+Answers the agents' prompts from the demo knowledge base, so the full
+orchestrator pipeline runs without API keys or network access:
+
+    from career_agent import fake_provider
+    fake_provider.install(latency_s=0.2)
+    CareerGrowthOrchestrator().run_analysis(profile)
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from typing import Optional
+
+from career_agent.llm_client import register_provider, unregister_provider
+
+NAME = "fake"
+
+JOBS_PATTERN = re.compile(r"Generate (\d+) realistic job postings for a (.+) position in the (.+) industry")
+
+
+class FakeRateLimitError(Exception):
+    """Raised like a provider's 429 when more calls are in flight than the fake's capacity"""
+    status_code = 429
+
+
+class FakeProvider:
+    """Callable provider: (system_prompt, user_prompt, temperature, model) -> text
+
+    With a capacity, calls beyond that many in flight are rejected with a 429,
+    like a rate-limited provider.
+    """
+
+    def __init__(self, latency_s: float = 0.0, jitter: float = 0.0, seed: int = 0, capacity: Optional[int] = None):
+        self.latency_s = latency_s
+        self.jitter = jitter
+        self.capacity = capacity
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.in_flight = 0
+        self.rejected = 0
+
+    def __call__(self, system_prompt: str, user_prompt: str, temperature: float, model: Optional[str]) -> str:
+        with self._lock:
+            self.calls += 1
+            if self.capacity is not None and self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise FakeRateLimitError(f"Rate limit reached ({self.capacity} concurrent requests)")
+            self.in_flight += 1
+            delay = self.latency_s * (1 + self._rng.uniform(-self.jitter, self.jitter))
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            return respond(user_prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def respond(user_prompt: str) -> str:
+    """Canned answer for one of the agents' prompts"""
+    from career_agent import demo_mode
+
+    jobs = JOBS_PATTERN.search(user_prompt)
+    if jobs:
+        limit, role, industry = int(jobs.group(1)), jobs.group(2), jobs.group(3).rstrip(".")
+        postings = demo_mode.generate_jobs(role, industry, demo_mode.detect_focus(role))[:limit]
+        return json.dumps([
+            {
+                "title": job.title,
+                "company": job.company,
+                "required_skills": job.required_skills,
+                "preferred_skills": job.preferred_skills,
+                "description": job.description,
+            }
+            for job in postings
+        ])
+
+    if "Missing skill:" in user_prompt:
+        skill = user_prompt.split("Missing skill:")[1].splitlines()[0].strip()
+        template = _gap_template(skill)
+        return json.dumps({"confidence": template["confidence"] if template else 0.6})
+
+    if "Explain why these skills matter:" in user_prompt:
+        reasons = {}
+        for line in user_prompt.split("Explain why these skills matter:")[1].splitlines():
+            if line.startswith("- "):
+                skill = line[2:].rsplit(" (", 1)[0]
+                template = _gap_template(skill)
+                reasons[skill] = template["reasoning"] if template else f"{skill} appears in several target job postings"
+        return json.dumps(reasons)
+
+    if "learning resources for:" in user_prompt:
+        skill = user_prompt.split("learning resources for:")[1].splitlines()[0].strip()
+        return json.dumps(_resources(skill))
+
+    if "Rate from 0-1" in user_prompt:
+        return "0.8"
+
+    return "{}"
+
+
+def _gap_template(skill: str) -> Optional[dict]:
+    from career_agent.demo_mode import load_knowledge
+    for focus in load_knowledge().focuses.values():
+        for template in focus.get("gaps", []):
+            if template["skill"].lower() == skill.lower():
+                return template
+    return None
+
+
+def _resources(skill: str) -> list:
+    from career_agent.demo_mode import load_knowledge
+    resources = []
+    course = load_knowledge().courses.get(skill.lower())
+    if course:
+        resources.append({**course, "type": "course", "skills_covered": [skill]})
+    resources.append({
+        "title": f"Complete Guide to {skill}",
+        "type": "article",
+        "url": f"https://medium.com/topic/{skill.lower().replace(' ', '-')}",
+        "estimated_hours": 2,
+        "difficulty": "intermediate",
+        "skills_covered": [skill],
+    })
+    resources.append({
+        "title": f"{skill} Hands-on Project",
+        "type": "project",
+        "url": f"https://github.com/topics/{skill.lower().replace(' ', '-')}",
+        "estimated_hours": 6,
+        "difficulty": "intermediate",
+        "skills_covered": [skill],
+    })
+    return resources
+
+
+def install(latency_s: float = 0.0, jitter: float = 0.0, rank: Optional[int] = 0, capacity: Optional[int] = None) -> FakeProvider:
+    """Register the fake provider (first in the pool by default) for clients created afterwards"""
+    provider = FakeProvider(latency_s=latency_s, jitter=jitter, capacity=capacity)
+    register_provider(NAME, provider, models={task: f"fake-{task}" for task in ("classify", "score", "generate")}, rank=rank)
+    return provider
+
+
+def uninstall():
+    unregister_provider(NAME)
@@ -1,41 +1,45 @@
 import os
 from typing import List
-import opik
+from career_agent import run_context, tracing
 from career_agent.models import JobPosting, UserProfile
 from career_agent.llm_client import LLMClient
+from career_agent.prompts import PromptBuilder
 import json
 
 
+JOB_INSTRUCTIONS = """You are a job market analyst. Return ONLY valid JSON array, no markdown, no explanation.
+Each job posting must have exactly this structure:
+[
+  {
+    "title": "job title",
+    "company": "company name",
+    "required_skills": ["skill1", "skill2", "skill3", "skill4", "skill5"],
+    "preferred_skills": ["skill6", "skill7", "skill8"],
+    "description": "brief 2-3 sentence description"
+  }
+]
+Make it realistic with actual tech skills and real-sounding company names."""
+
+
 class JobAnalyzerAgent:
     """Agent that scrapes and analyzes job postings"""
     
     def __init__(self):
-        self.client = LLMClient()
+        self.client = LLMClient(agent="job_analyzer")
+        self.prompts = PromptBuilder(self.client.provider, JOB_INSTRUCTIONS)
     
-    @opik.track(name="scrape_jobs")
+    @tracing.track(name="scrape_jobs")
     def scrape_jobs(self, role: str, industry: str, limit: int = 5) -> List[JobPosting]:
         """Simulate job scraping (in production, use real job board APIs)"""
         
         try:
             # For demo: Generate realistic job postings using LLM
-            prompt = f"""Generate {limit} realistic job postings for a {role} position in the {industry} industry.
-
-Return ONLY a JSON array (no other text) with exactly this structure:
-[
-  {{
-    "title": "job title",
-    "company": "company name",
-    "required_skills": ["skill1", "skill2", "skill3", "skill4", "skill5"],
-    "preferred_skills": ["skill6", "skill7", "skill8"],
-    "description": "brief 2-3 sentence description"
-  }}
-]
-
-Make it realistic with actual tech skills and real-sounding company names."""
-
+            system_prompt, user_prompt = self.prompts.build(
+                f"Generate {limit} realistic job postings for a {role} position in the {industry} industry."
+            )
             jobs_data = self.client.generate_json(
-                system_prompt="You are a job market analyst. Return ONLY valid JSON array, no markdown, no explanation.",
-                user_prompt=prompt,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
                 temperature=0.7
             )
             
@@ -58,15 +62,13 @@ Make it realistic with actual tech skills and real-sounding company names."""
                     url=f"https://example.com/jobs/{job['company'].lower().replace(' ', '-')}"
                 ))
             
-            try:
-                opik.track_metric(name="jobs_scraped", value=len(jobs))
-            except:
-                pass
+            tracing.track_metric(name="jobs_scraped", value=len(jobs))
             return jobs
             
         except Exception as e:
             print(f"Error in scrape_jobs: {e}")
-            # Fallback to demo mode if LLM fails
+            # Fallback to demo mode if LLM fails (or the deadline passes)
+            run_context.mark_partial("job_postings")
             from career_agent.demo_mode import generate_jobs
             from career_agent.models import UserProfile
             profile = UserProfile(
@@ -79,7 +81,7 @@ Make it realistic with actual tech skills and real-sounding company names."""
             )
             return generate_jobs(role, industry, "general")[:limit]
     
-    @opik.track(name="extract_skills")
+    @tracing.track(name="extract_skills")
     def extract_skills_from_jobs(self, jobs: List[JobPosting]) -> dict:
         """Extract and rank skills from job postings"""
         
@@ -97,10 +99,7 @@ Make it realistic with actual tech skills and real-sounding company names."""
         # Sort by frequency
         sorted_skills = dict(sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True))
         
-        try:
-            opik.track_metric(name="unique_skills_found", value=len(sorted_skills))
-            opik.track_metric(name="top_skill_frequency", value=list(sorted_skills.values())[0] if sorted_skills else 0)
-        except:
-            pass
+        tracing.track_metric(name="unique_skills_found", value=len(sorted_skills))
+        tracing.track_metric(name="top_skill_frequency", value=list(sorted_skills.values())[0] if sorted_skills else 0)
         
         return sorted_skills
@@ -0,0 +1,312 @@
+"""Durable local job queue (SQLite) with a pool of worker processes
+
+Submit analyses from the API/UI tier and run them in separate processes:
+
+    queue = JobQueue("career_jobs.db")
+    job_id = queue.submit(profile, priority="interactive", user_id="user-1")
+    queue.status(job_id)     # {"status": "queued" | "running" | "done" | "failed", ...}
+    queue.result(job_id)     # (AnalysisResult, gap_eval, resource_eval) once done
+
+Start workers with:
+    python -m career_agent.job_queue --workers 4 --db career_jobs.db
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from career_agent.models import UserProfile, AnalysisResult
+
+# Lower value = served first
+PRIORITIES = {"interactive": 0, "batch": 1, "background": 2}
+
+ACTIVE_STATUSES = ("queued", "running")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    user_id TEXT,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs (fingerprint, status);
+"""
+
+
+class JobQueue:
+    """SQLite-backed job queue with priority lanes and in-flight deduplication"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("CAREER_JOB_DB", "career_jobs.db")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Databases created before jobs carried the submitting user
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "user_id" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN user_id TEXT")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def submit(self, profile: UserProfile, priority: str = "interactive", user_id: Optional[str] = None) -> str:
+        """Queue an analysis for user_id (charged for its LLM spend, see usage)
+
+        An identical profile the same user already has queued or running returns its job_id.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of {list(PRIORITIES)}")
+        lane = PRIORITIES[priority]
+        fingerprint = profile.fingerprint()
+
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, priority FROM jobs WHERE fingerprint = ? AND user_id IS ? AND status IN (?, ?) LIMIT 1",
+                (fingerprint, user_id, *ACTIVE_STATUSES)
+            ).fetchone()
+            if row:
+                # A more urgent duplicate promotes the existing job
+                if lane < row["priority"]:
+                    conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (lane, row["id"]))
+                return row["id"]
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, fingerprint, priority, status, profile, user_id, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, fingerprint, lane, profile.model_dump_json(), user_id, time.time())
+            )
+            return job_id
+
+    def claim(self, worker: str) -> Optional[Tuple[str, UserProfile, Optional[str]]]:
+        """Atomically take the most urgent, oldest queued job: (job_id, profile, user_id)"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, profile, user_id FROM jobs WHERE status = 'queued' ORDER BY priority, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, time.time(), row["id"])
+            )
+        return row["id"], UserProfile.model_validate_json(row["profile"]), row["user_id"]
+
+    def complete(self, job_id: str, result: AnalysisResult, gap_eval: Dict, resource_eval: Dict):
+        payload = json.dumps({
+            "result": result.model_dump(mode="json"),
+            "gap_eval": gap_eval,
+            "resource_eval": resource_eval
+        })
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ?",
+                (payload, time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                (error, time.time(), job_id)
+            )
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Job metadata (without the result payload), or None if unknown"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, priority, error, worker, attempts, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            info = dict(row)
+            info["priority"] = next(name for name, lane in PRIORITIES.items() if lane == row["priority"])
+            if row["status"] == "queued":
+                info["position"] = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND (priority < ? OR (priority = ? AND created_at < ?))",
+                    (row["priority"], row["priority"], row["created_at"])
+                ).fetchone()[0]
+        return info
+
+    def result(self, job_id: str) -> Optional[Tuple[AnalysisResult, Dict, Dict]]:
+        """The finished analysis, or None if the job isn't done"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE id = ? AND status = 'done'", (job_id,)).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(row["result"])
+        return AnalysisResult.model_validate(payload["result"]), payload["gap_eval"], payload["resource_eval"]
+
+    def iter_results(self) -> Iterator[Tuple[str, AnalysisResult]]:
+        """(job_id, AnalysisResult) for every finished job, oldest first"""
+        with self._connect() as conn:
+            for row in conn.execute("SELECT id, result FROM jobs WHERE status = 'done' ORDER BY finished_at"):
+                yield row["id"], AnalysisResult.model_validate(json.loads(row["result"])["result"])
+
+    def wait(self, job_id: str, timeout: float = 300.0, poll_interval: float = 0.5):
+        """Poll until the job finishes; returns result() or raises on failure/timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            info = self.status(job_id)
+            if info is None:
+                raise KeyError(job_id)
+            if info["status"] == "done":
+                return self.result(job_id)
+            if info["status"] == "failed":
+                raise RuntimeError(f"Job {job_id} failed: {info['error']}")
+            time.sleep(poll_interval)
+        raise TimeoutError(f"Job {job_id} did not finish within {timeout:.0f}s")
+
+    def requeue_stale(self, max_runtime_s: float, max_attempts: int = 3) -> int:
+        """Return jobs stuck in 'running' (e.g. their worker died) to the queue, or fail them after max_attempts"""
+        cutoff = time.time() - max_runtime_s
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'worker lost', finished_at = ? "
+                "WHERE status = 'running' AND started_at < ? AND attempts >= ?",
+                (time.time(), cutoff, max_attempts)
+            )
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running' AND started_at < ?",
+                (cutoff,)
+            )
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+def _worker_loop(db_path: str, worker: str, stop_event, poll_interval: float):
+    """Worker process: claim, run, record, repeat"""
+    from career_agent.runner import default_runner
+
+    queue = JobQueue(db_path)
+    runner = default_runner()
+
+    while not stop_event.is_set():
+        claimed = queue.claim(worker)
+        if claimed is None:
+            stop_event.wait(poll_interval)
+            continue
+
+        job_id, profile, user_id = claimed
+        try:
+            result, gap_eval, resource_eval = runner(profile, user_id=user_id)
+            queue.complete(job_id, result, gap_eval, resource_eval)
+        except Exception as e:
+            queue.fail(job_id, f"{type(e).__name__}: {e}")
+            continue
+
+        # Deferred gap reasoning is filled in after the job is already done
+        if any(gap.reasoning is None for gap in result.skill_gaps):
+            for gap in result.skill_gaps:
+                gap.explain()
+            queue.complete(job_id, result, gap_eval, resource_eval)
+
+
+class WorkerPool:
+    """Pool of worker processes draining a JobQueue"""
+
+    def __init__(self, db_path: Optional[str] = None, workers: int = 2, poll_interval: float = 0.5):
+        self.db_path = db_path or os.getenv("CAREER_JOB_DB", "career_jobs.db")
+        self.workers = workers
+        self.poll_interval = poll_interval
+        # spawn: provider SDK clients and threads don't survive fork reliably
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+    def _spawn(self, index: int):
+        name = f"{socket.gethostname()}:{os.getpid()}:{index}"
+        process = self._ctx.Process(
+            target=_worker_loop,
+            args=(self.db_path, name, self._stop, self.poll_interval),
+            name=f"career-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def start(self):
+        JobQueue(self.db_path)  # create schema before workers race for it
+        self._processes = [self._spawn(i) for i in range(self.workers)]
+
+    def supervise(self, stale_after_s: float = 600.0, interval: float = 5.0):
+        """Block, restarting dead workers and requeueing jobs they abandoned"""
+        queue = JobQueue(self.db_path)
+        while not self._stop.is_set():
+            for i, process in enumerate(self._processes):
+                if not process.is_alive():
+                    self._processes[i] = self._spawn(i)
+            queue.requeue_stale(stale_after_s)
+            self._stop.wait(interval)
+
+    def stop(self, timeout: float = 30.0):
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run career analysis queue workers")
+    parser.add_argument("--db", default=None, help="SQLite queue path (default: $CAREER_JOB_DB or career_jobs.db)")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker processes")
+    parser.add_argument("--stale-after", type=float, default=600.0, help="Requeue running jobs older than this (seconds)")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    pool = WorkerPool(args.db, workers=args.workers)
+    pool.start()
+    print(f"🚀 {args.workers} workers draining {pool.db_path}")
+    try:
+        pool.supervise(stale_after_s=args.stale_after)
+    except KeyboardInterrupt:
+        print("\nStopping workers...")
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,118 +1,880 @@
-"""Unified LLM client that supports multiple providers including free ones"""
+"""Unified LLM client that supports multiple providers including free ones
+
+Every provider with an API key (plus any registered with register_provider())
+joins a ranked pool. Calls go to the highest-ranked healthy provider and fail
+over down the pool on errors; with CAREER_LLM_HEDGE=true a slow call is also
+sent to the next provider once it passes the primary's p90 latency, and the
+first valid answer wins. Each provider's in-flight calls are capped by an
+adaptive AIMD limit (see concurrency).
+
+Successful provider calls can be recorded to a cassette (CAREER_LLM_RECORD)
+and served back offline by the replay provider (CAREER_LLM_REPLAY); see cassette.
+
+Every successful call's tokens (as reported by the provider), latency and
+cost are recorded per agent, per analysis and per user; see usage.
+
+max_tokens is sized per task class from observed output lengths (see
+prompts.OutputSizer). An answer cut off at the limit (per the provider's stop
+reason) is continued by the same model, up to CAREER_LLM_MAX_CONTINUATIONS
+times. If it is still cut off, generate_json keeps the complete elements of
+the partial JSON array (or object) instead of failing to parse.
+
+Inside an analysis with a deadline (see run_context), a call is abandoned with
+DeadlineExceeded once the current stage's cutoff passes. Every provider request
+also gets a timeout: the time left, capped at CAREER_LLM_TIMEOUT_S.
+"""
 
 import os
 import json
-from typing import Optional
+import time
+import asyncio
+import hashlib
+import threading
+import contextvars
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from career_agent import concurrency, run_context, telemetry, usage
+from career_agent.run_context import DeadlineExceeded
+from career_agent.prompts import OutputSizer, count_tokens
+from career_agent.single_flight import SingleFlight
+
+# Identical prompts in flight at the same time share one upstream call, across all clients
+_single_flight = SingleFlight()
+
+# Built-in providers and the API key that enables each, in default rank order
+PROVIDER_KEYS = {
+    "groq": "GROQ_API_KEY",
+    "google": "GOOGLE_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+}
+
+# Task classes: "classify" and "score" are short, high-volume calls that go to a
+# small fast model; "generate" (job postings, resource lists) gets the large one.
+TASK_CLASSES = ("classify", "score", "generate")
+
+MODEL_ROUTES = {
+    "groq": {
+        "classify": "llama-3.1-8b-instant",
+        "score": "llama-3.1-8b-instant",
+        "generate": "llama-3.3-70b-versatile",  # Free tier model
+    },
+    "google": {
+        "classify": "models/gemini-flash-lite-latest",
+        "score": "models/gemini-flash-lite-latest",
+        "generate": "models/gemini-flash-latest",
+    },
+    "openai": {
+        "classify": "gpt-4.1-nano",
+        "score": "gpt-4.1-nano",
+        "generate": "gpt-4o-mini",
+    },
+    "anthropic": {
+        "classify": "claude-3-haiku-20240307",
+        "score": "claude-3-haiku-20240307",
+        "generate": "claude-3-haiku-20240307",
+    },
+}
+
+# When a routed call fails validation it is retried once on this task class's model
+ESCALATION = {"classify": "generate", "score": "generate"}
+
+# Approximate list prices, USD per 1M (input, output) tokens, for cost estimates
+MODEL_PRICES = {
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "models/gemini-flash-lite-latest": (0.10, 0.40),
+    "models/gemini-flash-latest": (0.30, 2.50),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o-mini": (0.15, 0.60),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+}
+
+
+
+class Completion(NamedTuple):
+    """A provider's answer with the token usage it reported (None = not reported)"""
+    text: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    # The answer stopped at max_tokens
+    truncated: bool = False
+
+
+def _add_tokens(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return None if a is None or b is None else a + b
+
+
+def cost_usd(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """USD estimate at MODEL_PRICES (unknown models count as free)"""
+    price_in, price_out = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+_routing_lock = threading.Lock()
+_routing_counts: Counter = Counter()
+_escalation_counts: Counter = Counter()
+# truncated / continued / repaired / discarded answers
+_truncation_counts: Counter = Counter()
+
+_output_sizer = OutputSizer.from_env()
+
+# Sent after a cut-off answer by providers that can't prefill the assistant turn
+CONTINUE_PROMPT = "Your previous answer was cut off. Continue exactly where it stopped, without repeating anything."
+
+# Providers plugged in with register_provider(): name -> (call, rank)
+_registered_providers: Dict[str, Tuple[Callable[[str, str, float, Optional[str]], Union[str, Completion]], Optional[int]]] = {}
+# Registered providers that replace the rest of the pool (e.g. offline replay)
+_exclusive_providers = set()
+
+# Latency samples needed before a provider's p90 is trusted as the hedge delay
+MIN_LATENCY_SAMPLES = 20
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+# Runs deadline-bound calls so the caller can stop waiting (separate from hedges to avoid nesting in one pool)
+_deadline_executor: Optional[ThreadPoolExecutor] = None
+
+
+def register_provider(
+    name: str,
+    call: Callable[[str, str, float, Optional[str]], Union[str, Completion]],
+    models: Optional[Dict[str, str]] = None,
+    rank: Optional[int] = None,
+    exclusive: bool = False
+):
+    """Add a provider to the pool of clients created afterwards
+
+    call(system_prompt, user_prompt, temperature, model) returns the response
+    text, or a Completion to report its token usage; models maps task classes to model names. rank is the provider's
+    position in the pool (None = after the built-in providers). An exclusive provider is the only one in the pool,
+    so its failures never reach a live provider.
+    """
+    _registered_providers[name] = (call, rank)
+    if exclusive:
+        _exclusive_providers.add(name)
+    else:
+        _exclusive_providers.discard(name)
+    if models is not None:
+        MODEL_ROUTES[name] = dict(models)
+
+
+def unregister_provider(name: str):
+    _registered_providers.pop(name, None)
+    _exclusive_providers.discard(name)
+    MODEL_ROUTES.pop(name, None)
+
+
+class ProviderHealth:
+    """Recent latencies and failure state for one provider, shared by all clients"""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_success(self, latency_s: float):
+        with self._lock:
+            self.calls += 1
+            self.consecutive_failures = 0
+            self.latencies.append(latency_s)
+
+    def record_failure(self, threshold: int, cooldown_s: float):
+        """Count a failed call; threshold consecutive failures bench the provider for cooldown_s"""
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= threshold:
+                self.cooldown_until = time.monotonic() + cooldown_s
+
+    def record_hedge(self, won: bool = False):
+        with self._lock:
+            if won:
+                self.hedge_wins += 1
+            else:
+                self.hedges += 1
+
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    def p90(self) -> Optional[float]:
+        """90th percentile latency in seconds, or None until enough calls have completed"""
+        with self._lock:
+            if len(self.latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(0.9 * (len(ordered) - 1))]
+
+    def stats(self) -> dict:
+        p90 = self.p90()
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "cooling_down": self.cooling_down(),
+                "p90_ms": round(p90 * 1000) if p90 is not None else None,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
+
+
+_health: Dict[str, ProviderHealth] = {}
+_health_lock = threading.Lock()
+
+
+def _provider_health(provider: str) -> ProviderHealth:
+    with _health_lock:
+        if provider not in _health:
+            _health[provider] = ProviderHealth()
+        return _health[provider]
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("CAREER_LLM_HEDGE_WORKERS", "16")),
+                    thread_name_prefix="llm-hedge"
+                )
+    return _hedge_executor
+
+
+def _get_deadline_executor() -> ThreadPoolExecutor:
+    global _deadline_executor
+    if _deadline_executor is None:
+        with _hedge_executor_lock:
+            if _deadline_executor is None:
+                _deadline_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("CAREER_LLM_DEADLINE_WORKERS", "32")),
+                    thread_name_prefix="llm-deadline"
+                )
+    return _deadline_executor
 
 
 class LLMClient:
-    """Unified client for multiple LLM providers"""
-    
-    def __init__(self):
-        self.provider = self._detect_provider()
-        self.client = self._initialize_client()
-    
-    def _detect_provider(self) -> str:
-        """Detect which LLM provider to use based on available API keys"""
-        if os.getenv("GROQ_API_KEY"):
-            return "groq"
-        elif os.getenv("GOOGLE_API_KEY"):
-            return "google"
-        elif os.getenv("OPENAI_API_KEY"):
-            return "openai"
-        elif os.getenv("ANTHROPIC_API_KEY"):
-            return "anthropic"
-        else:
-            return "none"
+    """Unified client for multiple LLM providers; agent names the caller in usage accounting"""
+    
+    def __init__(self, agent: Optional[str] = None):
+        self.agent = agent or "other"
+        if os.getenv("CAREER_LLM_REPLAY"):
+            from career_agent import cassette
+            cassette.install_from_env()
+        self.providers = self._detect_providers()
+        # Primary provider: used for token counting and prompt building
+        self.provider = self.providers[0] if self.providers else "none"
+        self._clients: Dict[str, Any] = {}
+        self._client_lock = threading.Lock()
+        self._google_models = {}
+        self.hedging = os.getenv("CAREER_LLM_HEDGE", "false") == "true"
+        self.hedge_delay_s = float(os.getenv("CAREER_LLM_HEDGE_DELAY_S", "3.0"))
+        self.failure_threshold = int(os.getenv("CAREER_LLM_FAILURE_THRESHOLD", "3"))
+        self.cooldown_s = float(os.getenv("CAREER_LLM_COOLDOWN_S", "30"))
+        self.timeout_s = float(os.getenv("CAREER_LLM_TIMEOUT_S", "60"))
+        self.adaptive_concurrency = os.getenv("CAREER_LLM_ADAPTIVE_CONCURRENCY", "true") == "true"
+        self.throttle_retries = int(os.getenv("CAREER_LLM_THROTTLE_RETRIES", "2"))
+        self.max_continuations = int(os.getenv("CAREER_LLM_MAX_CONTINUATIONS", "2"))
     
-    def _initialize_client(self):
-        """Initialize the appropriate client"""
-        if self.provider == "groq":
+    @property
+    def client(self):
+        """SDK client of the primary provider"""
+        return self._client_for(self.provider)
+    
+    def _client_for(self, provider: str):
+        """Provider SDK client, imported and constructed on first use"""
+        if provider not in self._clients:
+            with self._client_lock:
+                if provider not in self._clients:
+                    self._clients[provider] = self._initialize_client(provider)
+        return self._clients[provider]
+    
+    def _detect_providers(self) -> List[str]:
+        """Ranked pool of available providers (CAREER_LLM_PROVIDERS=a,b,... picks and orders them)"""
+        if _exclusive_providers:
+            return sorted(_exclusive_providers)
+        providers = [name for name, key in PROVIDER_KEYS.items() if os.getenv(key)]
+        ranked = sorted(_registered_providers.items(), key=lambda item: item[1][1] is None)
+        for name, (_, rank) in ranked:
+            providers.insert(len(providers) if rank is None else rank, name)
+        
+        explicit = os.getenv("CAREER_LLM_PROVIDERS")
+        if explicit:
+            wanted = [name.strip() for name in explicit.split(",") if name.strip()]
+            return [name for name in wanted if name in providers]
+        return providers
+    
+    def _initialize_client(self, provider: str):
+        """Initialize the client for a provider"""
+        if provider == "groq":
             from groq import Groq
             return Groq(api_key=os.getenv("GROQ_API_KEY"))
         
-        elif self.provider == "google":
+        elif provider == "google":
+            # Models are bound per call (see _google_model), so the client is the configured module
             import google.generativeai as genai
             genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-            return genai.GenerativeModel('models/gemini-flash-latest')
+            return genai
         
-        elif self.provider == "openai":
+        elif provider == "openai":
             from openai import OpenAI
             try:
                 from opik.integrations.openai import track_openai
                 return track_openai(OpenAI(api_key=os.getenv("OPENAI_API_KEY")))
-            except:
+            except Exception:
                 return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         
-        elif self.provider == "anthropic":
+        elif provider == "anthropic":
             from anthropic import Anthropic
             return Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
         
         return None
     
-    def generate(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
-        """Generate text using the configured provider"""
-        
-        if self.provider == "groq":
-            # Groq (free and fast!)
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",  # Free tier model
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=temperature
+    def model_for(self, task: str, provider: Optional[str] = None) -> Optional[str]:
+        """Model for a task class: CAREER_LLM_MODEL_<TASK> overrides the routing table"""
+        if task not in TASK_CLASSES:
+            raise ValueError(f"Unknown task class {task!r}, expected one of {TASK_CLASSES}")
+        override = os.getenv(f"CAREER_LLM_MODEL_{task.upper()}")
+        if override:
+            return override
+        return MODEL_ROUTES.get(provider or self.provider, {}).get(task)
+    
+    def _routes(self, task: str, escalate: bool = False) -> List[Tuple[str, Optional[str]]]:
+        """(provider, model) pairs to try in order; benched providers go last"""
+        task_class = ESCALATION.get(task, task) if escalate else task
+        routes = [(provider, self.model_for(task_class, provider)) for provider in self.providers]
+        return sorted(routes, key=lambda route: _provider_health(route[0]).cooling_down())
+    
+    @staticmethod
+    def routing_stats() -> dict:
+        """Calls per task/model and escalations per task"""
+        with _routing_lock:
+            return {
+                "calls": {f"{task}:{model}": n for (task, model), n in _routing_counts.items()},
+                "escalations": dict(_escalation_counts),
+            }
+    
+    @staticmethod
+    def provider_stats() -> dict:
+        """Calls, failures, p90 latency, hedging counters and concurrency limit per provider"""
+        with _health_lock:
+            health = dict(_health)
+        limits = concurrency.limiter_stats()
+        return {provider: {**h.stats(), "concurrency": limits.get(provider)} for provider, h in health.items()}
+    
+    @staticmethod
+    def truncation_stats() -> dict:
+        """Truncated answers, continuation calls, repaired and discarded JSON, plus the learned max_tokens per task"""
+        with _routing_lock:
+            counts = dict(_truncation_counts)
+        return {**counts, "max_tokens": _output_sizer.stats()}
+    
+    @staticmethod
+    def _count_truncation(event: str):
+        with _routing_lock:
+            _truncation_counts[event] += 1
+        telemetry.record_metric(f"llm_{event}", 1)
+    
+    @staticmethod
+    def _count_route(task: str, model: Optional[str]):
+        with _routing_lock:
+            _routing_counts[(task, model)] += 1
+    
+    @staticmethod
+    def _count_escalation(task: str):
+        with _routing_lock:
+            _escalation_counts[task] += 1
+    
+    def _google_model(self, model: str):
+        if model not in self._google_models:
+            self._google_models[model] = self._client_for("google").GenerativeModel(model)
+        return self._google_models[model]
+    
+    @staticmethod
+    def coalescing_stats() -> dict:
+        """Counters for single-flight coalescing (requests, upstream_calls, coalesced, in_flight)"""
+        return _single_flight.stats()
+    
+    def _prompt_key(self, system_prompt: str, user_prompt: str, temperature: float, routes: List[Tuple]) -> str:
+        payload = json.dumps([routes, system_prompt, user_prompt, temperature])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _charge_prompt(self, system_prompt: str, user_prompt: str):
+        """Charge the active analysis' token budget (raises TokenBudgetExceeded, or SpendBudgetExceeded for its user)"""
+        context = run_context.current()
+        if context is not None:
+            usage.user_spend().check(context.user_id)
+            context.budget.charge_prompt(count_tokens(f"{system_prompt}\n\n{user_prompt}", self.provider))
+        return context
+    
+    def _record_completion(self, context, text: str):
+        if context is not None:
+            context.budget.record_completion(count_tokens(text, self.provider))
+    
+    def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        task: str = "generate",
+        escalate: bool = False
+    ) -> str:
+        """Generate text on the model routed for task; identical concurrent prompts share one provider call"""
+        return self._complete(system_prompt, user_prompt, temperature, task, escalate).text
+    
+    def _complete(self, system_prompt: str, user_prompt: str, temperature: float, task: str, escalate: bool = False) -> Completion:
+        routes = self._routes(task, escalate)
+        self._count_route(task, routes[0][1] if routes else None)
+        remaining = self._check_deadline()
+        context = self._charge_prompt(system_prompt, user_prompt)
+        call = lambda: self._call_pool(routes, system_prompt, user_prompt, temperature, task)
+        if os.getenv("CAREER_LLM_SINGLE_FLIGHT", "true") == "true":
+            key = self._prompt_key(system_prompt, user_prompt, temperature, routes)
+            call = lambda call=call: _single_flight.do(key, call)
+        if remaining is None:
+            completion = call()
+        else:
+            # Run on a pool so the caller can stop waiting at the deadline; the call itself isn't interrupted
+            future = _get_deadline_executor().submit(contextvars.copy_context().run, call)
+            try:
+                completion = future.result(timeout=remaining)
+            except FutureTimeout:
+                raise DeadlineExceeded(f"LLM call abandoned at the analysis deadline ({remaining:.1f}s)") from None
+        self._record_completion(context, completion.text)
+        return completion
+    
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        task: str = "generate",
+        escalate: bool = False
+    ) -> str:
+        """Async generate; coalesces with identical in-flight calls from threads and other tasks"""
+        return (await self._acomplete(system_prompt, user_prompt, temperature, task, escalate)).text
+    
+    async def _acomplete(self, system_prompt: str, user_prompt: str, temperature: float, task: str,
+                         escalate: bool = False) -> Completion:
+        routes = self._routes(task, escalate)
+        self._count_route(task, routes[0][1] if routes else None)
+        remaining = self._check_deadline()
+        context = self._charge_prompt(system_prompt, user_prompt)
+        # The executor thread doesn't inherit context vars (analysis, lane), so carry them over
+        call = lambda ctx=contextvars.copy_context(): ctx.run(self._call_pool, routes, system_prompt, user_prompt, temperature, task)
+        if os.getenv("CAREER_LLM_SINGLE_FLIGHT", "true") != "true":
+            pending = asyncio.to_thread(call)
+        else:
+            pending = _single_flight.do_async(self._prompt_key(system_prompt, user_prompt, temperature, routes), call)
+        try:
+            completion = await asyncio.wait_for(pending, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"LLM call abandoned at the analysis deadline ({remaining:.1f}s)") from None
+        self._record_completion(context, completion.text)
+        return completion
+    
+    @staticmethod
+    def _check_deadline() -> Optional[float]:
+        """Seconds left for a call in the active analysis (None without a deadline); raises once it has passed"""
+        context = run_context.current()
+        remaining = context.remaining() if context is not None else None
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded("Analysis deadline passed before the LLM call")
+        return remaining
+    
+    def _request_timeout(self) -> float:
+        """Provider request timeout: CAREER_LLM_TIMEOUT_S, or less if the analysis deadline is closer"""
+        context = run_context.current()
+        remaining = context.remaining() if context is not None else None
+        return self.timeout_s if remaining is None else max(0.1, min(self.timeout_s, remaining))
+    
+    def _call_pool(self, routes: List[Tuple[str, Optional[str]]], system_prompt: str, user_prompt: str, temperature: float,
+                   task: str = "generate") -> Completion:
+        """Call providers in rank order until one answers, hedging slow calls if enabled"""
+        if not routes:
+            raise ValueError("No LLM provider configured. Please set GOOGLE_API_KEY, OPENAI_API_KEY, or ANTHROPIC_API_KEY")
+        if self.hedging and len(routes) > 1:
+            return self._call_hedged(routes, system_prompt, user_prompt, temperature, task)
+        
+        last_error = None
+        for index, (provider, model) in enumerate(routes):
+            if index > 0:
+                # Don't fail over past the deadline (the caller may already have given up)
+                self._check_deadline()
+            try:
+                return self._attempt(provider, model, system_prompt, user_prompt, temperature, task)
+            except Exception as e:
+                last_error = e
+                print(f"⚠️ {provider} failed ({type(e).__name__}: {e}), trying next provider")
+        raise last_error
+    
+    def _call_hedged(self, routes: List[Tuple[str, Optional[str]]], system_prompt: str, user_prompt: str, temperature: float,
+                     task: str = "generate") -> Completion:
+        """Race the primary against one hedge sent after the primary's p90 latency
+        
+        Errors fail over immediately. The losing call isn't interrupted; its answer is discarded.
+        """
+        executor = _get_hedge_executor()
+        remaining = list(routes)
+        pending = {}
+        
+        def launch():
+            provider, model = remaining.pop(0)
+            # Each thread gets its own copy so it stays attached to the analysis
+            future = executor.submit(
+                contextvars.copy_context().run,
+                self._attempt, provider, model, system_prompt, user_prompt, temperature, task
             )
-            return response.choices[0].message.content
+            pending[future] = provider
         
-        elif self.provider == "google":
+        primary = routes[0][0]
+        delay = _provider_health(primary).p90() or self.hedge_delay_s
+        hedged = False
+        last_error = None
+        launch()
+        while pending:
+            done, _ = wait(pending, timeout=None if hedged or not remaining else delay, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                _provider_health(primary).record_hedge()
+                launch()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    completion = future.result()
+                except Exception as e:
+                    last_error = e
+                    print(f"⚠️ {provider} failed ({type(e).__name__}: {e}), trying next provider")
+                    continue
+                if hedged and provider != primary:
+                    _provider_health(primary).record_hedge(won=True)
+                return completion
+            if not pending and remaining:
+                launch()
+        raise last_error
+    
+    def _attempt(self, provider: str, model: Optional[str], system_prompt: str, user_prompt: str, temperature: float,
+                 task: str = "generate") -> Completion:
+        """One timed call to one provider (plus continuations of a cut-off answer); empty answers count as failures"""
+        health = _provider_health(provider)
+        max_tokens = _output_sizer.limit(task)
+        limiter = concurrency.limiter(provider) if self.adaptive_concurrency else None
+        retries = self.throttle_retries if limiter else 0
+        retry = False
+        while True:
+            request_timeout = self._request_timeout()
+            start = limiter.acquire(request_timeout, retry) if limiter else time.perf_counter()
+            try:
+                completion = self._call_provider(provider, system_prompt, user_prompt, temperature, model, max_tokens)
+                if not completion.text or not completion.text.strip():
+                    raise ValueError(f"Empty response from {provider}")
+                break
+            except Exception as e:
+                if limiter:
+                    self._release(limiter, start, model, request_timeout, e)
+                    # The limit has just been cut, so a throttled call waits for a slot under it and retries
+                    if retries > 0 and concurrency.is_throttle(e):
+                        retries -= 1
+                        retry = True
+                        continue
+                health.record_failure(self.failure_threshold, self.cooldown_s)
+                raise
+        if limiter:
+            limiter.release(start, model)
+        health.record_success(time.perf_counter() - start)
+        if completion.truncated:
+            completion = self._continue(provider, model, system_prompt, user_prompt, temperature, max_tokens, completion, limiter)
+        text = completion.text
+        latency = time.perf_counter() - start
+        prompt_tokens, completion_tokens = self._record_usage(provider, model, system_prompt, user_prompt, completion, latency)
+        # Continued answers count at their full length, so the task's limit grows to fit them
+        _output_sizer.observe(task, completion_tokens)
+        if os.getenv("CAREER_LLM_RECORD") and provider != "replay":
+            from career_agent import cassette
+            cassette.recorder().record(provider, model, system_prompt, user_prompt, temperature, text, latency,
+                                       prompt_tokens, completion_tokens, completion.truncated)
+        return completion
+    
+    def _continue(self, provider: str, model: Optional[str], system_prompt: str, user_prompt: str, temperature: float,
+                  max_tokens: int, completion: Completion, limiter: Optional[concurrency.AIMDLimiter] = None) -> Completion:
+        """Have the model carry on from a cut-off answer, up to max_continuations times
+        
+        Each continuation is its own provider request with its own concurrency slot,
+        so the limiter never sees a continued answer as one slow call.
+        """
+        self._count_truncation("truncated")
+        continuations = 0
+        # Registered providers get no continuation hook; their cut-off answers are repaired by generate_json
+        while completion.truncated and continuations < self.max_continuations and provider in PROVIDER_KEYS:
+            self._count_truncation("continued")
+            request_timeout = self._request_timeout()
+            start = None
+            try:
+                start = limiter.acquire(request_timeout) if limiter else None
+                more = self._call_provider(provider, system_prompt, user_prompt, temperature, model, max_tokens,
+                                           continue_from=completion.text)
+            except Exception as e:
+                if limiter and start is not None:
+                    self._release(limiter, start, model, request_timeout, e)
+                print(f"⚠️ Continuing a cut-off {provider} answer failed ({type(e).__name__}: {e})")
+                break
+            if limiter:
+                limiter.release(start, model)
+            # Anthropic continues the prefilled answer, which can't end in whitespace
+            head = completion.text.rstrip() if provider == "anthropic" else completion.text
+            completion = Completion(
+                head + more.text,
+                _add_tokens(completion.prompt_tokens, more.prompt_tokens),
+                _add_tokens(completion.completion_tokens, more.completion_tokens),
+                more.truncated
+            )
+            continuations += 1
+        return completion
+    
+    def _release(self, limiter: concurrency.AIMDLimiter, start: float, model: Optional[str], request_timeout: float,
+                 error: BaseException):
+        """Free a failed call's slot"""
+        # A timeout cut short by this analysis' own deadline says nothing about provider congestion
+        deadline_capped = request_timeout < self.timeout_s and concurrency.is_timeout(error)
+        limiter.release(start, model, error=error, adjust=not deadline_capped)
+    
+    def _record_usage(self, provider: str, model: Optional[str], system_prompt: str, user_prompt: str,
+                      completion: Completion, latency: float) -> Tuple[int, int]:
+        """Account one successful call to the analysis, its user and telemetry; returns (prompt, completion) tokens"""
+        estimated = completion.prompt_tokens is None or completion.completion_tokens is None
+        prompt_tokens = completion.prompt_tokens
+        if prompt_tokens is None:
+            prompt_tokens = count_tokens(f"{system_prompt}\n\n{user_prompt}", provider)
+        completion_tokens = completion.completion_tokens
+        if completion_tokens is None:
+            completion_tokens = count_tokens(completion.text, provider)
+        cost = cost_usd(model, prompt_tokens, completion_tokens)
+        
+        context = run_context.current()
+        if context is not None:
+            context.usage.record(self.agent, model, prompt_tokens, completion_tokens, latency, cost, estimated)
+            if context.user_id is not None:
+                usage.user_spend().add(context.user_id, cost)
+        telemetry.record_metric(f"llm_cost_usd.{self.agent}", cost)
+        telemetry.record_metric(f"llm_tokens.{self.agent}", prompt_tokens + completion_tokens)
+        return prompt_tokens, completion_tokens
+    
+    def _call_provider(self, provider: str, system_prompt: str, user_prompt: str, temperature: float, model: Optional[str],
+                       max_tokens: int = 2048, continue_from: Optional[str] = None) -> Completion:
+        """Generate text using one provider (continuing the cut-off answer continue_from if given)"""
+        
+        if provider in _registered_providers:
+            call, _ = _registered_providers[provider]
+            answer = call(system_prompt, user_prompt, temperature, model)
+            return answer if isinstance(answer, Completion) else Completion(answer)
+        
+        elif provider in ("groq", "openai"):
+            # Groq (free and fast!) or OpenAI
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+            if continue_from is not None:
+                messages += [
+                    {"role": "assistant", "content": continue_from},
+                    {"role": "user", "content": CONTINUE_PROMPT}
+                ]
+            # OpenAI's newer models only accept max_completion_tokens
+            limit = {"max_completion_tokens" if provider == "openai" else "max_tokens": max_tokens}
+            response = self._client_for(provider).chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                timeout=self._request_timeout(),
+                **limit
+            )
+            usage_data = getattr(response, "usage", None)
+            return Completion(
+                response.choices[0].message.content,
+                getattr(usage_data, "prompt_tokens", None),
+                getattr(usage_data, "completion_tokens", None),
+                response.choices[0].finish_reason == "length"
+            )
+        
+        elif provider == "google":
             # Google Gemini
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
-            response = self.client.generate_content(
-                full_prompt,
-                generation_config={"temperature": temperature}
+            contents = f"{system_prompt}\n\n{user_prompt}"
+            if continue_from is not None:
+                contents = [
+                    {"role": "user", "parts": [contents]},
+                    {"role": "model", "parts": [continue_from]},
+                    {"role": "user", "parts": [CONTINUE_PROMPT]}
+                ]
+            response = self._google_model(model).generate_content(
+                contents,
+                generation_config={"temperature": temperature, "max_output_tokens": max_tokens},
+                request_options={"timeout": self._request_timeout()}
             )
-            return response.text
-        
-        elif self.provider == "openai":
-            # OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=temperature
+            metadata = getattr(response, "usage_metadata", None)
+            finish_reason = response.candidates[0].finish_reason if response.candidates else None
+            return Completion(
+                response.text,
+                getattr(metadata, "prompt_token_count", None),
+                getattr(metadata, "candidates_token_count", None),
+                getattr(finish_reason, "name", finish_reason) in ("MAX_TOKENS", 2)
             )
-            return response.choices[0].message.content
         
-        elif self.provider == "anthropic":
+        elif provider == "anthropic":
             # Anthropic Claude
-            response = self.client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
-                temperature=temperature
+            messages = [{"role": "user", "content": user_prompt}]
+            if continue_from is not None:
+                # Prefill the answer so far; the model carries on from its last token
+                messages.append({"role": "assistant", "content": continue_from.rstrip()})
+            response = self._client_for("anthropic").messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                # Cache the shared prompt prefix (ignored by the API below the minimum cacheable length)
+                system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+                messages=messages,
+                temperature=temperature,
+                timeout=self._request_timeout()
+            )
+            usage_data = getattr(response, "usage", None)
+            # input_tokens excludes the prompt prefix written to or read from the cache
+            prompt_tokens = None
+            if usage_data is not None:
+                prompt_tokens = (usage_data.input_tokens + (getattr(usage_data, "cache_creation_input_tokens", 0) or 0)
+                                 + (getattr(usage_data, "cache_read_input_tokens", 0) or 0))
+            return Completion(
+                response.content[0].text if response.content else "",
+                prompt_tokens,
+                getattr(usage_data, "output_tokens", None),
+                response.stop_reason == "max_tokens"
             )
-            return response.content[0].text
         
         else:
-            raise ValueError("No LLM provider configured. Please set GOOGLE_API_KEY, OPENAI_API_KEY, or ANTHROPIC_API_KEY")
+            raise ValueError(f"Unknown LLM provider {provider!r}")
     
-    def generate_json(self, system_prompt: str, user_prompt: str, temperature: float = 0.3) -> dict:
-        """Generate JSON response"""
-        response = self.generate(system_prompt, user_prompt, temperature)
+    def generate_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.3,
+        task: str = "generate",
+        validate: Optional[Callable[[Any], bool]] = None
+    ) -> dict:
+        """Generate JSON response
         
+        If the response doesn't parse or validate() rejects it, the call is retried
+        once on the task's escalation model (e.g. score -> generate). A response
+        still cut off after its continuations keeps the complete elements of its
+        JSON array (or object).
+        """
+        try:
+            return self._validated(self._complete(system_prompt, user_prompt, temperature, task), validate)
+        except (ValueError, KeyError, TypeError):
+            if not self._can_escalate(task):
+                raise
+            self._count_escalation(task)
+            return self._validated(self._complete(system_prompt, user_prompt, temperature, task, escalate=True), validate)
+    
+    async def agenerate_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.3,
+        task: str = "generate",
+        validate: Optional[Callable[[Any], bool]] = None
+    ) -> dict:
+        """Async generate_json"""
+        try:
+            return self._validated(await self._acomplete(system_prompt, user_prompt, temperature, task), validate)
+        except (ValueError, KeyError, TypeError):
+            if not self._can_escalate(task):
+                raise
+            self._count_escalation(task)
+            return self._validated(await self._acomplete(system_prompt, user_prompt, temperature, task, escalate=True), validate)
+    
+    def _can_escalate(self, task: str) -> bool:
+        """Whether the task has a bigger model to retry on"""
+        target = ESCALATION.get(task)
+        if target is None or not self.providers:
+            return False
+        return self._routes(task, escalate=True) != self._routes(task)
+    
+    def _validated(self, completion: Completion, validate: Optional[Callable[[Any], bool]]):
+        response = completion.text
+        if not completion.truncated:
+            data = self._parse_json(response)
+        else:
+            # Not _parse_json: its regex fallback would return a lone complete element of a cut-off array
+            try:
+                data = json.loads(self._unfenced(response))
+            except ValueError:
+                try:
+                    data = self._repair_json(response)
+                except ValueError:
+                    self._count_truncation("discarded")
+                    raise
+                self._count_truncation("repaired")
+                print(f"✂️ Kept {len(data)} complete item(s) of a cut-off JSON answer")
+        if validate is not None and not validate(data):
+            raise ValueError(f"Response failed validation: {response}")
+        return data
+    
+    @staticmethod
+    def _repair_json(response: str):
+        """The complete elements of a cut-off JSON array (or members of an object); raises ValueError if there are none"""
+        starts = [index for index in (response.find("["), response.find("{")) if index >= 0]
+        if not starts:
+            raise ValueError(f"No JSON in cut-off response: {response[:200]}")
+        index = min(starts)
+        is_object = response[index] == "{"
+        decoder = json.JSONDecoder()
+        items = {} if is_object else []
+        index += 1
+        while True:
+            while index < len(response) and response[index] in " \t\r\n,":
+                index += 1
+            if index >= len(response) or response[index] in "]}":
+                break
+            try:
+                if is_object:
+                    key, index = decoder.raw_decode(response, index)
+                    while index < len(response) and response[index] in " \t\r\n:":
+                        index += 1
+                    value, index = decoder.raw_decode(response, index)
+                    items[key] = value
+                else:
+                    item, index = decoder.raw_decode(response, index)
+                    items.append(item)
+            except (json.JSONDecodeError, TypeError):
+                # The element the answer stopped in
+                break
+        if not items:
+            raise ValueError(f"No complete JSON element in cut-off response: {response[:200]}")
+        return items
+    
+    @staticmethod
+    def _unfenced(response: str) -> str:
+        """Strip a markdown code block around a response"""
+        # Sometimes LLMs wrap JSON in markdown code blocks
+        if "```json" in response:
+            return response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            return response.split("```")[1].split("```")[0].strip()
+        return response
+    
+    @classmethod
+    def _parse_json(cls, response: str):
+        """Extract JSON from a model response"""
         # Try to extract JSON from response
         try:
-            # Sometimes LLMs wrap JSON in markdown code blocks
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response)
+            return json.loads(cls._unfenced(response))
         except:
             # If parsing fails, try to find JSON in the text
             import re
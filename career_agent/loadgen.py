@@ -0,0 +1,332 @@
+"""Load generator: concurrent simulated users against the pipeline or an HTTP front end
+
+    python -m career_agent.loadgen --mode open --steps 1,2,4,8 --duration 30
+    python -m career_agent.loadgen --mode closed --steps 1,2,4,8,16 --think 0.5
+    python -m career_agent.loadgen --target http://localhost:8000 --mode open --steps 2,5
+
+Open loop: analyses arrive as a Poisson process at each step's rate (per second),
+whether or not earlier ones have finished. Latency is measured from the
+scheduled arrival, so queueing delay counts. Closed loop: each step runs that
+many users, and each user starts its next analysis after the previous one
+finishes, plus think time.
+
+Profiles are a seeded mix drawn from the demo_mode focus areas. The in-process
+pipeline runs against the fake provider (default), the live providers, or
+traffic replayed from a cassette (--provider replay --cassette FILE). Each
+step reports throughput, latency percentiles and error rate, with a timeline
+per window. The saturation point is the first step where the system stops
+keeping up.
+"""
+
+import argparse
+import io
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from career_agent.models import UserProfile
+
+ROLE_TITLES = {
+    "ml": ["Machine Learning Engineer", "ML Engineer", "AI Engineer"],
+    "data": ["Data Scientist", "Data Analyst", "Analytics Engineer"],
+    "backend": ["Backend Engineer", "Backend Developer", "API Engineer"],
+    "frontend": ["Frontend Developer", "Frontend Engineer", "UI Engineer"],
+    "devops": ["DevOps Engineer", "Site Reliability Engineer", "Platform Engineer"],
+}
+CURRENT_ROLES = ["Software Engineer", "Business Analyst", "Systems Administrator", "QA Engineer", "Support Engineer"]
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Retail"]
+
+
+@dataclass
+class Sample:
+    """One analysis: when it was due (seconds since the step started), how long it took, and whether it failed"""
+    start_s: float
+    latency_s: float
+    ok: bool
+    error: Optional[str] = None
+
+
+def make_profiles(count: int, seed: int = 0) -> List[UserProfile]:
+    """Seeded mix of career changers across the demo_mode focus areas"""
+    from career_agent.demo_mode import load_knowledge
+    knowledge = load_knowledge()
+    rng = random.Random(seed)
+
+    profiles = []
+    for i in range(count):
+        focus = rng.choice(list(ROLE_TITLES))
+        skills = knowledge.focus(focus)["required"] + knowledge.focus(focus)["preferred"]
+        profiles.append(UserProfile(
+            name=f"User {i}",
+            current_role=rng.choice(CURRENT_ROLES),
+            target_role=rng.choice(ROLE_TITLES[focus]),
+            skills=rng.sample(skills, k=rng.randint(1, min(4, len(skills)))),
+            experience_years=rng.randint(0, 12),
+            industry=rng.choice(INDUSTRIES)
+        ))
+    return profiles
+
+
+class PipelineTarget:
+    """Runs analyses in-process on one shared CareerGrowthOrchestrator"""
+
+    def __init__(self, provider: str = "fake", fake_latency_s: float = 0.2, cassette_path: Optional[str] = None,
+                 replay_latency: float = 1.0, fake_capacity: Optional[int] = None):
+        from career_agent.regression import _patched_env, offline_provider
+
+        env = {"CAREER_WARM_START": "false"}
+        if provider in ("fake", "replay"):
+            env["CAREER_LLM_PROVIDERS"] = provider
+        self._env = _patched_env(env)
+        self._provider = offline_provider(provider, fake_latency_s, cassette_path, replay_latency, fake_capacity)
+
+    def __enter__(self):
+        self._env.__enter__()
+        self._provider.__enter__()
+        from career_agent.orchestrator import CareerGrowthOrchestrator
+        self.orchestrator = CareerGrowthOrchestrator()
+        return self
+
+    def __exit__(self, *exc):
+        self._provider.__exit__(*exc)
+        self._env.__exit__(*exc)
+
+    def __call__(self, profile: UserProfile):
+        self.orchestrator.run_analysis(profile)
+
+
+class HttpTarget:
+    """POSTs analyses to a running API (career_agent.api)"""
+
+    def __init__(self, base_url: str, timeout_s: float = 300.0):
+        import requests
+        self.url = base_url.rstrip("/") + "/analyze"
+        self.timeout_s = timeout_s
+        self.session = requests.Session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.session.close()
+
+    def __call__(self, profile: UserProfile):
+        response = self.session.post(self.url, json=profile.model_dump(mode="json"), timeout=self.timeout_s)
+        response.raise_for_status()
+
+
+def _timed(target: Callable, profile: UserProfile, due: float, origin: float) -> Sample:
+    try:
+        target(profile)
+        return Sample(due - origin, time.perf_counter() - due, ok=True)
+    except Exception as e:
+        return Sample(due - origin, time.perf_counter() - due, ok=False, error=f"{type(e).__name__}: {e}")
+
+
+def run_open_loop(target: Callable, profiles: List[UserProfile], rate: float, duration_s: float,
+                  max_in_flight: int = 256, seed: int = 0) -> List[Sample]:
+    """Poisson arrivals at rate per second for duration_s; waits for stragglers"""
+    rng = random.Random(seed)
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="loadgen") as pool:
+        origin = time.perf_counter()
+        due = origin
+        while True:
+            due += rng.expovariate(rate)
+            if due - origin >= duration_s:
+                break
+            time.sleep(max(0.0, due - time.perf_counter()))
+            futures.append(pool.submit(_timed, target, rng.choice(profiles), due, origin))
+    return [future.result() for future in futures]
+
+
+def run_closed_loop(target: Callable, profiles: List[UserProfile], users: int, duration_s: float,
+                    think_s: float = 0.0, seed: int = 0) -> List[Sample]:
+    """users concurrent users, each running back-to-back analyses (plus think time) for duration_s"""
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    origin = time.perf_counter()
+
+    def user(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() - origin < duration_s:
+            sample = _timed(target, rng.choice(profiles), time.perf_counter(), origin)
+            with lock:
+                samples.append(sample)
+            if think_s > 0:
+                time.sleep(rng.expovariate(1 / think_s))
+
+    threads = [threading.Thread(target=user, args=(i,), name=f"loadgen-user-{i}") for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def summarize(samples: List[Sample], duration_s: float) -> Dict[str, float]:
+    ok = sorted(s.latency_s for s in samples if s.ok)
+    # Throughput over the whole step, including time spent draining late completions
+    elapsed = max([duration_s] + [s.start_s + s.latency_s for s in samples])
+    return {
+        "requests": len(samples),
+        "offered_rps": len(samples) / duration_s,
+        "errors": len(samples) - len(ok),
+        "error_rate": (len(samples) - len(ok)) / len(samples) if samples else 0.0,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "latency_p50_s": _percentile(ok, 0.50),
+        "latency_p95_s": _percentile(ok, 0.95),
+        "latency_p99_s": _percentile(ok, 0.99),
+        "latency_mean_s": statistics.fmean(ok) if ok else 0.0,
+    }
+
+
+def timeline(samples: List[Sample], window_s: float) -> List[Dict[str, float]]:
+    """Per-window completions, errors and latency percentiles (by start time)"""
+    windows: Dict[int, List[Sample]] = {}
+    for sample in samples:
+        windows.setdefault(int(sample.start_s // window_s), []).append(sample)
+    rows = []
+    for index in sorted(windows):
+        ok = sorted(s.latency_s for s in windows[index] if s.ok)
+        rows.append({
+            "window_start_s": index * window_s,
+            "started": len(windows[index]),
+            "errors": len(windows[index]) - len(ok),
+            "latency_p50_s": _percentile(ok, 0.50),
+            "latency_p95_s": _percentile(ok, 0.95),
+        })
+    return rows
+
+
+def find_saturation(steps: List[dict], mode: str, max_error_rate: float = 0.05) -> Optional[dict]:
+    """First step where the system stops keeping up, with the reason
+
+    Open loop: throughput under 80% of the measured arrival rate, a growing backlog
+    (the last window's p50 latency over 1.5x the first's), p95 latency over 2x the
+    first step's, or too many errors. Closed loop: adding users raises throughput by
+    less than 10%, or too many errors.
+    """
+    baseline_p95 = steps[0]["summary"]["latency_p95_s"] if steps else 0.0
+    for previous, step in zip([None] + steps, steps):
+        summary = step["summary"]
+        if summary["error_rate"] > max_error_rate:
+            return {"step": step["load"], "reason": f"error rate {summary['error_rate']:.1%}"}
+        if mode == "open":
+            if summary["throughput_rps"] < 0.8 * summary["offered_rps"]:
+                return {"step": step["load"], "reason": (
+                    f"throughput {summary['throughput_rps']:.2f}/s behind arrivals {summary['offered_rps']:.2f}/s"
+                )}
+            windows = [row for row in step["timeline"] if row["started"] > row["errors"]]
+            if len(windows) > 1 and windows[-1]["latency_p50_s"] > 1.5 * windows[0]["latency_p50_s"]:
+                return {"step": step["load"], "reason": (
+                    f"backlog: p50 rose from {windows[0]['latency_p50_s']:.2f}s to {windows[-1]['latency_p50_s']:.2f}s"
+                )}
+            if baseline_p95 and summary["latency_p95_s"] > 2 * baseline_p95:
+                return {"step": step["load"], "reason": f"p95 {summary['latency_p95_s']:.2f}s over 2x baseline"}
+        elif previous is not None and summary["throughput_rps"] < 1.1 * previous["summary"]["throughput_rps"]:
+            return {"step": step["load"], "reason": f"throughput flat at {summary['throughput_rps']:.2f}/s"}
+    return None
+
+
+def run_steps(target: Callable, profiles: List[UserProfile], mode: str, loads: List[float], duration_s: float,
+              think_s: float = 0.0, window_s: float = 5.0, seed: int = 0, verbose: bool = False) -> List[dict]:
+    steps = []
+    for load in loads:
+        label = f"{load}/s" if mode == "open" else f"{int(load)} users"
+        print(f"🚀 {mode} loop, {label} for {duration_s:.0f}s...")
+        with nullcontext() if verbose else redirect_stdout(io.StringIO()):
+            if mode == "open":
+                samples = run_open_loop(target, profiles, load, duration_s, seed=seed)
+            else:
+                samples = run_closed_loop(target, profiles, int(load), duration_s, think_s, seed=seed)
+        summary = summarize(samples, duration_s)
+        print(f"   {summary['throughput_rps']:.2f}/s, p50 {summary['latency_p50_s']:.2f}s, "
+              f"p95 {summary['latency_p95_s']:.2f}s, errors {summary['error_rate']:.1%}")
+        steps.append({
+            "load": load,
+            "summary": summary,
+            "timeline": timeline(samples, window_s),
+            "errors": sorted({s.error for s in samples if s.error})[:5],
+            "samples": [asdict(s) for s in samples],
+        })
+    return steps
+
+
+def print_report(steps: List[dict], mode: str, saturation: Optional[dict]):
+    print("\n" + "=" * 60)
+    print("📈 LOAD REPORT")
+    print("=" * 60)
+    unit = "rate/s" if mode == "open" else "users"
+    print(f"\n{unit:>8} {'req':>6} {'offer/s':>8} {'tput/s':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'err':>7}")
+    for step in steps:
+        s = step["summary"]
+        print(f"{step['load']:>8g} {s['requests']:>6} {s['offered_rps']:>8.2f} {s['throughput_rps']:>8.2f} {s['latency_p50_s']:>8.2f} "
+              f"{s['latency_p95_s']:>8.2f} {s['latency_p99_s']:>8.2f} {s['error_rate']:>7.1%}")
+        for error in step["errors"]:
+            print(f"         ⚠️  {error}")
+
+    if saturation is None:
+        print(f"\n✅ No saturation up to {steps[-1]['load']:g} {unit}")
+    else:
+        sustained = [step["load"] for step in steps if step["load"] < saturation["step"]]
+        print(f"\n⚠️  Saturated at {saturation['step']:g} {unit}: {saturation['reason']}")
+        if sustained:
+            print(f"   Highest sustained load: {sustained[-1]:g} {unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the pipeline with simulated concurrent users")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open", help="Open loop (arrival rate) or closed loop (users)")
+    parser.add_argument("--steps", default="1,2,4", help="Comma-separated arrival rates (open) or user counts (closed)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per step")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean think time between a closed-loop user's analyses")
+    parser.add_argument("--target", default="pipeline", help="'pipeline' (in-process) or the base URL of a running API")
+    parser.add_argument("--provider", choices=["fake", "live", "replay"], default="fake", help="LLM provider for the in-process pipeline")
+    parser.add_argument("--fake-latency", type=float, default=0.2, help="Mean fake provider latency per call (seconds)")
+    parser.add_argument("--fake-capacity", type=int, default=None, help="Concurrent calls the fake provider accepts before answering 429")
+    parser.add_argument("--cassette", default=None, help="Cassette to replay with --provider replay")
+    parser.add_argument("--replay-latency", type=float, default=1.0, help="Scale of the recorded latencies (0 = none, 1 = original)")
+    parser.add_argument("--profiles", type=int, default=50, help="Distinct profiles in the mix")
+    parser.add_argument("--window", type=float, default=5.0, help="Timeline window (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write steps, timelines and samples as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    args = parser.parse_args()
+    if args.provider == "replay" and not args.cassette:
+        parser.error("--provider replay needs --cassette")
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    loads = [float(load) for load in args.steps.split(",")]
+    profiles = make_profiles(args.profiles, seed=args.seed)
+    if args.target == "pipeline":
+        target = PipelineTarget(args.provider, args.fake_latency, args.cassette, args.replay_latency, args.fake_capacity)
+    else:
+        target = HttpTarget(args.target)
+
+    with target:
+        steps = run_steps(target, profiles, args.mode, loads, args.duration, args.think, args.window, args.seed, args.verbose)
+
+    saturation = find_saturation(steps, args.mode)
+    print_report(steps, args.mode, saturation)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"mode": args.mode, "steps": steps, "saturation": saturation}, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
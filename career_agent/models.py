@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+import hashlib
+import json
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 
 
@@ -13,6 +15,11 @@ class UserProfile(BaseModel):
     industry: str
     resume_text: Optional[str] = None
 
+    def fingerprint(self) -> str:
+        """Stable hash of the profile, used to key cached analyses"""
+        payload = json.dumps(self.model_dump(), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
 
 class JobPosting(BaseModel):
     """Scraped job posting data"""
@@ -31,7 +38,18 @@ class SkillGap(BaseModel):
     importance: float = Field(ge=0.0, le=1.0)
     frequency_in_jobs: int
     confidence: float = Field(ge=0.0, le=1.0)
-    reasoning: str
+    # Filled in on first explain() when the pipeline defers it (None until then)
+    reasoning: Optional[str] = None
+    _explainer: Optional[Callable[["SkillGap"], str]] = PrivateAttr(default=None)
+
+    def explain(self) -> str:
+        """Reasoning for this gap, generated and cached on first use if it was deferred"""
+        if self.reasoning is None:
+            if self._explainer is not None:
+                self.reasoning = self._explainer(self)
+            else:
+                self.reasoning = f"Appears in {self.frequency_in_jobs} of the analyzed job postings"
+        return self.reasoning
 
 
 class LearningResource(BaseModel):
@@ -53,6 +71,28 @@ class LearningSession(BaseModel):
     skill_target: str
 
 
+class LLMUsage(BaseModel):
+    """Token, latency and cost totals for a set of LLM calls"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_s: float = 0.0
+    cost_usd: float = 0.0
+
+
+class UsageReport(BaseModel):
+    """LLM usage of one analysis, in total and per agent and model"""
+    user_id: Optional[str] = None
+    total: LLMUsage = Field(default_factory=LLMUsage)
+    by_agent: Dict[str, LLMUsage] = Field(default_factory=dict)
+    by_model: Dict[str, LLMUsage] = Field(default_factory=dict)
+    # Calls whose provider reported no usage, so their tokens were counted locally
+    estimated_calls: int = 0
+    # The user's spend over the budget window after this analysis, and the budget (None = unlimited)
+    user_spend_usd: Optional[float] = None
+    user_budget_usd: Optional[float] = None
+
+
 class AnalysisResult(BaseModel):
     """Complete analysis result"""
     profile: UserProfile
@@ -60,4 +100,8 @@ class AnalysisResult(BaseModel):
     skill_gaps: List[SkillGap]
     learning_resources: List[LearningResource]
     schedule: List[LearningSession]
+    # Sections degraded by the deadline or token budget (job_postings, skill_gaps, learning_resources)
+    partial_sections: List[str] = Field(default_factory=list)
+    # LLM tokens and cost of the analysis (None for demo mode and results built elsewhere)
+    usage: Optional[UsageReport] = None
     created_at: datetime = Field(default_factory=datetime.now)
@@ -1,12 +1,22 @@
+import contextvars
 import os
-import opik
-from opik.evaluation import evaluate
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Optional
+from career_agent import concurrency, profiling, run_context, tracing
+from career_agent.run_context import analysis_context
 from career_agent.models import UserProfile, AnalysisResult
 from career_agent.job_analyzer import JobAnalyzerAgent
 from career_agent.skill_gap_agent import SkillGapAgent
 from career_agent.resource_curator import ResourceCuratorAgent
 from career_agent.scheduler_agent import SchedulerAgent
 from career_agent.evaluator import CareerAgentEvaluator
+from career_agent.warm_start import WarmStartStore, diff_against_snapshot
+
+
+# Share of the deadline each LLM stage must leave for the stages after it
+STAGE_RESERVES = {"jobs": 0.7, "skill_gaps": 0.3, "resources": 0.1}
 
 
 class CareerGrowthOrchestrator:
@@ -14,7 +24,7 @@ class CareerGrowthOrchestrator:
     
     def __init__(self):
         try:
-            opik.configure(api_key=os.getenv("OPIK_API_KEY"))
+            tracing.configure(api_key=os.getenv("OPIK_API_KEY"))
         except Exception as e:
             print(f"⚠️  Opik configuration failed: {e}")
             print("   Continuing without Opik tracing...")
@@ -24,40 +34,90 @@ class CareerGrowthOrchestrator:
         self.resource_curator = ResourceCuratorAgent()
         self.scheduler = SchedulerAgent()
         self.evaluator = CareerAgentEvaluator()
+        # Precomputed snapshots for popular role/industry pairs (None if none were built)
+        self.warm_start = WarmStartStore.from_env()
+        # When gap reasoning is generated: lazy (first read), background (right after the run) or eager
+        self.gap_reasoning = os.getenv("CAREER_GAP_REASONING", "lazy")
+        # Fetch resources for the likely top gaps while gaps are still being scored
+        self.speculative_curation = os.getenv("CAREER_SPECULATIVE_CURATION", "false") == "true"
     
-    @opik.track(
+    @tracing.track(
         name="career_growth_pipeline",
         tags=["production", "multi-agent"],
         metadata={"version": "0.1.0"}
     )
-    def run_analysis(self, profile: UserProfile) -> AnalysisResult:
-        """Run complete career growth analysis pipeline"""
+    def run_analysis(
+        self,
+        profile: UserProfile,
+        progress: Optional[Callable[[str, int], None]] = None,
+        deadline_s: Optional[float] = None,
+        profile_run: Optional[bool] = None,
+        user_id: Optional[str] = None
+    ) -> AnalysisResult:
+        """Run complete career growth analysis pipeline
         
-        # Step 1: Analyze job market
-        print(f"🔍 Analyzing job market for {profile.target_role}...")
-        jobs = self.job_analyzer.scrape_jobs(
-            role=profile.target_role,
-            industry=profile.industry,
-            limit=5
-        )
-        print(f"✓ Found {len(jobs)} job postings")
+        progress, if given, is called as progress(stage, percent) when each stage starts.
+        deadline_s (default CAREER_DEADLINE_S) bounds the whole run; stages that run out of
+        time degrade and are listed in result.partial_sections.
+        profile_run (default CAREER_PROFILE) writes a stack and allocation profile of the run.
+        user_id, the authenticated caller, is charged for the run's LLM spend (see usage);
+        without one no spend budget applies.
+        """
         
-        # Step 2: Extract skills from jobs
-        print("\n📊 Extracting skill requirements...")
-        market_skills = self.job_analyzer.extract_skills_from_jobs(jobs)
-        print(f"✓ Identified {len(market_skills)} unique skills")
+        with profiling.maybe_profile(f"analysis-{profile.fingerprint()}-{int(time.time() * 1000)}", profile_run):
+            return self._run_analysis(profile, progress, deadline_s, user_id)
+    
+    def _run_analysis(self, profile: UserProfile, progress, deadline_s: Optional[float], user_id: Optional[str]):
+        # A caller that already opened a context (e.g. the regression harness) keeps its accounting
+        outer = run_context.current()
+        with nullcontext(outer) if outer is not None else analysis_context(deadline_s=deadline_s, user_id=user_id) as context:
+            outcome = self._run_pipeline(profile, progress)
+            result = outcome[0]
+            usage_lock = threading.Lock()
+            
+            def refresh_usage():
+                with usage_lock:
+                    result.usage = context.usage.report(context.user_id)
+            
+            # Lazy or background reasoning is charged to this run after the report below; keep result.usage current
+            SkillGapAgent.on_reasoning(result.skill_gaps, refresh_usage)
+            self._schedule_reasoning(result.skill_gaps)
+            
+            tokens = context.budget.report()
+            print(f"\n🧮 Tokens: {tokens['prompt_tokens']} prompt + {tokens['completion_tokens']} completion "
+                  f"over {tokens['llm_calls']} calls, {tokens['tokens_saved']} saved")
+            tracing.track_metric(name="prompt_tokens", value=tokens["prompt_tokens"])
+            tracing.track_metric(name="completion_tokens", value=tokens["completion_tokens"])
+            tracing.track_metric(name="tokens_saved", value=tokens["tokens_saved"])
+            
+            refresh_usage()
+            usage = result.usage
+            by_agent = ", ".join(f"{agent} ${totals.cost_usd:.4f}" for agent, totals in usage.by_agent.items())
+            print(f"💵 LLM cost: ${usage.total.cost_usd:.4f}" + (f" ({by_agent})" if by_agent else ""))
+            tracing.track_metric(name="llm_cost_usd", value=usage.total.cost_usd)
+            if outer is None:
+                context.finish()
         
-        # Step 3: Identify skill gaps
-        print(f"\n🎯 Analyzing skill gaps for {profile.name}...")
-        skill_gaps = self.skill_gap_agent.analyze_gaps(profile, market_skills)
-        print(f"✓ Found {len(skill_gaps)} skill gaps")
+        self._report(progress, "done", 100)
+        return outcome
+    
+    def _run_pipeline(self, profile: UserProfile, progress) -> AnalysisResult:
+        """Pipeline stages; runs inside the analysis context opened by run_analysis"""
         
-        # Step 4: Curate learning resources
-        print("\n📚 Curating learning resources...")
-        resources = self.resource_curator.curate_resources(skill_gaps)
-        print(f"✓ Curated {len(resources)} resources")
+        snapshot = self.warm_start.get(profile.target_role, profile.industry) if self.warm_start else None
+        if snapshot is not None:
+            # Steps 1-4 from a precomputed snapshot: only the per-user diff runs
+            self._report(progress, "skill_gaps", 25)
+            print(f"⚡ Warm start from {snapshot.role} / {snapshot.industry} snapshot")
+            jobs = snapshot.job_postings
+            skill_gaps, resources = diff_against_snapshot(snapshot, profile)
+            print(f"✓ Found {len(skill_gaps)} skill gaps and {len(resources)} resources")
+            tracing.track_metric(name="warm_start_hit", value=1)
+        else:
+            jobs, skill_gaps, resources = self._run_llm_stages(profile, progress)
         
         # Step 5: Create learning schedule
+        self._report(progress, "schedule", 85)
         print("\n📅 Creating personalized schedule...")
         schedule = self.scheduler.create_schedule(resources)
         print(f"✓ Scheduled {len(schedule)} learning sessions")
@@ -67,10 +127,15 @@ class CareerGrowthOrchestrator:
             job_postings=jobs,
             skill_gaps=skill_gaps,
             learning_resources=resources,
-            schedule=schedule
+            schedule=schedule,
+            partial_sections=list(run_context.current().partial_sections)
         )
+        if result.partial_sections:
+            print(f"⏱️  Partial result: {', '.join(result.partial_sections)}")
+        tracing.track_metric(name="partial_result", value=int(bool(result.partial_sections)))
         
         # Evaluate quality with Opik
+        self._report(progress, "evaluation", 90)
         print("\n🔬 Running Opik evaluations...")
         gap_eval = self.evaluator.evaluate_skill_gaps(skill_gaps, jobs)
         resource_eval = self.evaluator.evaluate_resources(resources, skill_gaps)
@@ -80,18 +145,84 @@ class CareerGrowthOrchestrator:
         print(f"  ✓ Overall Quality: {gap_eval['overall_quality']:.2%}")
         
         # Track overall metrics
-        try:
-            opik.track_metric(name="pipeline_success", value=1)
-            opik.track_metric(name="total_gaps_found", value=len(skill_gaps))
-            opik.track_metric(name="total_resources", value=len(resources))
-            opik.track_metric(name="grounding_score", value=gap_eval['grounding_score'])
-            opik.track_metric(name="hallucination_rate", value=gap_eval['hallucination_rate'])
-            opik.track_metric(name="overall_quality", value=gap_eval['overall_quality'])
-        except:
-            pass
+        tracing.track_metric(name="pipeline_success", value=1)
+        tracing.track_metric(name="total_gaps_found", value=len(skill_gaps))
+        tracing.track_metric(name="total_resources", value=len(resources))
+        tracing.track_metric(name="grounding_score", value=gap_eval['grounding_score'])
+        tracing.track_metric(name="hallucination_rate", value=gap_eval['hallucination_rate'])
+        tracing.track_metric(name="overall_quality", value=gap_eval['overall_quality'])
         
         return result, gap_eval, resource_eval
     
+    def _run_llm_stages(self, profile: UserProfile, progress):
+        """Steps 1-4: job market, skill extraction, gap scoring and resource curation"""
+        
+        context = run_context.current()
+        
+        # Step 1: Analyze job market
+        self._report(progress, "jobs", 0)
+        print(f"🔍 Analyzing job market for {profile.target_role}...")
+        with context.stage(reserve=STAGE_RESERVES["jobs"]):
+            jobs = self.job_analyzer.scrape_jobs(
+                role=profile.target_role,
+                industry=profile.industry,
+                limit=5
+            )
+        print(f"✓ Found {len(jobs)} job postings")
+        
+        # Step 2: Extract skills from jobs
+        self._report(progress, "skills", 20)
+        print("\n📊 Extracting skill requirements...")
+        market_skills = self.job_analyzer.extract_skills_from_jobs(jobs)
+        print(f"✓ Identified {len(market_skills)} unique skills")
+        
+        # Steps 3 and 4 overlap when speculating: resources for the most frequent
+        # missing skills are fetched while the gaps are scored
+        speculation = self.resource_curator.speculate(profile, market_skills) if self.speculative_curation else None
+        try:
+            # Step 3: Identify skill gaps
+            self._report(progress, "skill_gaps", 25)
+            print(f"\n🎯 Analyzing skill gaps for {profile.name}...")
+            with context.stage(reserve=STAGE_RESERVES["skill_gaps"]):
+                skill_gaps = self.skill_gap_agent.analyze_gaps(profile, market_skills, jobs=jobs)
+            print(f"✓ Found {len(skill_gaps)} skill gaps")
+            
+            # Step 4: Curate learning resources
+            self._report(progress, "resources", 60)
+            print("\n📚 Curating learning resources...")
+            with context.stage(reserve=STAGE_RESERVES["resources"]):
+                resources = self.resource_curator.curate_resources(skill_gaps, speculation=speculation)
+            print(f"✓ Curated {len(resources)} resources")
+        finally:
+            if speculation is not None:
+                stats = speculation.finish()
+                print(f"🔮 Speculation: {stats['hits']}/{stats['speculated']} used, "
+                      f"{stats['wasted_calls']} wasted calls, {stats['cancelled']} cancelled")
+                tracing.track_metric(name="speculation_hit_rate", value=stats["hit_rate"])
+                tracing.track_metric(name="speculation_wasted_calls", value=stats["wasted_calls"])
+        
+        return jobs, skill_gaps, resources
+    
+    def _schedule_reasoning(self, gaps):
+        """Generate gap reasoning now, in a background thread, or not at all (lazy) per gap_reasoning"""
+        if self.gap_reasoning == "eager":
+            SkillGapAgent.explain_all(gaps)
+        elif self.gap_reasoning == "background" and gaps:
+            # Nobody waits on this, so it queues behind interactive and batch calls
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(concurrency.run_in_lane, "background", SkillGapAgent.explain_all, gaps),
+                name="gap-reasoning",
+                daemon=True
+            ).start()
+    
+    @staticmethod
+    def _report(progress, stage: str, percent: int):
+        """Forward stage progress to the caller's callback, if any"""
+        profiling.mark(stage)
+        if progress is not None:
+            progress(stage, percent)
+    
     def evaluate_pipeline(self, result: AnalysisResult, gap_eval: dict, resource_eval: dict):
         """Display evaluation results"""
         
@@ -110,7 +241,7 @@ class CareerGrowthOrchestrator:
         print(f"   Avg Relevance: {resource_eval['avg_relevance']:.1%}")
         print(f"   Quality Score: {resource_eval['resource_quality']:.1%}")
         
-        print("\n" + self.evaluator.get_evaluation_summary())
+        print("\n" + self.evaluator.get_evaluation_summary(gap_eval))
         print("\n" + "="*60)
     
     def display_results(self, result: AnalysisResult):
@@ -128,7 +259,7 @@ class CareerGrowthOrchestrator:
         for i, gap in enumerate(result.skill_gaps[:5], 1):
             print(f"   {i}. {gap.skill.title()}")
             print(f"      Importance: {gap.importance:.2f} | Confidence: {gap.confidence:.2f}")
-            print(f"      Reason: {gap.reasoning}")
+            print(f"      Reason: {gap.explain()}")
         
         print(f"\n📚 Recommended Resources:")
         for i, resource in enumerate(result.learning_resources[:5], 1):
@@ -0,0 +1,228 @@
+"""Opt-in per-request profiling: sampled stacks (speedscope) plus allocations per stage
+
+    CAREER_PROFILE=true               profile every run_analysis (or pass profile_run=True / ?profile_run=true)
+    CAREER_PROFILE_DIR=profiles       where reports are written
+    CAREER_PROFILE_INTERVAL_MS=5      stack sampling interval
+    CAREER_PROFILE_TOP=15             allocation sites listed per stage
+
+Each profiled request writes <label>.speedscope.json (open it at
+https://www.speedscope.app) and <label>.allocations.txt. The stack sampler
+runs in a background thread and records the request thread plus the
+analysis' helper pools (LLM calls, hedges, speculation). Stages are marked by
+the orchestrator's progress reports; when profiling is off, mark() is a
+single ContextVar lookup.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# Helper threads that belong to an analysis (see llm_client / resource_curator / orchestrator)
+HELPER_THREAD_PREFIXES = ("llm-", "speculate", "gap-reasoning")
+
+_active: ContextVar[Optional["RequestProfiler"]] = ContextVar("career_agent_profiler", default=None)
+
+# The profiler's own bookkeeping is left out of allocation reports
+_SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def enabled(flag: Optional[bool] = None) -> bool:
+    """Whether to profile a request: the request flag if given, else CAREER_PROFILE"""
+    if flag is not None:
+        return flag
+    return os.getenv("CAREER_PROFILE", "false") == "true"
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stacks of the request thread and analysis helper threads at a fixed interval"""
+
+    def __init__(self, target_thread: int, interval_s: float):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.target_thread = target_thread
+        self.interval_s = interval_s
+        self._stop_event = threading.Event()
+        self.frames: List[dict] = []
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        # thread name -> (stacks as frame index lists, weights)
+        self.samples: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        self.start_time = time.perf_counter()
+        self.end_time = self.start_time
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval_s):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.end_time = time.perf_counter()
+
+    def _sample(self, weight: float):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            name = names.get(ident, str(ident))
+            if ident != self.target_thread and not name.startswith(HELPER_THREAD_PREFIXES):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._index(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            stacks, weights = self.samples.setdefault("request" if ident == self.target_thread else name, ([], []))
+            stacks.append(stack)
+            weights.append(weight)
+
+    def _index(self, code) -> int:
+        key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+        if key not in self._frame_index:
+            self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return self._frame_index[key]
+
+    def speedscope(self, label: str) -> dict:
+        duration = self.end_time - self.start_time
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": label,
+            "exporter": "career_agent.profiling",
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": duration,
+                    "samples": stacks,
+                    "weights": weights,
+                }
+                for thread, (stacks, weights) in sorted(self.samples.items(), key=lambda item: item[0] != "request")
+            ],
+        }
+
+
+class RequestProfiler:
+    """Stack samples and per-stage allocation snapshots for one request"""
+
+    def __init__(self, label: str, out_dir: Optional[str] = None, interval_s: Optional[float] = None, top: Optional[int] = None):
+        self.label = label
+        self.out_dir = out_dir or os.getenv("CAREER_PROFILE_DIR", "profiles")
+        self.interval_s = interval_s or float(os.getenv("CAREER_PROFILE_INTERVAL_MS", "5")) / 1000
+        self.top = top or int(os.getenv("CAREER_PROFILE_TOP", "15"))
+        self._sampler: Optional[_StackSampler] = None
+        # (stage, start time, snapshot at stage start); _peaks[i] is the peak during stage i
+        self._stages: List[Tuple[str, float, tracemalloc.Snapshot]] = []
+        self._peaks: List[int] = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        _start_tracemalloc()
+        self._stages.append(("start", time.perf_counter(), self._snapshot()))
+        tracemalloc.reset_peak()
+        self._sampler = _StackSampler(threading.get_ident(), self.interval_s)
+        self._sampler.start()
+
+    def mark(self, stage: str):
+        """Close the running stage and start a new one"""
+        with self._lock:
+            self._peaks.append(tracemalloc.get_traced_memory()[1])
+            self._stages.append((stage, time.perf_counter(), self._snapshot()))
+            tracemalloc.reset_peak()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot()
+
+    def stop(self) -> Tuple[str, str]:
+        """Stop sampling, write the reports and return their paths (speedscope, allocations)"""
+        self._sampler.stop()
+        self.mark("end")
+        _stop_tracemalloc()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        speedscope_path = os.path.join(self.out_dir, f"{self.label}.speedscope.json")
+        with open(speedscope_path, "w", encoding="utf-8") as f:
+            json.dump(self._sampler.speedscope(self.label), f)
+        allocations_path = os.path.join(self.out_dir, f"{self.label}.allocations.txt")
+        with open(allocations_path, "w", encoding="utf-8") as f:
+            f.write(self.allocation_report())
+        return speedscope_path, allocations_path
+
+    def allocation_report(self) -> str:
+        lines = [f"Allocation report for {self.label}", ""]
+        for (stage, started, before), (_, ended, after), peak in zip(self._stages, self._stages[1:], self._peaks):
+            diffs = after.filter_traces(_SNAPSHOT_FILTERS).compare_to(before.filter_traces(_SNAPSHOT_FILTERS), "lineno")
+            net = sum(diff.size_diff for diff in diffs)
+            lines.append(f"== {stage}: {(ended - started) * 1000:.0f} ms, net {net / 1024:+.1f} KiB, peak {peak / 1024:.1f} KiB")
+            for diff in sorted(diffs, key=lambda d: d.size_diff, reverse=True)[:self.top]:
+                if diff.size_diff <= 0:
+                    break
+                frame = diff.traceback[0]
+                lines.append(f"   {diff.size_diff / 1024:+9.1f} KiB {diff.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_request(label: str):
+    """Profile the enclosed block unless a profiler is already active in this context"""
+    if _active.get() is not None:
+        yield _active.get()
+        return
+    profiler = RequestProfiler(label)
+    profiler.start()
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
+        speedscope_path, allocations_path = profiler.stop()
+        print(f"🔬 Profile written to {speedscope_path} and {allocations_path}")
+
+
+def run_profiled(fn, label: str, *args, **kwargs):
+    """Call fn(*args, **kwargs) under profile_request(label) (for thread pool submission)"""
+    with profile_request(label):
+        return fn(*args, **kwargs)
+
+
+def maybe_profile(label: str, flag: Optional[bool] = None):
+    """profile_request(label) if profiling is enabled for this request, else a no-op context"""
+    return profile_request(label) if enabled(flag) else nullcontext()
+
+
+def mark(stage: str):
+    """Mark a stage boundary on the active profiler (no-op when not profiling)"""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.mark(stage)
@@ -0,0 +1,269 @@
+"""Prompt building and token budgeting for agent prompts
+
+Prompts are split into a stable shared prefix (instructions + shared context,
+sent as the system prompt) and a small per-call task. Keeping the prefix
+byte-identical across calls lets provider prompt caching reuse it. Agents put
+all context their calls share (profile, analyzed job postings) in the prefix,
+which is what lets it reach the provider's minimum cacheable length. A reused
+prefix only counts as saved tokens when the provider caches prompts and the
+prefix meets that minimum; other reuses are reported as prefix_reused_uncached.
+
+Output limits (max_tokens) are sized per task class from observed completion
+lengths, see OutputSizer:
+
+    CAREER_LLM_MAX_TOKENS_<TASK>=n       fixed limit for a task class (classify, score, generate)
+    CAREER_LLM_MAX_OUTPUT_TOKENS=4096    upper bound of a learned limit
+    CAREER_LLM_OUTPUT_HEADROOM=1.5       learned limit = p99 observed length x headroom
+"""
+
+import math
+import os
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from career_agent.models import JobPosting, UserProfile
+
+# Fallback characters-per-token when no tokenizer is available for a provider
+CHARS_PER_TOKEN = {"openai": 4.0, "groq": 3.8, "google": 4.0, "anthropic": 3.5}
+TIKTOKEN_ENCODINGS = {"openai": "o200k_base", "groq": "cl100k_base"}
+# Shortest prefix each provider's prompt cache accepts (Anthropic: Haiku's 2048; Sonnet takes 1024).
+# The Groq and Gemini paths don't cache.
+PREFIX_CACHE_MIN_TOKENS = {"openai": 1024, "anthropic": 2048}
+
+_encoders: Dict[str, object] = {}
+_encoder_lock = threading.Lock()
+
+
+def _encoder(provider: str):
+    """tiktoken encoder for the provider, or None (cached, including failures)"""
+    if provider not in _encoders:
+        with _encoder_lock:
+            if provider not in _encoders:
+                encoder = None
+                name = TIKTOKEN_ENCODINGS.get(provider)
+                if name and os.getenv("CAREER_LLM_TOKENIZER", "auto") != "heuristic":
+                    try:
+                        import tiktoken
+                        encoder = tiktoken.get_encoding(name)
+                    except Exception:
+                        encoder = None
+                _encoders[provider] = encoder
+    return _encoders[provider]
+
+
+def count_tokens(text: str, provider: str) -> int:
+    """Count tokens for a provider (exact with tiktoken where available, otherwise estimated)"""
+    if not text:
+        return 0
+    encoder = _encoder(provider)
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN.get(provider, 4.0))
+
+
+def compact(text: str) -> str:
+    """Strip indentation and trailing whitespace and collapse runs of blank lines"""
+    lines = []
+    for line in text.strip().splitlines():
+        line = line.strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def profile_context(profile: "UserProfile") -> str:
+    """Compact, deduplicated description of the user shared by every per-skill prompt"""
+    seen = set()
+    skills = []
+    for skill in profile.skills:
+        key = skill.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            skills.append(skill.strip())
+    return "\n".join([
+        "User profile:",
+        f"- Current role: {profile.current_role}",
+        f"- Target role: {profile.target_role}",
+        f"- Experience: {profile.experience_years} years",
+        f"- Current skills: {', '.join(skills)}",
+    ])
+
+
+def market_context(market_skills: Dict[str, int], jobs: Optional[List["JobPosting"]] = None) -> str:
+    """Analyzed job postings and skill demand, shared by every per-skill prompt of an analysis"""
+    lines = []
+    required: Dict[str, List[str]] = {}
+    preferred: Dict[str, List[str]] = {}
+    if jobs:
+        lines.append("Job postings analyzed:")
+        for job in jobs:
+            lines.append(f"- {job.title} at {job.company}")
+            lines.append(f"Required: {', '.join(job.required_skills)}")
+            if job.preferred_skills:
+                lines.append(f"Preferred: {', '.join(job.preferred_skills)}")
+            lines.append(" ".join(job.description.split()))
+            for skill in job.required_skills:
+                required.setdefault(skill.lower().strip(), []).append(job.company)
+            for skill in job.preferred_skills:
+                preferred.setdefault(skill.lower().strip(), []).append(job.company)
+        lines.append("")
+    lines.append("Skill demand (2 per posting requiring the skill, 1 per posting preferring it):")
+    for skill, frequency in sorted(market_skills.items(), key=lambda item: item[1], reverse=True):
+        where = []
+        if skill in required:
+            where.append(f"required at {', '.join(required[skill])}")
+        if skill in preferred:
+            where.append(f"preferred at {', '.join(preferred[skill])}")
+        lines.append(f"- {skill}: {frequency}" + (f" ({'; '.join(where)})" if where else ""))
+    return "\n".join(lines)
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised before an LLM call that would exceed the per-call or per-analysis token budget"""
+
+
+class TokenBudget:
+    """Per-call and per-analysis token limits plus token accounting for one analysis"""
+
+    def __init__(self, per_call: Optional[int] = None, per_analysis: Optional[int] = None):
+        self.per_call = per_call
+        self.per_analysis = per_analysis
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.compaction_saved = 0
+        self.prefix_cached = 0
+        self.prefix_reused_uncached = 0
+
+    @classmethod
+    def from_env(cls) -> "TokenBudget":
+        """Limits from CAREER_LLM_MAX_CALL_TOKENS / CAREER_LLM_MAX_ANALYSIS_TOKENS (0 = unlimited)"""
+        per_call = int(os.getenv("CAREER_LLM_MAX_CALL_TOKENS", "4000"))
+        per_analysis = int(os.getenv("CAREER_LLM_MAX_ANALYSIS_TOKENS", "60000"))
+        return cls(per_call=per_call or None, per_analysis=per_analysis or None)
+
+    @property
+    def used(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def charge_prompt(self, tokens: int):
+        """Reserve prompt tokens for a call, or raise TokenBudgetExceeded"""
+        with self._lock:
+            if self.per_call is not None and tokens > self.per_call:
+                raise TokenBudgetExceeded(f"Prompt needs {tokens} tokens, per-call budget is {self.per_call}")
+            if self.per_analysis is not None and self.used + tokens > self.per_analysis:
+                raise TokenBudgetExceeded(
+                    f"Analysis would use {self.used + tokens} tokens, budget is {self.per_analysis}"
+                )
+            self.calls += 1
+            self.prompt_tokens += tokens
+
+    def record_completion(self, tokens: int):
+        with self._lock:
+            self.completion_tokens += tokens
+
+    def record_savings(self, compaction_saved: int, prefix_cached: int = 0, prefix_reused_uncached: int = 0):
+        with self._lock:
+            self.compaction_saved += compaction_saved
+            self.prefix_cached += prefix_cached
+            self.prefix_reused_uncached += prefix_reused_uncached
+
+    def report(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "llm_calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "compaction_saved": self.compaction_saved,
+                "prefix_cached": self.prefix_cached,
+                "prefix_reused_uncached": self.prefix_reused_uncached,
+                "tokens_saved": self.compaction_saved + self.prefix_cached,
+            }
+
+
+class OutputSizer:
+    """max_tokens per task class from the lengths of its recent complete outputs
+
+    Until a task has MIN_SAMPLES outputs it gets its default limit. After that
+    the limit is the p99 length times the headroom. A truncated output that was
+    continued is observed at its full length, so the limit grows to fit it.
+    """
+
+    MIN_SAMPLES = 20
+    DEFAULTS = {"classify": 512, "score": 512, "generate": 2048}
+    FLOOR = 64
+
+    def __init__(self, ceiling: int = 4096, headroom: float = 1.5, window: int = 200):
+        self.ceiling = ceiling
+        self.headroom = headroom
+        self._lock = threading.Lock()
+        self._lengths: Dict[str, Deque[int]] = {}
+        self._window = window
+
+    @classmethod
+    def from_env(cls) -> "OutputSizer":
+        return cls(
+            ceiling=int(os.getenv("CAREER_LLM_MAX_OUTPUT_TOKENS", "4096")),
+            headroom=float(os.getenv("CAREER_LLM_OUTPUT_HEADROOM", "1.5"))
+        )
+
+    def observe(self, task: str, completion_tokens: int):
+        with self._lock:
+            self._lengths.setdefault(task, deque(maxlen=self._window)).append(completion_tokens)
+
+    def limit(self, task: str) -> int:
+        fixed = os.getenv(f"CAREER_LLM_MAX_TOKENS_{task.upper()}")
+        if fixed:
+            return int(fixed)
+        with self._lock:
+            lengths = sorted(self._lengths.get(task, ()))
+        if len(lengths) < self.MIN_SAMPLES:
+            return min(self.DEFAULTS.get(task, self.ceiling), self.ceiling)
+        p99 = lengths[int(0.99 * (len(lengths) - 1))]
+        return max(self.FLOOR, min(self.ceiling, math.ceil(p99 * self.headroom)))
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            tasks = {task: len(lengths) for task, lengths in self._lengths.items()}
+        return {task: {"samples": samples, "max_tokens": self.limit(task)} for task, samples in tasks.items()}
+
+
+class PromptBuilder:
+    """Builds (system, user) prompt pairs from a reusable prefix and a per-call task"""
+
+    def __init__(self, provider: str, instructions: str, context: str = ""):
+        self.provider = provider
+        self._raw_prefix = instructions + ("\n\n" + context if context else "")
+        self.prefix = compact(instructions) + ("\n\n" + compact(context) if context else "")
+        self.prefix_tokens = count_tokens(self.prefix, provider)
+        self._raw_prefix_tokens = count_tokens(self._raw_prefix, provider)
+        minimum = PREFIX_CACHE_MIN_TOKENS.get(provider)
+        self.cacheable = minimum is not None and self.prefix_tokens >= minimum
+        self._lock = threading.Lock()
+        self._uses = 0
+
+    def build(self, task: str) -> Tuple[str, str]:
+        """Return (system_prompt, user_prompt) and record savings on the active analysis"""
+        user_prompt = compact(task)
+
+        with self._lock:
+            reused = self._uses > 0
+            self._uses += 1
+
+        from career_agent import run_context
+        context = run_context.current()
+        if context is not None:
+            saved = (self._raw_prefix_tokens - self.prefix_tokens) + (
+                count_tokens(task, self.provider) - count_tokens(user_prompt, self.provider)
+            )
+            reused_tokens = self.prefix_tokens if reused else 0
+            context.budget.record_savings(
+                compaction_saved=max(0, saved),
+                prefix_cached=reused_tokens if self.cacheable else 0,
+                prefix_reused_uncached=0 if self.cacheable else reused_tokens
+            )
+
+        return self.prefix, user_prompt
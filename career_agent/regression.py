@@ -0,0 +1,254 @@
+"""Offline regression harness: golden profiles through the pipeline, quality versus speed per configuration
+
+    python -m career_agent.regression --config baseline \
+        --config small-models CAREER_LLM_MODEL_GENERATE=llama-3.1-8b-instant
+    python -m career_agent.regression --provider live --workers 2 --output report.json
+    python -m career_agent.regression --provider replay --cassette traffic.jsonl.gz
+
+A configuration is a name plus environment overrides. Each one runs every golden
+case in parallel against the fake provider (default), the live providers, or
+LLM traffic replayed from a cassette (see cassette).
+Quality comes from CareerAgentEvaluator plus recall/precision against each case's
+expected gaps; speed and cost from latency and token counts. Every configuration
+is compared against the first (the baseline).
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from career_agent.models import UserProfile
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "golden_profiles.json")
+
+QUALITY_METRICS = ["gap_recall", "gap_precision", "grounding_score", "hallucination_rate", "overall_quality", "resource_quality"]
+SPEED_METRICS = ["latency_p50_s", "latency_p95_s", "tokens_per_case", "cost_per_case_usd"]
+LOWER_IS_BETTER = {"hallucination_rate", *SPEED_METRICS}
+
+
+@dataclass
+class CaseResult:
+    """Outcome of one golden case under one configuration"""
+    case_id: str
+    config: str
+    ok: bool
+    latency_s: float
+    error: Optional[str] = None
+    llm_calls: int = 0
+    tokens: int = 0
+    cost_usd: float = 0.0
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def load_golden(path: Optional[str] = None) -> List[dict]:
+    with open(path or GOLDEN_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextmanager
+def _patched_env(overrides: Dict[str, str]):
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextmanager
+def offline_provider(provider: str, fake_latency_s: float = 0.05, cassette_path: Optional[str] = None,
+                     replay_latency: float = 0.0, fake_capacity: Optional[int] = None):
+    """Install the fake or replay provider for the enclosed run (nothing to do for live providers)"""
+    if provider == "fake":
+        from career_agent import fake_provider
+        fake_provider.install(latency_s=fake_latency_s, jitter=0.3, capacity=fake_capacity)
+        try:
+            yield
+        finally:
+            fake_provider.uninstall()
+    elif provider == "replay":
+        from career_agent import cassette
+        player = cassette.install_replay(cassette_path, latency_scale=replay_latency)
+        try:
+            yield
+        finally:
+            cassette.uninstall_replay()
+            stats = player.stats()
+            print(f"📼 Replayed {stats['hits']} calls from {cassette_path} ({stats['misses']} misses)")
+    else:
+        yield
+
+
+def run_case(orchestrator, config: str, case: dict) -> CaseResult:
+    from career_agent.run_context import analysis_context
+
+    profile = UserProfile(**case["profile"])
+    with analysis_context() as context:
+        start = time.perf_counter()
+        try:
+            result, gap_eval, resource_eval = orchestrator.run_analysis(profile)
+        except Exception as e:
+            return CaseResult(case["id"], config, ok=False, latency_s=time.perf_counter() - start,
+                              error=f"{type(e).__name__}: {e}")
+        latency = time.perf_counter() - start
+    usage = context.usage.report()
+
+    found = {gap.skill.lower() for gap in result.skill_gaps}
+    expected = {skill.lower() for skill in case["expected_gaps"]}
+    hits = len(found & expected)
+
+    return CaseResult(
+        case_id=case["id"],
+        config=config,
+        ok=True,
+        latency_s=latency,
+        llm_calls=usage.total.calls,
+        tokens=usage.total.prompt_tokens + usage.total.completion_tokens,
+        cost_usd=usage.total.cost_usd,
+        metrics={
+            "gap_recall": hits / len(expected) if expected else 1.0,
+            "gap_precision": hits / len(found) if found else 0.0,
+            "grounding_score": gap_eval["grounding_score"],
+            "hallucination_rate": gap_eval["hallucination_rate"],
+            "overall_quality": gap_eval["overall_quality"],
+            "resource_quality": resource_eval["resource_quality"],
+        }
+    )
+
+
+def run_config(
+    name: str,
+    env: Dict[str, str],
+    cases: List[dict],
+    workers: int = 4,
+    provider: str = "fake",
+    fake_latency_s: float = 0.05,
+    cassette_path: Optional[str] = None,
+    replay_latency: float = 0.0
+) -> List[CaseResult]:
+    """Run every case under one configuration, workers cases at a time"""
+    base_env = {"CAREER_WARM_START": "false"}
+    if provider in ("fake", "replay"):
+        base_env["CAREER_LLM_PROVIDERS"] = provider
+
+    with _patched_env({**base_env, **env}), offline_provider(provider, fake_latency_s, cassette_path, replay_latency):
+        from career_agent.orchestrator import CareerGrowthOrchestrator
+        orchestrator = CareerGrowthOrchestrator()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="regression") as pool:
+            return list(pool.map(lambda case: run_case(orchestrator, name, case), cases))
+
+
+def summarize(results: List[CaseResult]) -> Dict[str, float]:
+    ok = [r for r in results if r.ok]
+    summary = {"cases": len(results), "errors": len(results) - len(ok)}
+    for metric in QUALITY_METRICS:
+        summary[metric] = statistics.fmean(r.metrics[metric] for r in ok) if ok else 0.0
+    latencies = sorted(r.latency_s for r in ok)
+    summary["latency_p50_s"] = statistics.median(latencies) if latencies else 0.0
+    summary["latency_p95_s"] = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0
+    summary["tokens_per_case"] = statistics.fmean(r.tokens for r in ok) if ok else 0.0
+    summary["cost_per_case_usd"] = statistics.fmean(r.cost_usd for r in ok) if ok else 0.0
+    return summary
+
+
+def compare(baseline: Dict[str, float], candidate: Dict[str, float], max_quality_drop: float = 0.02) -> List[dict]:
+    """Per-metric deltas; a quality metric regresses if it worsens by more than max_quality_drop"""
+    rows = []
+    for metric in QUALITY_METRICS + SPEED_METRICS:
+        delta = candidate[metric] - baseline[metric]
+        worse = -delta if metric not in LOWER_IS_BETTER else delta
+        rows.append({
+            "metric": metric,
+            "baseline": baseline[metric],
+            "candidate": candidate[metric],
+            "delta": delta,
+            "regressed": metric in QUALITY_METRICS and worse > max_quality_drop,
+        })
+    return rows
+
+
+def print_report(summaries: Dict[str, Dict[str, float]], comparisons: Dict[str, List[dict]]):
+    names = list(summaries)
+    print("\n" + "=" * 60)
+    print("🔬 REGRESSION REPORT")
+    print("=" * 60)
+    print(f"\n{'metric':<20}" + "".join(f" {name:>17}" for name in names))
+    for metric in ["cases", "errors"] + QUALITY_METRICS + SPEED_METRICS:
+        print(f"{metric:<20}" + "".join(f" {summaries[name][metric]:>17.4g}" for name in names))
+
+    for name, rows in comparisons.items():
+        print(f"\n📊 {name} vs {names[0]}:")
+        for row in rows:
+            flag = "⚠️ " if row["regressed"] else "  "
+            print(f"  {flag}{row['metric']:<20} {row['baseline']:>10.4g} -> {row['candidate']:>10.4g} ({row['delta']:+.4g})")
+        regressed = [row["metric"] for row in rows if row["regressed"]]
+        print(f"  {'❌ Quality regressed: ' + ', '.join(regressed) if regressed else '✅ No quality regression'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run golden profiles through the pipeline and compare configurations")
+    parser.add_argument("--config", nargs="+", action="append", metavar="NAME",
+                        help="Configuration name followed by environment overrides (repeatable; first is the baseline)")
+    parser.add_argument("--golden", default=None, help="Golden dataset (default: career_agent/data/golden_profiles.json)")
+    parser.add_argument("--provider", choices=["fake", "live", "replay"], default="fake",
+                        help="Fake offline provider, the configured live providers, or a recorded cassette")
+    parser.add_argument("--fake-latency", type=float, default=0.05, help="Mean fake provider latency per call (seconds)")
+    parser.add_argument("--cassette", default=None, help="Cassette to replay with --provider replay")
+    parser.add_argument("--replay-latency", type=float, default=0.0, help="Scale of the recorded latencies (0 = none, 1 = original)")
+    parser.add_argument("--workers", type=int, default=4, help="Cases run in parallel")
+    parser.add_argument("--max-quality-drop", type=float, default=0.02, help="Allowed worsening of any quality metric")
+    parser.add_argument("--output", default=None, help="Write per-case results and summaries as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    args = parser.parse_args()
+    if args.provider == "replay" and not args.cassette:
+        parser.error("--provider replay needs --cassette")
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    cases = load_golden(args.golden)
+    configs = args.config or [["baseline"]]
+    results, summaries = {}, {}
+    for name, *overrides in configs:
+        env = dict(item.split("=", 1) for item in overrides)
+        print(f"🚀 {name}: {len(cases)} cases, {args.workers} workers, {args.provider} provider")
+        with nullcontext() if args.verbose else redirect_stdout(io.StringIO()):
+            results[name] = run_config(name, env, cases, args.workers, args.provider, args.fake_latency,
+                                       args.cassette, args.replay_latency)
+        summaries[name] = summarize(results[name])
+        for failed in (r for r in results[name] if not r.ok):
+            print(f"   ⚠️  {failed.case_id}: {failed.error}")
+
+    baseline = next(iter(summaries))
+    comparisons = {
+        name: compare(summaries[baseline], summary, args.max_quality_drop)
+        for name, summary in summaries.items() if name != baseline
+    }
+    print_report(summaries, comparisons)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "summaries": summaries,
+                "comparisons": comparisons,
+                "cases": {name: [asdict(r) for r in rs] for name, rs in results.items()},
+            }, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+    if any(row["regressed"] for rows in comparisons.values() for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
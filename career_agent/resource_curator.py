@@ -1,47 +1,147 @@
+import contextvars
 import os
-from typing import List
-import opik
-from career_agent.models import SkillGap, LearningResource
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from career_agent import run_context, tracing
+from career_agent.models import SkillGap, LearningResource, UserProfile
 from career_agent.llm_client import LLMClient
+from career_agent.prompts import PromptBuilder, TokenBudgetExceeded
+from career_agent.run_context import DeadlineExceeded
+from career_agent.usage import SpendBudgetExceeded
 import json
 
 
+RESOURCE_INSTRUCTIONS = """You are a learning resource curator. Return only valid JSON.
+The user needs to learn a skill for a career transition. For each resource provide:
+- title
+- type (course/article/video/project)
+- url (use real platforms like Coursera, Udemy, YouTube, freeCodeCamp, etc.)
+- estimated_hours (realistic estimate)
+- difficulty (beginner/intermediate/advanced)
+- skills_covered (list of specific skills)
+Return as JSON array."""
+
+
+class ResourceSpeculation:
+    """Resource lookups started for the likely top gaps while gap scoring is still running
+    
+    curate_resources() takes a finished lookup instead of repeating the call when its skill
+    makes the final top gaps; finish() cancels lookups that haven't started and counts the
+    ones that ran for nothing.
+    """
+    
+    def __init__(self, curator: "ResourceCuratorAgent", candidates: List[Tuple[str, float]],
+                 max_resources_per_skill: int = 3, workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speculate")
+        # Each lookup runs in its own copy of the caller's context (analysis budget, trace)
+        self.futures = {
+            skill: self._executor.submit(
+                contextvars.copy_context().run, curator.fetch_resources, skill, importance, max_resources_per_skill
+            )
+            for skill, importance in candidates
+        }
+        self.used = set()
+    
+    def take(self, skill: str) -> Optional[list]:
+        """Resources fetched speculatively for skill, or None if it wasn't speculated or the call failed"""
+        future = self.futures.get(skill)
+        if future is None:
+            return None
+        try:
+            resources = future.result()
+        except Exception:
+            return None
+        self.used.add(skill)
+        return resources
+    
+    def finish(self) -> Dict[str, float]:
+        """Cancel unused lookups and return hit / waste counts"""
+        cancelled = wasted = 0
+        for skill, future in self.futures.items():
+            if skill in self.used:
+                continue
+            if future.cancel():
+                cancelled += 1
+            else:
+                wasted += 1
+        self._executor.shutdown(wait=False)
+        return {
+            "speculated": len(self.futures),
+            "hits": len(self.used),
+            "wasted_calls": wasted,
+            "cancelled": cancelled,
+            "hit_rate": len(self.used) / len(self.futures) if self.futures else 0.0,
+        }
+
+
 class ResourceCuratorAgent:
     """Agent that finds and ranks learning resources"""
     
     def __init__(self):
-        self.client = LLMClient()
+        self.client = LLMClient(agent="resource_curator")
+        # Boilerplate instructions are a shared prefix reused by every curation call
+        self.prompts = PromptBuilder(self.client.provider, RESOURCE_INSTRUCTIONS)
+    
+    def speculate(
+        self,
+        profile: UserProfile,
+        market_skills: dict,
+        max_gaps: int = 5,
+        max_resources_per_skill: int = 3
+    ) -> ResourceSpeculation:
+        """Start fetching resources for the most frequent missing skills before gaps are scored"""
+        user_skills_lower = {s.lower().strip() for s in profile.skills}
+        max_freq = max(market_skills.values()) if market_skills else 1
+        missing = [(skill, freq) for skill, freq in market_skills.items() if skill not in user_skills_lower]
+        missing.sort(key=lambda item: item[1], reverse=True)
+        # Same importance analyze_gaps computes, so the prompts match the ones curation would send
+        candidates = [(skill, freq / max_freq) for skill, freq in missing[:max_gaps]]
+        return ResourceSpeculation(self, candidates, max_resources_per_skill)
     
-    @opik.track(name="curate_resources")
+    def fetch_resources(self, skill: str, importance: float, max_resources_per_skill: int = 3) -> list:
+        """Raw resource dicts for one skill from the LLM"""
+        system_prompt, user_prompt = self.prompts.build(
+            f"Find {max_resources_per_skill} high-quality learning resources for: {skill}\n"
+            f"Importance: {importance:.2f}"
+        )
+        return self.client.generate_json(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=0.5
+        )
+    
+    @tracing.track(name="curate_resources")
     def curate_resources(
         self, 
         skill_gaps: List[SkillGap],
-        max_resources_per_skill: int = 3
+        max_resources_per_skill: int = 3,
+        max_gaps: int = 5,
+        speculation: Optional[ResourceSpeculation] = None
     ) -> List[LearningResource]:
-        """Find learning resources for each skill gap"""
+        """Find learning resources for the top max_gaps skill gaps, reusing speculative lookups if given
+        
+        Past the analysis deadline the remaining gaps get catalog resources only (no LLM calls).
+        """
         
         all_resources = []
         
-        for gap in skill_gaps[:5]:  # Focus on top 5 gaps
-            prompt = f"""Find {max_resources_per_skill} high-quality learning resources for: {gap.skill}
-
-Context: User needs to learn this for career transition. Importance: {gap.importance:.2f}
-
-For each resource provide:
-- title
-- type (course/article/video/project)
-- url (use real platforms like Coursera, Udemy, YouTube, freeCodeCamp, etc.)
-- estimated_hours (realistic estimate)
-- difficulty (beginner/intermediate/advanced)
-- skills_covered (list of specific skills)
-
-Return as JSON array."""
-
-            resources_data = self.client.generate_json(
-                system_prompt="You are a learning resource curator. Return only valid JSON.",
-                user_prompt=prompt,
-                temperature=0.5
-            )
+        for index, gap in enumerate(skill_gaps[:max_gaps]):
+            resources_data = speculation.take(gap.skill) if speculation is not None else None
+            if resources_data is None:
+                try:
+                    resources_data = self.fetch_resources(gap.skill, gap.importance, max_resources_per_skill)
+                except (DeadlineExceeded, SpendBudgetExceeded) as e:
+                    remaining = skill_gaps[index:max_gaps]
+                    reason = "Deadline" if isinstance(e, DeadlineExceeded) else "Spend budget"
+                    print(f"⏱️  {reason} reached, using catalog resources for {len(remaining)} gaps")
+                    run_context.mark_partial("learning_resources")
+                    from career_agent.demo_mode import generate_resources
+                    all_resources.extend(generate_resources(remaining, None))
+                    break
+                except TokenBudgetExceeded as e:
+                    print(f"⚠️  Token budget reached, curated {len(all_resources)} resources: {e}")
+                    run_context.mark_partial("learning_resources")
+                    break
             
             for resource in resources_data:
                 all_resources.append(LearningResource(
@@ -57,15 +157,12 @@ Return as JSON array."""
         # Sort by relevance
         all_resources.sort(key=lambda x: x.relevance_score, reverse=True)
         
-        try:
-            opik.track_metric(name="resources_curated", value=len(all_resources))
-            opik.track_metric(name="avg_relevance_score", value=sum(r.relevance_score for r in all_resources) / len(all_resources) if all_resources else 0)
-        except:
-            pass
+        tracing.track_metric(name="resources_curated", value=len(all_resources))
+        tracing.track_metric(name="avg_relevance_score", value=sum(r.relevance_score for r in all_resources) / len(all_resources) if all_resources else 0)
         
         return all_resources
     
-    @opik.track(name="evaluate_resource_quality")
+    @tracing.track(name="evaluate_resource_quality")
     def evaluate_quality(self, resource: LearningResource) -> float:
         """Evaluate resource quality using LLM-as-a-judge"""
         
@@ -86,13 +183,11 @@ Return only a number between 0 and 1."""
         response_text = self.client.generate(
             system_prompt="You are an educational content evaluator.",
             user_prompt=prompt,
-            temperature=0.2
+            temperature=0.2,
+            task="score"
         )
         
         quality_score = float(response_text.strip())
-        try:
-            opik.track_metric(name="resource_quality_score", value=quality_score)
-        except:
-            pass
+        tracing.track_metric(name="resource_quality_score", value=quality_score)
         
         return quality_score
@@ -0,0 +1,117 @@
+"""Per-analysis context shared by every agent and LLM call made during one run
+
+The orchestrator opens a context around run_analysis(); LLMClient and the
+agents read it with current() instead of threading extra arguments through
+every call. Work handed to other threads must copy the context
+(contextvars.copy_context().run) to stay attached to the analysis.
+
+A context can carry an end-to-end deadline (CAREER_DEADLINE_S, or deadline_s).
+LLM calls are abandoned with DeadlineExceeded when the current stage's cutoff
+passes, and agents degrade instead of failing, recording which sections of the
+result are partial.
+
+It also carries the analysis' LLM usage ledger and the user it runs for, whose
+spend budget is checked before each LLM call (see usage).
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from career_agent.prompts import TokenBudget
+from career_agent.usage import UsageLedger
+
+_current: ContextVar[Optional["AnalysisContext"]] = ContextVar("career_agent_analysis", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting (or waiting longer on) an LLM call past the analysis deadline"""
+
+
+class AnalysisContext:
+    """State for one analysis run"""
+
+    def __init__(self, budget: Optional[TokenBudget] = None, deadline_s: Optional[float] = None, user_id: Optional[str] = None):
+        self.budget = budget or TokenBudget.from_env()
+        self.usage = UsageLedger()
+        self.user_id = user_id
+        if deadline_s is None:
+            deadline_s = float(os.getenv("CAREER_DEADLINE_S", "0")) or None
+        self.deadline_s = deadline_s
+        self.deadline = time.monotonic() + deadline_s if deadline_s else None
+        # Cutoff of the running stage (never later than the deadline)
+        self.cutoff = self.deadline
+        self.partial_sections: List[str] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the current stage's cutoff, or None without a deadline"""
+        if self.cutoff is None:
+            return None
+        return self.cutoff - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    @contextmanager
+    def stage(self, reserve: float):
+        """Run a stage that must stop with `reserve` (a fraction of the deadline) left for later stages"""
+        if self.deadline is None:
+            yield
+            return
+        saved = self.cutoff
+        self.cutoff = min(saved, self.deadline - reserve * self.deadline_s)
+        try:
+            yield
+        finally:
+            self.cutoff = saved
+
+    def finish(self):
+        """End the run: work still charged to it afterwards (deferred gap reasoning) isn't bound by its deadline"""
+        self.deadline = self.cutoff = None
+
+    def mark_partial(self, section: str):
+        """Record that a result section was degraded or cut short"""
+        with self._lock:
+            if section not in self.partial_sections:
+                self.partial_sections.append(section)
+
+
+def current() -> Optional[AnalysisContext]:
+    """The active analysis context, or None outside run_analysis()"""
+    return _current.get()
+
+
+def mark_partial(section: str):
+    """mark_partial on the active context, if any"""
+    context = _current.get()
+    if context is not None:
+        context.mark_partial(section)
+
+
+@contextmanager
+def attached(context: Optional[AnalysisContext]):
+    """Make an existing context (e.g. one captured during the run) active for the block; None leaves things as they are"""
+    if context is None:
+        yield None
+        return
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def analysis_context(**kwargs):
+    """Activate a new AnalysisContext for the duration of the block"""
+    context = AnalysisContext(**kwargs)
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
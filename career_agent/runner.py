@@ -0,0 +1,33 @@
+"""Pipeline backend selection shared by the API server and queue workers"""
+
+import os
+from typing import Callable
+from career_agent.models import UserProfile
+
+
+def provider_configured() -> bool:
+    """True if any LLM provider API key is set"""
+    return any(os.getenv(k) for k in ("GROQ_API_KEY", "GOOGLE_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"))
+
+
+def default_runner() -> Callable:
+    """Pick the pipeline backend: demo engine without API keys (or DEMO_MODE=true), else the orchestrator
+    
+    The returned callable has the run_analysis signature:
+    (profile, progress=None, user_id=None) -> (result, gap_eval, resource_eval)
+    """
+    if os.getenv("DEMO_MODE") == "true" or not provider_configured():
+        from career_agent.demo_mode import generate_demo_analysis
+
+        def run_demo(profile: UserProfile, progress=None, user_id=None):
+            # No LLM calls, so there is no spend to charge to user_id
+            result = generate_demo_analysis(profile)
+            if progress is not None:
+                progress("done", 100)
+            return result, {}, {}
+
+        return run_demo
+
+    from career_agent.orchestrator import CareerGrowthOrchestrator
+    orchestrator = CareerGrowthOrchestrator()
+    return orchestrator.run_analysis
@@ -1,19 +1,22 @@
 import os
 from typing import List
 from datetime import datetime, timedelta
-import opik
+from career_agent import tracing
 from career_agent.models import LearningResource, LearningSession
 from career_agent.llm_client import LLMClient
 import json
 
+# Numeric codes for the adaptation_reason metric (metric values must be numbers)
+ADAPTATION_REASONS = {"low_completion": 1, "high_completion": 2}
+
 
 class SchedulerAgent:
     """Agent that schedules learning sessions"""
     
     def __init__(self):
-        self.client = LLMClient()
+        self.client = LLMClient(agent="scheduler")
     
-    @opik.track(name="create_schedule")
+    @tracing.track(name="create_schedule")
     def create_schedule(
         self, 
         resources: List[LearningResource],
@@ -61,11 +64,8 @@ class SchedulerAgent:
             if session_duration >= resource.estimated_hours * 60:
                 resource_index += 1
         
-        try:
-            opik.track_metric(name="sessions_scheduled", value=len(sessions))
-            opik.track_metric(name="total_learning_hours", value=sum(s.duration_minutes for s in sessions) / 60)
-        except:
-            pass
+        tracing.track_metric(name="sessions_scheduled", value=len(sessions))
+        tracing.track_metric(name="total_learning_hours", value=sum(s.duration_minutes for s in sessions) / 60)
         
         return sessions
     
@@ -74,7 +74,7 @@ class SchedulerAgent:
         # In production, this would analyze user's calendar and past behavior
         return [7, 19, 20, 7, 19]  # Morning or evening
     
-    @opik.track(name="adapt_schedule")
+    @tracing.track(name="adapt_schedule")
     def adapt_schedule(
         self, 
         sessions: List[LearningSession],
@@ -86,20 +86,14 @@ class SchedulerAgent:
             # User is struggling - reduce session duration
             for session in sessions:
                 session.duration_minutes = int(session.duration_minutes * 0.7)
-            try:
-                opik.track_metric(name="schedule_adapted", value=1)
-                opik.track_metric(name="adaptation_reason", value="low_completion")
-            except:
-                pass
+            tracing.track_metric(name="schedule_adapted", value=1)
+            tracing.track_metric(name="adaptation_reason", value=ADAPTATION_REASONS["low_completion"])
         
         elif completion_rate > 0.9:
             # User is doing great - increase intensity
             for session in sessions:
                 session.duration_minutes = int(session.duration_minutes * 1.3)
-            try:
-                opik.track_metric(name="schedule_adapted", value=1)
-                opik.track_metric(name="adaptation_reason", value="high_completion")
-            except:
-                pass
+            tracing.track_metric(name="schedule_adapted", value=1)
+            tracing.track_metric(name="adaptation_reason", value=ADAPTATION_REASONS["high_completion"])
         
         return sessions
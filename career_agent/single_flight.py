@@ -0,0 +1,86 @@
+"""Single-flight request coalescing
+
+Concurrent callers asking for the same key share one upstream call: the first
+caller (the leader) runs it and everyone else waits for its result. Threads
+and asyncio tasks share the same in-flight table, so a call started by a worker
+thread also serves coroutines that ask for the same key, and vice versa.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesces identical in-flight calls and counts how many were collapsed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.requests = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join(self, key: str):
+        """Return (future, is_leader) for key"""
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self.executed += 1
+            return future, True
+
+    def _settle(self, key: str, future: Future, result: Any = None, error: BaseException = None):
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn once for all concurrent callers with the same key (blocking)"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Async variant: the leader runs blocking fn in the default executor
+        
+        The shared result is settled by the executor job itself, so cancelling
+        the leading task doesn't fail the callers waiting on it.
+        """
+        future, leader = self._join(key)
+        if leader:
+            def run():
+                try:
+                    result = fn()
+                except BaseException as e:
+                    self._settle(key, future, error=e)
+                else:
+                    self._settle(key, future, result=result)
+
+            asyncio.get_running_loop().run_in_executor(None, run)
+        # Shielded: a cancelled (or timed out) waiter must not cancel the shared future
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "upstream_calls": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
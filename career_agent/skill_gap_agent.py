@@ -1,74 +1,193 @@
 import os
-from typing import List
-import opik
-from career_agent.models import UserProfile, SkillGap
+import threading
+from typing import Callable, Dict, List, Optional
+from career_agent import run_context, tracing
+from career_agent.models import JobPosting, UserProfile, SkillGap
 from career_agent.llm_client import LLMClient
+from career_agent.prompts import PromptBuilder, TokenBudgetExceeded, market_context, profile_context
+from career_agent.run_context import DeadlineExceeded
+from career_agent.usage import SpendBudgetExceeded
 import json
 
 
+GAP_INSTRUCTIONS = """You are a career advisor. Return only valid JSON.
+For the missing skill below, give a confidence score (0-1) that this skill is truly
+important for this user's career transition, judged against the job postings and
+skill demand listed below.
+Scale:
+- 0.9-1.0: required by most postings and central to the target role's daily work
+- 0.7-0.8: required by some postings, or preferred by most, and clearly relevant to the target role
+- 0.4-0.6: mentioned by a few postings; useful, but the user's current skills partly cover it
+- 0.1-0.3: rarely mentioned, a niche tool, or easy to pick up on the job given the user's experience
+Weigh required over preferred mentions, and count closely related skills the user already has
+(e.g. one cloud provider for another) against the gap.
+Return as JSON: {"confidence": 0.0-1.0}"""
+
+REASONING_INSTRUCTIONS = """You are a career advisor. Return only valid JSON.
+For each missing skill below, write one sentence explaining why it matters for this user's career transition.
+Return as JSON: {"<skill>": "<reasoning>", ...}"""
+
+# Confidence given to gaps left unscored when the analysis deadline cuts scoring short
+UNSCORED_CONFIDENCE = 0.5
+
+
+class GapExplainer:
+    """Generates reasoning for a batch of ranked gaps with one LLM call, on first request
+    
+    Attached to each gap returned by analyze_gaps; the first SkillGap.explain() fills in
+    every gap of the batch, later ones read the cached text. The call runs in the
+    analysis' context even after run_analysis returns, so it is checked against and
+    charged to that run's budgets and usage.
+    """
+    
+    def __init__(self, client: LLMClient, profile: UserProfile, gaps: List[SkillGap]):
+        self.client = client
+        self.profile = profile
+        self.gaps = gaps
+        self.context = run_context.current()
+        # Called after the reasoning call (e.g. to refresh the result's usage report)
+        self.on_explained: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, gap: SkillGap) -> str:
+        with self._lock:
+            if gap.reasoning is None:
+                self._explain_pending()
+        return gap.reasoning
+    
+    def _explain_pending(self):
+        pending = [gap for gap in self.gaps if gap.reasoning is None]
+        if not pending:
+            return
+        
+        prompts = PromptBuilder(self.client.provider, REASONING_INSTRUCTIONS, profile_context(self.profile))
+        system_prompt, user_prompt = prompts.build("Explain why these skills matter:\n" + "\n".join(
+            f"- {gap.skill} (in {gap.frequency_in_jobs} job postings)" for gap in pending
+        ))
+        try:
+            with run_context.attached(self.context):
+                reasons = self.client.generate_json(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    temperature=0.3,
+                    # Long-form text: sized (max_tokens) and routed like other generation, not like one-number scores
+                    task="generate",
+                    validate=lambda result: isinstance(result, dict)
+                )
+        except Exception as e:
+            print(f"⚠️  Gap reasoning failed: {e}")
+            if self.context is not None:
+                self.context.mark_partial("skill_gaps")
+            reasons = {}
+        
+        reasons = {str(skill).lower(): text for skill, text in reasons.items() if isinstance(text, str)}
+        for gap in pending:
+            gap.reasoning = reasons.get(gap.skill.lower()) or (
+                f"Appears in {gap.frequency_in_jobs} of the analyzed job postings"
+            )
+        tracing.track_metric(name="gap_reasoning_generated", value=len(pending))
+        if self.on_explained is not None:
+            self.on_explained()
+
+
 class SkillGapAgent:
     """Agent that identifies skill gaps"""
     
     def __init__(self):
-        self.client = LLMClient()
+        self.client = LLMClient(agent="skill_gap")
     
-    @opik.track(name="analyze_skill_gaps")
+    @tracing.track(name="analyze_skill_gaps")
     def analyze_gaps(
         self, 
         profile: UserProfile, 
-        market_skills: dict
+        market_skills: dict,
+        limit: int = 10,
+        jobs: Optional[List[JobPosting]] = None
     ) -> List[SkillGap]:
-        """Compare user skills against market demands"""
+        """Compare user skills against market demands, returning the top `limit` gaps"""
+        
+        user_skills_lower = {s.lower().strip() for s in profile.skills}
         
-        user_skills_lower = [s.lower().strip() for s in profile.skills]
+        # Instructions + profile + analyzed postings form a shared prefix (long enough for
+        # provider prompt caching); each call only adds the skill
+        prompts = PromptBuilder(
+            self.client.provider,
+            GAP_INSTRUCTIONS,
+            profile_context(profile) + "\n\n" + market_context(market_skills, jobs)
+        )
+        max_freq = max(market_skills.values()) if market_skills else 1
         
+        candidates = [(skill, frequency) for skill, frequency in market_skills.items() if skill not in user_skills_lower]
         gaps = []
         
-        for skill, frequency in market_skills.items():
-            if skill not in user_skills_lower:
-                # Calculate importance based on frequency
-                max_freq = max(market_skills.values())
-                importance = frequency / max_freq
-                
-                # Use LLM to assess confidence and provide reasoning
-                prompt = f"""Analyze this skill gap:
-                
-User Profile:
-- Current Role: {profile.current_role}
-- Target Role: {profile.target_role}
-- Experience: {profile.experience_years} years
-- Current Skills: {', '.join(profile.skills)}
-
-Missing Skill: {skill}
-Frequency in job postings: {frequency}
-
-Provide:
-1. Confidence score (0-1) that this skill is truly important for their career transition
-2. Brief reasoning (1 sentence)
-
-Return as JSON: {{"confidence": 0.0-1.0, "reasoning": "..."}}"""
-
+        for skill, frequency in candidates:
+            # Calculate importance based on frequency
+            importance = frequency / max_freq
+            
+            # Use LLM to assess confidence; reasoning is generated later, only for the top gaps
+            system_prompt, user_prompt = prompts.build(
+                f"Missing skill: {skill}\nFrequency in job postings: {frequency}"
+            )
+            try:
                 result = self.client.generate_json(
-                    system_prompt="You are a career advisor. Return only valid JSON.",
-                    user_prompt=prompt,
-                    temperature=0.3
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    temperature=0.3,
+                    task="score",
+                    validate=self._valid_assessment
+                )
+            except (DeadlineExceeded, TokenBudgetExceeded) as e:
+                # Out of time, tokens or spend: rank the unscored candidates on frequency alone
+                if isinstance(e, DeadlineExceeded):
+                    reason = "Deadline"
+                elif isinstance(e, SpendBudgetExceeded):
+                    reason = "Spend budget"
+                else:
+                    reason = "Token budget"
+                print(f"⏱️  {reason} reached, scored {len(gaps)} of {len(candidates)} gaps")
+                run_context.mark_partial("skill_gaps")
+                gaps.extend(
+                    SkillGap(skill=s, importance=f / max_freq, frequency_in_jobs=f, confidence=UNSCORED_CONFIDENCE)
+                    for s, f in candidates[len(gaps):]
                 )
-                
-                gaps.append(SkillGap(
-                    skill=skill,
-                    importance=importance,
-                    frequency_in_jobs=frequency,
-                    confidence=result["confidence"],
-                    reasoning=result["reasoning"]
-                ))
+                break
+            
+            gaps.append(SkillGap(
+                skill=skill,
+                importance=importance,
+                frequency_in_jobs=frequency,
+                confidence=result["confidence"]
+            ))
         
         # Sort by importance * confidence
         gaps.sort(key=lambda x: x.importance * x.confidence, reverse=True)
         
-        try:
-            opik.track_metric(name="skill_gaps_identified", value=len(gaps))
-            opik.track_metric(name="high_priority_gaps", value=len([g for g in gaps if g.confidence > 0.7]))
-        except:
-            pass
+        tracing.track_metric(name="skill_gaps_identified", value=len(gaps))
+        tracing.track_metric(name="high_priority_gaps", value=len([g for g in gaps if g.confidence > 0.7]))
         
-        return gaps[:10]  # Return top 10 gaps
+        top = gaps[:limit]
+        explainer = GapExplainer(self.client, profile, top)
+        for gap in top:
+            gap._explainer = explainer
+        return top
+    
+    @staticmethod
+    def explain_all(gaps: List[SkillGap]) -> Dict[str, str]:
+        """Force reasoning for every gap (e.g. before persisting a result)"""
+        return {gap.skill: gap.explain() for gap in gaps}
+    
+    @staticmethod
+    def on_reasoning(gaps: List[SkillGap], callback: Callable[[], None]):
+        """Call callback() once deferred reasoning for gaps has been generated"""
+        for gap in gaps:
+            if isinstance(gap._explainer, GapExplainer):
+                gap._explainer.on_explained = callback
+    
+    @staticmethod
+    def _valid_assessment(result) -> bool:
+        """A usable {"confidence"} answer from the scoring model"""
+        return (
+            isinstance(result, dict)
+            and isinstance(result.get("confidence"), (int, float))
+            and 0.0 <= result["confidence"] <= 1.0
+        )
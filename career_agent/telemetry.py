@@ -0,0 +1,252 @@
+"""Non-blocking, batched telemetry
+
+Metrics and span timings are appended to a bounded in-memory buffer and exported
+in batches by a background thread, so recording one costs a lock and an append.
+When the buffer is full new events are dropped and counted instead of blocking.
+Metric values must be numeric: anything else is rejected (and counted) when
+recorded, and a sink skips a bad event without losing the rest of its batch.
+
+Sinks:
+- in-memory aggregates (always on; see telemetry.snapshot())
+- Opik feedback scores on the trace that emitted the metric (when opik is available)
+- JSON lines file (CAREER_TELEMETRY_FILE)
+
+    CAREER_TELEMETRY=false          disable recording entirely
+    CAREER_TELEMETRY_BUFFER=10000   buffer capacity (events)
+    CAREER_TELEMETRY_BATCH=500      events per export batch
+    CAREER_TELEMETRY_FLUSH_S=1.0    export interval
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class Event(NamedTuple):
+    kind: str  # "metric" or "span"
+    name: str
+    value: float  # metric value, or span duration in seconds
+    timestamp: float
+    trace_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float))
+
+
+class MemorySink:
+    """Per-name count / sum / last value (and errors, for spans)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.aggregates: Dict[str, Dict[str, float]] = {}
+
+    def export(self, batch: List[Event]) -> int:
+        """Aggregate the batch; returns how many non-numeric events were skipped"""
+        skipped = 0
+        with self._lock:
+            for event in batch:
+                if not _is_number(event.value):
+                    skipped += 1
+                    continue
+                key = f"{event.kind}:{event.name}"
+                aggregate = self.aggregates.setdefault(key, {"count": 0, "sum": 0.0, "last": 0.0, "errors": 0})
+                aggregate["count"] += 1
+                aggregate["sum"] += event.value
+                aggregate["last"] = event.value
+                if event.error:
+                    aggregate["errors"] += 1
+        return skipped
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {key: dict(aggregate) for key, aggregate in self.aggregates.items()}
+
+
+class OpikSink:
+    """Logs metrics as feedback scores on the trace that recorded them"""
+
+    def __init__(self):
+        self._client = None
+
+    def export(self, batch: List[Event]) -> int:
+        metrics = [event for event in batch if event.kind == "metric" and event.trace_id]
+        scores = [
+            {"id": event.trace_id, "name": event.name, "value": float(event.value)}
+            for event in metrics if _is_number(event.value)
+        ]
+        if scores:
+            if self._client is None:
+                import opik
+                self._client = opik.Opik()
+            self._client.log_traces_feedback_scores(scores=scores)
+        return len(metrics) - len(scores)
+
+
+class JsonlSink:
+    """Appends every event as one JSON line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, batch: List[Event]) -> int:
+        skipped = 0
+        with open(self.path, "a", encoding="utf-8") as f:
+            for event in batch:
+                if not _is_number(event.value):
+                    skipped += 1
+                    continue
+                f.write(json.dumps(event._asdict()) + "\n")
+        return skipped
+
+
+class TelemetryExporter:
+    """Bounded event buffer drained in batches by a daemon thread"""
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        batch_size: int = 500,
+        flush_interval_s: float = 1.0,
+        sinks: Optional[List[Any]] = None
+    ):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.memory = MemorySink()
+        self.sinks = [self.memory] + list(sinks or [])
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._export_lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.exported = 0
+        self.export_errors = 0
+        # Non-numeric metrics refused by record_metric, and events a sink skipped
+        self.rejected = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_env(cls) -> "TelemetryExporter":
+        sinks = []
+        if os.getenv("CAREER_TELEMETRY_OPIK", "true") == "true" and os.getenv("OPIK_TRACK_DISABLE", "false") != "true":
+            sinks.append(OpikSink())
+        if os.getenv("CAREER_TELEMETRY_FILE"):
+            sinks.append(JsonlSink(os.getenv("CAREER_TELEMETRY_FILE")))
+        return cls(
+            capacity=int(os.getenv("CAREER_TELEMETRY_BUFFER", "10000")),
+            batch_size=int(os.getenv("CAREER_TELEMETRY_BATCH", "500")),
+            flush_interval_s=float(os.getenv("CAREER_TELEMETRY_FLUSH_S", "1.0")),
+            sinks=sinks
+        )
+
+    def emit(self, event: Event):
+        """Queue an event without blocking; drops it if the buffer is full"""
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self.dropped += 1
+                return
+            self._buffer.append(event)
+            self.enqueued += 1
+            full_batch = len(self._buffer) >= self.batch_size
+        if self._worker is None:
+            self._start()
+        if full_batch:
+            self._wake.set()
+
+    def _start(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="telemetry-exporter", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def _take_batch(self) -> List[Event]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def flush(self):
+        """Export everything currently buffered (called by the worker, at exit, or by tests)"""
+        with self._export_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return
+                exported = len(batch)
+                for sink in self.sinks:
+                    try:
+                        skipped = sink.export(batch) or 0
+                    except Exception:
+                        self.export_errors += 1
+                        continue
+                    self.skipped += skipped
+                    if sink is self.memory:
+                        exported -= skipped
+                self.exported += exported
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "exported": self.exported,
+                "export_errors": self.export_errors,
+                "rejected": self.rejected,
+                "skipped": self.skipped,
+                "buffered": len(self._buffer),
+            }
+
+
+_exporter: Optional[TelemetryExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> TelemetryExporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = TelemetryExporter.from_env()
+                atexit.register(_exporter.flush)
+    return _exporter
+
+
+def enabled() -> bool:
+    return os.getenv("CAREER_TELEMETRY", "true") == "true"
+
+
+def record_metric(name: str, value: float, trace_id: Optional[str] = None):
+    if enabled():
+        exporter = get_exporter()
+        if not _is_number(value):
+            with exporter._lock:
+                exporter.rejected += 1
+            return
+        exporter.emit(Event("metric", name, value, time.time(), trace_id))
+
+
+def record_span(name: str, duration_s: float, error: Optional[str] = None, trace_id: Optional[str] = None):
+    if enabled():
+        get_exporter().emit(Event("span", name, duration_s, time.time(), trace_id, error))
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Aggregates of everything exported so far, keyed "metric:<name>" / "span:<name>" """
+    return get_exporter().memory.snapshot()
+
+
+def stats() -> Dict[str, int]:
+    return get_exporter().stats()
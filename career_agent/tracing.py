@@ -0,0 +1,199 @@
+"""Lazy Opik integration - opik is only imported the first time tracing is used
+
+Tracing is controlled by environment variables read when a function is decorated:
+
+    CAREER_TRACE_MODE=full|sampled|off   off returns functions undecorated (zero overhead)
+    CAREER_TRACE_SAMPLE_RATE=0.01        head-based sampling rate in sampled mode
+    CAREER_TRACE_REDACT=api_key,...      argument/field names replaced with "[redacted]"
+    CAREER_TRACE_MAX_CHARS=500           longer strings are truncated in spans
+    CAREER_TRACE_MAX_ITEMS=20            longer lists are truncated in spans
+
+The sampling decision is made once per request (the outermost traced call) and
+inherited by nested calls. Requests that weren't sampled but fail are still
+logged as a trace with the error.
+"""
+
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from career_agent import telemetry
+
+_opik = None
+_opik_unavailable = False
+_import_lock = threading.Lock()
+
+# Sampling decision of the request being traced (None outside any traced call)
+_sampled: ContextVar[Optional[bool]] = ContextVar("career_agent_trace_sampled", default=None)
+
+DEFAULT_REDACT = "api_key,token,password,secret,authorization,resume_text"
+
+_error_client = None
+
+
+def get_opik():
+    """Import opik on first use; returns None if it isn't installed"""
+    global _opik, _opik_unavailable
+    if _opik is None and not _opik_unavailable:
+        with _import_lock:
+            if _opik is None and not _opik_unavailable:
+                try:
+                    import opik
+                    _opik = opik
+                except ImportError:
+                    _opik_unavailable = True
+    return _opik
+
+
+def configure(api_key: Optional[str] = None):
+    """Configure Opik (raises if configuration fails, like opik.configure)"""
+    opik = get_opik()
+    if opik is None:
+        raise RuntimeError("opik is not installed")
+    opik.configure(api_key=api_key or os.getenv("OPIK_API_KEY"))
+
+
+def trace_mode() -> str:
+    return os.getenv("CAREER_TRACE_MODE", "full")
+
+
+def _sample_rate() -> float:
+    return 1.0 if trace_mode() == "full" else float(os.getenv("CAREER_TRACE_SAMPLE_RATE", "0.01"))
+
+
+def redact(value: Any) -> Any:
+    """Copy of value that is safe and small enough to attach to a span"""
+    redacted_keys = frozenset(key.strip().lower() for key in os.getenv("CAREER_TRACE_REDACT", DEFAULT_REDACT).split(","))
+    max_chars = int(os.getenv("CAREER_TRACE_MAX_CHARS", "500"))
+    max_items = int(os.getenv("CAREER_TRACE_MAX_ITEMS", "20"))
+    return _redact(value, redacted_keys, max_chars, max_items, 0)
+
+
+def _redact(value: Any, redacted_keys: frozenset, max_chars: int, max_items: int, depth: int) -> Any:
+    if depth > 4:
+        return "..."
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {
+            key: "[redacted]" if str(key).lower() in redacted_keys
+            else _redact(item, redacted_keys, max_chars, max_items, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set)):
+        items = [_redact(item, redacted_keys, max_chars, max_items, depth + 1) for item in list(value)[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more")
+        return items
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + f"... [{len(value) - max_chars} chars]"
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return _redact(repr(value), redacted_keys, max_chars, max_items, depth + 1)
+
+
+def _log_error_trace(name: str, inputs: dict, error: BaseException):
+    """Log an unsampled request that failed as a trace of its own (best effort)"""
+    global _error_client
+    opik = get_opik()
+    if opik is None:
+        return
+    try:
+        if _error_client is None:
+            _error_client = opik.Opik()
+        _error_client.trace(
+            name=name,
+            input=inputs,
+            error_info={
+                "exception_type": type(error).__name__,
+                "message": str(error),
+                "traceback": "".join(traceback.format_exception(error)),
+            },
+            tags=["sampled-out-error"]
+        )
+    except Exception:
+        pass
+
+
+def track(name: Optional[str] = None, **track_kwargs):
+    """Drop-in for @opik.track that defers the opik import to the first call
+
+    Arguments and return values are redacted and size-capped before they are
+    attached to spans. Each call's duration (and error, if any) is also recorded
+    as a telemetry span.
+    """
+    def decorator(fn):
+        if trace_mode() == "off":
+            return fn
+
+        tracked = None
+        span_name = name or fn.__name__
+        signature = inspect.signature(fn)
+        rate = _sample_rate()
+
+        def inputs(args, kwargs) -> dict:
+            try:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+            except TypeError:
+                bound = {"args": args, "kwargs": kwargs}
+            return redact({key: value for key, value in bound.items() if key != "self"})
+
+        def traced(*args, **kwargs):
+            _opik.opik_context.update_current_span(input=inputs(args, kwargs))
+            result = fn(*args, **kwargs)
+            _opik.opik_context.update_current_span(output={"output": redact(result)})
+            return result
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            nonlocal tracked
+            decision = _sampled.get()
+            root = decision is None
+            if root:
+                decision = rate >= 1.0 or random.random() < rate
+                token = _sampled.set(decision)
+
+            if decision and tracked is None:
+                opik = get_opik()
+                tracked = opik.track(
+                    name=span_name, capture_input=False, capture_output=False, **track_kwargs
+                )(functools.wraps(fn)(traced)) if opik else fn
+
+            start = time.perf_counter()
+            try:
+                result = (tracked if decision else fn)(*args, **kwargs)
+            except Exception as e:
+                telemetry.record_span(span_name, time.perf_counter() - start, error=type(e).__name__)
+                if root and not decision:
+                    _log_error_trace(span_name, inputs(args, kwargs), e)
+                raise
+            finally:
+                if root:
+                    _sampled.reset(token)
+            telemetry.record_span(span_name, time.perf_counter() - start)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def _current_trace_id() -> Optional[str]:
+    """Id of the active Opik trace, if opik is loaded and tracing one"""
+    if _opik is None or not _sampled.get():
+        return None
+    try:
+        trace = _opik.opik_context.get_current_trace_data()
+    except Exception:
+        return None
+    return trace.id if trace is not None else None
+
+
+def track_metric(name: str, value):
+    """Queue a metric for background export; never blocks on or raises from the backend"""
+    telemetry.record_metric(name, value, trace_id=_current_trace_id())
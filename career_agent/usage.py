@@ -0,0 +1,142 @@
+"""LLM token and cost accounting per analysis, per agent and per user
+
+LLMClient records every successful provider call with the token counts the
+provider reports (OpenAI/Groq usage, Anthropic usage, Gemini usage_metadata).
+A provider that reports nothing is counted locally. Each call is recorded on:
+
+- the active analysis' UsageLedger (AnalysisResult.usage: totals per agent and model)
+- the process-wide per-user spend, over a rolling window
+- telemetry, as llm_cost_usd.<agent> and llm_tokens.<agent>
+
+    CAREER_USER_BUDGET_USD=0          spend allowed per user over the window (0 = unlimited)
+    CAREER_USER_BUDGET_WINDOW_H=24
+
+Users are identified by the caller (run_analysis(user_id=), or the API's
+X-User-Id header), never by profile fields. Analyses without a user_id aren't
+budgeted. A user over budget gets SpendBudgetExceeded before each further LLM
+call (a TokenBudgetExceeded). The agents then degrade as they do at the
+deadline, with no further LLM calls: catalog job postings and resources, and
+gaps ranked by frequency alone.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Tuple
+
+from career_agent.prompts import TokenBudgetExceeded
+
+if TYPE_CHECKING:
+    from career_agent.models import UsageReport
+
+# Totals are kept as plain dicts so importing the LLM client doesn't load pydantic models
+USAGE_FIELDS = ("calls", "prompt_tokens", "completion_tokens", "latency_s", "cost_usd")
+
+
+class SpendBudgetExceeded(TokenBudgetExceeded):
+    """Raised before an LLM call for a user who has spent their budget for the window"""
+
+
+def _totals() -> Dict[str, float]:
+    return dict.fromkeys(USAGE_FIELDS, 0)
+
+
+def _add(totals: Dict[str, float], prompt_tokens: int, completion_tokens: int, latency_s: float, cost_usd: float):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["latency_s"] += latency_s
+    totals["cost_usd"] += cost_usd
+
+
+class UsageLedger:
+    """Calls, tokens, latency and cost of one analysis (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total = _totals()
+        self._by_agent: Dict[str, Dict[str, float]] = {}
+        self._by_model: Dict[str, Dict[str, float]] = {}
+        self.estimated_calls = 0
+
+    def record(self, agent: str, model: Optional[str], prompt_tokens: int, completion_tokens: int,
+               latency_s: float, cost_usd: float, estimated: bool = False):
+        with self._lock:
+            for totals in (
+                self._total,
+                self._by_agent.setdefault(agent, _totals()),
+                self._by_model.setdefault(model or "unknown", _totals()),
+            ):
+                _add(totals, prompt_tokens, completion_tokens, latency_s, cost_usd)
+            if estimated:
+                self.estimated_calls += 1
+
+    def report(self, user_id: Optional[str] = None) -> "UsageReport":
+        from career_agent.models import LLMUsage, UsageReport
+        spend = user_spend()
+        with self._lock:
+            return UsageReport(
+                user_id=user_id,
+                total=LLMUsage(**self._total),
+                by_agent={agent: LLMUsage(**totals) for agent, totals in self._by_agent.items()},
+                by_model={model: LLMUsage(**totals) for model, totals in self._by_model.items()},
+                estimated_calls=self.estimated_calls,
+                user_spend_usd=spend.spent(user_id) if user_id else None,
+                user_budget_usd=spend.budget_usd,
+            )
+
+
+class UserSpend:
+    """Rolling LLM spend per user, with an optional budget"""
+
+    def __init__(self, budget_usd: Optional[float] = None, window_s: float = 24 * 3600):
+        self.budget_usd = budget_usd
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        # user -> (timestamp, cost) of each call inside the window
+        self._spend: Dict[str, Deque[Tuple[float, float]]] = {}
+
+    @classmethod
+    def from_env(cls) -> "UserSpend":
+        budget = float(os.getenv("CAREER_USER_BUDGET_USD", "0"))
+        return cls(budget_usd=budget or None, window_s=float(os.getenv("CAREER_USER_BUDGET_WINDOW_H", "24")) * 3600)
+
+    def _expire(self, user_id: str, now: float) -> Deque[Tuple[float, float]]:
+        calls = self._spend.setdefault(user_id, deque())
+        while calls and calls[0][0] < now - self.window_s:
+            calls.popleft()
+        return calls
+
+    def add(self, user_id: str, cost_usd: float):
+        now = time.time()
+        with self._lock:
+            self._expire(user_id, now).append((now, cost_usd))
+
+    def spent(self, user_id: str) -> float:
+        with self._lock:
+            return sum(cost for _, cost in self._expire(user_id, time.time()))
+
+    def check(self, user_id: Optional[str]):
+        """Raise SpendBudgetExceeded if user_id has used up the budget"""
+        if user_id is None or self.budget_usd is None:
+            return
+        spent = self.spent(user_id)
+        if spent >= self.budget_usd:
+            raise SpendBudgetExceeded(
+                f"User {user_id!r} spent ${spent:.4f} of ${self.budget_usd:.4f} in the last {self.window_s / 3600:g}h"
+            )
+
+
+_user_spend: Optional[UserSpend] = None
+_user_spend_lock = threading.Lock()
+
+
+def user_spend() -> UserSpend:
+    """The process-wide per-user spend (budget read from the environment on first use)"""
+    global _user_spend
+    if _user_spend is None:
+        with _user_spend_lock:
+            if _user_spend is None:
+                _user_spend = UserSpend.from_env()
+    return _user_spend
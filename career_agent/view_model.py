@@ -0,0 +1,89 @@
+"""Precomputed per-result lookups used to render an AnalysisResult"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple
+from career_agent.models import AnalysisResult
+
+
+@dataclass
+class ResultViewModel:
+    """Everything the UI tabs need, computed once per result"""
+    user_skills: FrozenSet[str]
+    market_skill_counts: Dict[str, int]
+    top_market_skills: List[Tuple[str, int]]
+    top_skills_owned: int
+    gap_labels: List[str]
+    gap_priorities: List[float]
+    high_priority_gaps: int
+    avg_confidence: float
+    top_resource_hours: float
+    total_schedule_hours: float
+    schedule_days: int
+    weekly_hours: List[Tuple[int, float]]
+    job_skill_flags: List[Tuple[List[Tuple[str, bool]], List[Tuple[str, bool]]]] = field(default_factory=list)
+
+    def has_skill(self, skill: str) -> bool:
+        """O(1) check whether the user already has a skill (case-insensitive)"""
+        return skill.lower() in self.user_skills
+
+
+def build_view_model(result: AnalysisResult, top_n: int = 10) -> ResultViewModel:
+    """Build the view model in a single pass over each collection"""
+
+    user_skills = frozenset(s.lower() for s in result.profile.skills)
+
+    # Weighted skill counts across jobs (required=2, preferred=1) + per-job ownership flags
+    market_skill_counts: Dict[str, int] = {}
+    job_skill_flags = []
+    for job in result.job_postings:
+        required = []
+        for skill in job.required_skills:
+            market_skill_counts[skill] = market_skill_counts.get(skill, 0) + 2
+            required.append((skill, skill.lower() in user_skills))
+        preferred = []
+        for skill in job.preferred_skills:
+            market_skill_counts[skill] = market_skill_counts.get(skill, 0) + 1
+            preferred.append((skill, skill.lower() in user_skills))
+        job_skill_flags.append((required, preferred))
+
+    top_market_skills = sorted(market_skill_counts.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    top_skills_owned = sum(1 for skill, _ in top_market_skills if skill.lower() in user_skills)
+
+    # Gap labels and priorities (importance * confidence), aligned with result.skill_gaps
+    gap_labels = [g.skill.title() for g in result.skill_gaps]
+    gap_priorities = [g.importance * g.confidence for g in result.skill_gaps]
+    high_priority_gaps = sum(1 for g in result.skill_gaps if g.confidence > 0.7)
+    avg_confidence = (
+        sum(g.confidence for g in result.skill_gaps) / len(result.skill_gaps)
+        if result.skill_gaps else 0
+    )
+
+    top_resource_hours = sum(r.estimated_hours for r in result.learning_resources[:5])
+
+    # Schedule aggregates; weekly hours cover the sessions shown in the calendar (first 14)
+    total_schedule_hours = sum(s.duration_minutes for s in result.schedule) / 60
+    schedule_days = (
+        (result.schedule[-1].scheduled_time - result.schedule[0].scheduled_time).days + 1
+        if result.schedule else 0
+    )
+    minutes_per_week: Dict[int, int] = {}
+    for session in result.schedule[:14]:
+        week = session.scheduled_time.isocalendar()[1]
+        minutes_per_week[week] = minutes_per_week.get(week, 0) + session.duration_minutes
+    weekly_hours = [(week, minutes / 60) for week, minutes in sorted(minutes_per_week.items())]
+
+    return ResultViewModel(
+        user_skills=user_skills,
+        market_skill_counts=market_skill_counts,
+        top_market_skills=top_market_skills,
+        top_skills_owned=top_skills_owned,
+        gap_labels=gap_labels,
+        gap_priorities=gap_priorities,
+        high_priority_gaps=high_priority_gaps,
+        avg_confidence=avg_confidence,
+        top_resource_hours=top_resource_hours,
+        total_schedule_hours=total_schedule_hours,
+        schedule_days=schedule_days,
+        weekly_hours=weekly_hours,
+        job_skill_flags=job_skill_flags
+    )
@@ -0,0 +1,289 @@
+"""Warm-start snapshots for popular role/industry pairs
+
+Most traffic targets a few dozen role/industry pairs. Precompute them offline:
+
+    python -m career_agent.warm_start --top 20
+    python -m career_agent.warm_start --from-queue career_jobs.db --top 20
+
+Each snapshot stores the pair's job postings, skill frequencies, a scored gap
+assessment (confidence + reasoning) for every market skill and resources per
+skill, as JSON under $CAREER_WARM_DIR (default: warm_start/). A live analysis
+for a stored pair only diffs the user's skills against the snapshot, with no
+LLM calls. A build that degraded (catalog jobs, unscored gaps, missing
+resources or reasoning) is never saved, and main() exits non-zero. Only exact role/industry matches are served: a snapshot's postings
+and gaps don't carry over to other roles, even in the same focus area.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from career_agent.demo_mode import detect_focus
+from career_agent.models import UserProfile, JobPosting, SkillGap, LearningResource
+
+# Popular pairs covering every demo focus bucket, most requested first
+DEFAULT_PAIRS = [
+    ("Machine Learning Engineer", "Technology"),
+    ("Data Scientist", "Technology"),
+    ("Backend Engineer", "Technology"),
+    ("DevOps Engineer", "Technology"),
+    ("Frontend Developer", "Technology"),
+    ("ML Engineer", "Finance"),
+    ("Data Scientist", "Finance"),
+    ("Data Analyst", "Technology"),
+    ("Data Engineer", "Technology"),
+    ("AI Engineer", "Technology"),
+    ("Cloud Engineer", "Technology"),
+    ("Software Engineer", "Technology"),
+    ("Data Scientist", "Healthcare"),
+    ("Machine Learning Engineer", "Healthcare"),
+    ("Backend Engineer", "Finance"),
+    ("Full Stack Developer", "Technology"),
+    ("Data Analyst", "Finance"),
+    ("DevOps Engineer", "Finance"),
+    ("Data Analyst", "Retail"),
+    ("Software Engineer", "Finance"),
+]
+
+# Market skills scored per snapshot (user skills are subtracted from these at request time)
+SNAPSHOT_GAPS = 20
+
+
+class GapAssessment(BaseModel):
+    """Pair-level confidence and reasoning for one market skill"""
+    confidence: float
+    reasoning: str
+
+
+class WarmSnapshot(BaseModel):
+    """Prebuilt analysis artifacts for one role/industry pair"""
+    role: str
+    industry: str
+    focus: str
+    built_at: float
+    job_postings: List[JobPosting]
+    market_skills: Dict[str, int]
+    assessments: Dict[str, GapAssessment]
+    resources: Dict[str, List[LearningResource]]
+
+
+class DegradedSnapshot(Exception):
+    """Raised by build_snapshot when a stage fell back (budget, deadline or LLM failure)"""
+
+
+def pair_key(role: str, industry: str) -> str:
+    """Normalized file-safe key for a role/industry pair"""
+    slug = lambda text: re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return f"{slug(role)}--{slug(industry)}"
+
+
+class WarmStartStore:
+    """Directory of snapshots, indexed in memory on first lookup"""
+
+    def __init__(self, directory: Optional[str] = None, max_age_h: Optional[float] = None):
+        self.directory = directory or os.getenv("CAREER_WARM_DIR", "warm_start")
+        self.max_age_h = max_age_h if max_age_h is not None else float(os.getenv("CAREER_WARM_MAX_AGE_H", "168"))
+        self._lock = threading.Lock()
+        self._by_pair: Optional[Dict[str, WarmSnapshot]] = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["WarmStartStore"]:
+        """The configured store, or None if warm start is disabled or nothing was precomputed"""
+        if os.getenv("CAREER_WARM_START", "true") != "true":
+            return None
+        store = cls()
+        return store if os.path.isdir(store.directory) else None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save(self, snapshot: WarmSnapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(pair_key(snapshot.role, snapshot.industry))
+        # Write then rename so live readers never see a half-written snapshot
+        with open(path + ".tmp", "w") as f:
+            f.write(snapshot.model_dump_json())
+        os.replace(path + ".tmp", path)
+        self.reload()
+
+    def reload(self):
+        with self._lock:
+            self._by_pair = None
+
+    def _index(self) -> Dict[str, WarmSnapshot]:
+        with self._lock:
+            if self._by_pair is None:
+                by_pair = {}
+                for name in sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []:
+                    if not name.endswith(".json"):
+                        continue
+                    with open(os.path.join(self.directory, name)) as f:
+                        snapshot = WarmSnapshot.model_validate_json(f.read())
+                    by_pair[pair_key(snapshot.role, snapshot.industry)] = snapshot
+                self._by_pair = by_pair
+            return self._by_pair
+
+    def get(self, role: str, industry: str) -> Optional[WarmSnapshot]:
+        """Fresh snapshot for exactly this role/industry pair"""
+        snapshot = self._index().get(pair_key(role, industry))
+        if snapshot is not None and time.time() - snapshot.built_at > self.max_age_h * 3600:
+            snapshot = None
+        with self._lock:
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return snapshot
+
+    def stats(self) -> Dict[str, int]:
+        return {"snapshots": len(self._index()), "hits": self.hits, "misses": self.misses}
+
+
+def diff_against_snapshot(
+    snapshot: WarmSnapshot,
+    profile: UserProfile,
+    limit: int = 10,
+    max_gaps: int = 5
+) -> Tuple[List[SkillGap], List[LearningResource]]:
+    """Per-user skill gaps and resources from a snapshot (mirrors SkillGapAgent/ResourceCuratorAgent ranking)"""
+    user_skills_lower = {s.lower().strip() for s in profile.skills}
+    max_freq = max(snapshot.market_skills.values()) if snapshot.market_skills else 1
+
+    gaps = []
+    for skill, frequency in snapshot.market_skills.items():
+        assessment = snapshot.assessments.get(skill)
+        if assessment is None or skill in user_skills_lower:
+            continue
+        gaps.append(SkillGap(
+            skill=skill,
+            importance=frequency / max_freq,
+            frequency_in_jobs=frequency,
+            confidence=assessment.confidence,
+            reasoning=assessment.reasoning
+        ))
+    gaps.sort(key=lambda x: x.importance * x.confidence, reverse=True)
+    gaps = gaps[:limit]
+
+    resources = []
+    for gap in gaps[:max_gaps]:
+        for resource in snapshot.resources.get(gap.skill, []):
+            resources.append(resource.model_copy(update={"relevance_score": gap.importance * gap.confidence}))
+    resources.sort(key=lambda x: x.relevance_score, reverse=True)
+
+    return gaps, resources
+
+
+def build_snapshot(role: str, industry: str, orchestrator=None) -> WarmSnapshot:
+    """Run the LLM stages for a pair once, scoring every market skill against a blank profile
+
+    Raises DegradedSnapshot if any stage degraded, since the snapshot would be served as complete.
+    """
+    if orchestrator is None:
+        from career_agent.orchestrator import CareerGrowthOrchestrator
+        orchestrator = CareerGrowthOrchestrator()
+    from career_agent.run_context import analysis_context
+
+    template = UserProfile(
+        name="Warm start",
+        current_role="Career changer",
+        target_role=role,
+        skills=[],
+        experience_years=0,
+        industry=industry
+    )
+
+    with analysis_context() as context:
+        jobs = orchestrator.job_analyzer.scrape_jobs(role=role, industry=industry, limit=5)
+        market_skills = orchestrator.job_analyzer.extract_skills_from_jobs(jobs)
+        gaps = orchestrator.skill_gap_agent.analyze_gaps(template, market_skills, limit=SNAPSHOT_GAPS, jobs=jobs)
+        resources = {
+            gap.skill: orchestrator.resource_curator.curate_resources([gap], max_gaps=1)
+            for gap in gaps
+        }
+        assessments = {gap.skill: GapAssessment(confidence=gap.confidence, reasoning=gap.explain()) for gap in gaps}
+    if context.partial_sections:
+        raise DegradedSnapshot(f"degraded sections: {', '.join(context.partial_sections)}")
+
+    return WarmSnapshot(
+        role=role,
+        industry=industry,
+        focus=detect_focus(role),
+        built_at=time.time(),
+        job_postings=jobs,
+        market_skills=market_skills,
+        assessments=assessments,
+        resources=resources
+    )
+
+
+def popular_pairs(db_path: str, top: int) -> List[Tuple[str, str]]:
+    """Most requested role/industry pairs in a job queue database"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT profile FROM jobs").fetchall()
+    finally:
+        conn.close()
+    counts = Counter()
+    names = {}
+    for (payload,) in rows:
+        profile = json.loads(payload)
+        key = pair_key(profile["target_role"], profile["industry"])
+        counts[key] += 1
+        names.setdefault(key, (profile["target_role"], profile["industry"]))
+    return [names[key] for key, _ in counts.most_common(top)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute warm-start snapshots for popular role/industry pairs")
+    parser.add_argument("--top", type=int, default=len(DEFAULT_PAIRS), help="Number of pairs to build")
+    parser.add_argument("--from-queue", metavar="DB", help="Rank pairs by traffic in a job queue database")
+    parser.add_argument("--pair", action="append", default=[], metavar="ROLE:INDUSTRY", help="Build a specific pair (repeatable)")
+    parser.add_argument("--dir", default=None, help="Snapshot directory (default: $CAREER_WARM_DIR or warm_start)")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    pairs = [tuple(p.split(":", 1)) for p in args.pair]
+    if args.from_queue:
+        pairs += popular_pairs(args.from_queue, args.top)
+    if not pairs:
+        pairs = DEFAULT_PAIRS[:args.top]
+
+    from career_agent.orchestrator import CareerGrowthOrchestrator
+    orchestrator = CareerGrowthOrchestrator()
+    store = WarmStartStore(args.dir)
+    failed = []
+
+    for role, industry in pairs:
+        start = time.perf_counter()
+        print(f"🔥 Building {role} / {industry}...")
+        try:
+            snapshot = build_snapshot(role, industry, orchestrator)
+        except Exception as e:
+            print(f"   ⚠️  Failed, not saved: {e}")
+            failed.append(f"{role} / {industry}")
+            continue
+        store.save(snapshot)
+        print(f"   ✓ {len(snapshot.market_skills)} skills, {len(snapshot.assessments)} assessments "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    print(f"✅ Snapshots in {store.directory}")
+    if failed:
+        print(f"❌ {len(failed)} pair(s) not built: {'; '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
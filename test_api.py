@@ -0,0 +1,51 @@
+"""API tests against the demo engine (no API keys or network needed)"""
+
+from fastapi.testclient import TestClient
+
+from career_agent.api import AnalysisService, create_app
+from career_agent.runner import default_runner
+
+PROFILE = {
+    "name": "Alex",
+    "current_role": "Software Engineer",
+    "target_role": "ML Engineer",
+    "skills": ["Python", "SQL"],
+    "experience_years": 3,
+    "industry": "Technology",
+}
+
+
+def demo_client(monkeypatch) -> TestClient:
+    monkeypatch.setenv("DEMO_MODE", "true")
+    return TestClient(create_app(AnalysisService(runner=default_runner(), max_workers=2)))
+
+
+def test_analyze_with_user_id_in_demo_mode(monkeypatch):
+    client = demo_client(monkeypatch)
+    response = client.post("/analyze", json=PROFILE, headers={"X-User-Id": "user-1"})
+    assert response.status_code == 200
+    assert response.json()["skill_gaps"]
+
+
+def test_analyze_stream_with_user_id_in_demo_mode(monkeypatch):
+    client = demo_client(monkeypatch)
+    response = client.post("/analyze/stream", json=PROFILE, headers={"X-User-Id": "user-1"})
+    assert response.status_code == 200
+    assert "event: result" in response.text
+    assert "event: error" not in response.text
+
+
+def test_jobs_carry_user_id_to_the_worker(monkeypatch, tmp_path):
+    from career_agent.job_queue import JobQueue
+
+    monkeypatch.setenv("DEMO_MODE", "true")
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    client = TestClient(create_app(AnalysisService(runner=default_runner(), max_workers=2), job_queue=queue))
+
+    first = client.post("/jobs", json=PROFILE, headers={"X-User-Id": "user-1"}).json()["job_id"]
+    # The same profile from another user is a separate job, charged to that user
+    second = client.post("/jobs", json=PROFILE, headers={"X-User-Id": "user-2"}).json()["job_id"]
+    assert first != second
+
+    claimed = {queue.claim("test")[2], queue.claim("test")[2]}
+    assert claimed == {"user-1", "user-2"}
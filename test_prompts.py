@@ -0,0 +1,114 @@
+"""Prompt prefix caching on a realistic analysis"""
+
+from collections import Counter
+
+from career_agent import fake_provider
+from career_agent.models import JobPosting, UserProfile
+from career_agent.prompts import PREFIX_CACHE_MIN_TOKENS, PromptBuilder, market_context, profile_context
+from career_agent.run_context import analysis_context
+from career_agent.skill_gap_agent import GAP_INSTRUCTIONS, SkillGapAgent
+
+
+PROFILE = UserProfile(
+    name="Alex Chen",
+    current_role="Backend Developer",
+    target_role="Machine Learning Engineer",
+    skills=["Python", "SQL", "Docker", "Git", "REST APIs", "PostgreSQL", "Linux"],
+    experience_years=4,
+    industry="Technology"
+)
+
+# Five postings shaped like the job analyzer's output: 5 required and 3 preferred skills, 2-3 sentences
+POSTINGS = [
+    ("Machine Learning Engineer", "Nimbus Analytics",
+     ["python", "pytorch", "mlops", "docker", "sql"], ["kubernetes", "spark", "airflow"],
+     "Nimbus Analytics is hiring a Machine Learning Engineer to build and deploy forecasting models "
+     "for retail clients. You will own the path from experimentation in notebooks to monitored "
+     "production services, working closely with data engineers and product managers."),
+    ("ML Engineer, Recommendations", "Brightline Media",
+     ["python", "tensorflow", "feature engineering", "aws", "sql"], ["spark", "kafka", "a/b testing"],
+     "Join the recommendations team that personalizes content for millions of daily viewers. "
+     "You will design ranking models, run online experiments and improve the latency of our "
+     "real-time inference stack."),
+    ("Senior Machine Learning Engineer", "Helix Health",
+     ["python", "pytorch", "mlops", "kubernetes", "statistics"], ["aws", "airflow", "model monitoring"],
+     "Helix Health applies machine learning to clinical documentation and triage. As a senior engineer "
+     "you will lead model training pipelines, set up evaluation and drift monitoring, and mentor two "
+     "junior engineers."),
+    ("Applied ML Engineer", "Quarry Logistics",
+     ["python", "scikit-learn", "docker", "sql", "feature engineering"], ["aws", "terraform", "mlops"],
+     "Quarry Logistics optimizes freight routing with demand prediction and anomaly detection models. "
+     "You will turn prototypes into reliable batch and streaming jobs and partner with operations "
+     "teams to measure their business impact."),
+    ("Machine Learning Platform Engineer", "Vector Finance",
+     ["python", "kubernetes", "mlops", "aws", "ci/cd"], ["pytorch", "spark", "model monitoring"],
+     "Vector Finance is building an internal platform for training, serving and monitoring credit "
+     "risk models. You will automate deployments, manage GPU infrastructure and give data scientists "
+     "self-service tooling with strong auditability."),
+]
+
+
+def _jobs():
+    return [
+        JobPosting(
+            title=title,
+            company=company,
+            required_skills=required,
+            preferred_skills=preferred,
+            description=description,
+            url=f"https://example.com/jobs/{company.lower().replace(' ', '-')}"
+        )
+        for title, company, required, preferred, description in POSTINGS
+    ]
+
+
+def _market_skills(jobs):
+    """Weighted like JobAnalyzerAgent.extract_skills_from_jobs: 2 per required mention, 1 per preferred"""
+    demand = Counter()
+    for job in jobs:
+        demand.update({skill: 2 for skill in job.required_skills})
+        demand.update({skill: 1 for skill in job.preferred_skills})
+    return dict(demand)
+
+
+def test_realistic_gap_scoring_prefix_is_cacheable_on_openai():
+    jobs = _jobs()
+    prompts = PromptBuilder(
+        "openai", GAP_INSTRUCTIONS, profile_context(PROFILE) + "\n\n" + market_context(_market_skills(jobs), jobs)
+    )
+    assert prompts.prefix_tokens >= PREFIX_CACHE_MIN_TOKENS["openai"]
+
+
+def test_analyze_gaps_counts_cache_hits(monkeypatch):
+    # The offline provider, held to OpenAI's minimum cacheable prefix
+    monkeypatch.setenv("CAREER_LLM_PROVIDERS", fake_provider.NAME)
+    monkeypatch.setenv("OPIK_TRACK_DISABLE", "true")
+    monkeypatch.setitem(PREFIX_CACHE_MIN_TOKENS, fake_provider.NAME, PREFIX_CACHE_MIN_TOKENS["openai"])
+    fake_provider.install()
+    try:
+        jobs = _jobs()
+        market_skills = _market_skills(jobs)
+        with analysis_context() as context:
+            SkillGapAgent().analyze_gaps(PROFILE, market_skills, jobs=jobs)
+            report = context.budget.report()
+    finally:
+        fake_provider.uninstall()
+
+    # One scoring call per missing skill; the first writes the cache, the rest read it
+    missing = [skill for skill in market_skills if skill not in {s.lower() for s in PROFILE.skills}]
+    assert report["prefix_reused_uncached"] == 0
+    assert report["prefix_cached"] >= (len(missing) - 1) * PREFIX_CACHE_MIN_TOKENS["openai"]
+    assert report["tokens_saved"] >= report["prefix_cached"]
+
+
+def test_short_prefix_is_not_counted_as_cached():
+    prompts = PromptBuilder("openai", GAP_INSTRUCTIONS, profile_context(PROFILE))
+    assert not prompts.cacheable
+
+    with analysis_context() as context:
+        prompts.build("Missing skill: pytorch")
+        prompts.build("Missing skill: mlops")
+        report = context.budget.report()
+
+    assert report["prefix_cached"] == 0
+    assert report["prefix_reused_uncached"] == prompts.prefix_tokens
@@ -0,0 +1,45 @@
+"""Warm-start builds against the offline fake provider"""
+
+import os
+import sys
+
+import pytest
+
+from career_agent import fake_provider, warm_start
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    monkeypatch.setenv("CAREER_LLM_PROVIDERS", fake_provider.NAME)
+    monkeypatch.setenv("OPIK_TRACK_DISABLE", "true")
+    monkeypatch.setenv("CAREER_WARM_START", "false")
+    fake_provider.install()
+    yield
+    fake_provider.uninstall()
+
+
+def test_budget_failure_saves_no_snapshot(offline, monkeypatch, tmp_path):
+    # Enough for the job postings, not for scoring every gap
+    monkeypatch.setenv("CAREER_LLM_MAX_ANALYSIS_TOKENS", "1200")
+    monkeypatch.setattr(sys, "argv", ["warm_start", "--pair", "Machine Learning Engineer:Technology", "--dir", str(tmp_path)])
+
+    with pytest.raises(SystemExit) as exit_info:
+        warm_start.main()
+
+    assert exit_info.value.code == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".json")]
+
+
+def test_degraded_build_raises(offline, monkeypatch):
+    monkeypatch.setenv("CAREER_LLM_MAX_ANALYSIS_TOKENS", "1200")
+    with pytest.raises(warm_start.DegradedSnapshot, match="skill_gaps"):
+        warm_start.build_snapshot("Machine Learning Engineer", "Technology")
+
+
+def test_full_build_is_saved(offline, monkeypatch, tmp_path):
+    monkeypatch.setenv("CAREER_LLM_MAX_ANALYSIS_TOKENS", "0")
+    monkeypatch.setattr(sys, "argv", ["warm_start", "--pair", "Machine Learning Engineer:Technology", "--dir", str(tmp_path)])
+
+    warm_start.main()
+
+    assert warm_start.WarmStartStore(str(tmp_path)).get("Machine Learning Engineer", "Technology") is not None